@@ -19,10 +19,13 @@ import sys
 import subprocess
 import time
 import json
-import yfinance as yf
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve() / "src"))
+from data_collection.quote_cache import QuoteCache
+
 # Fix Windows Unicode issues
 if os.name == 'nt':
     os.system('chcp 65001 >nul')  # Set UTF-8 encoding for Windows
@@ -67,12 +70,13 @@ def display_portfolio_status():
             print("\nCURRENT HOLDINGS:")
             print("-" * 60)
             
+            # One batch refresh for all holdings; fresh quotes come from the shared cache
+            prices = QuoteCache().get_prices(list(positions.keys()))
+            
             for symbol, pos in positions.items():
                 try:
                     # Get current price
-                    ticker = yf.Ticker(symbol)
-                    current_data = ticker.history(period='1d')
-                    current_price = current_data['Close'].iloc[-1] if not current_data.empty else pos['avg_price']
+                    current_price = prices.get(symbol) or pos['avg_price']
                     
                     shares = pos['shares']
                     purchase_price = pos['avg_price']
@@ -202,6 +206,51 @@ def run_paper_trading():
         log_message(f"Error in paper trading: {e}")
         return False
 
+def refresh_intraday_data(interval="5m", targets=("1h", "4h")):
+    """
+    Bring intraday data up to date before a trading cycle
+    
+    Appends the latest source bars, rolls only the new ones up into the
+    target timeframes and recomputes the 4h indicator features.
+    """
+    try:
+        log_message(f"Refreshing {interval} intraday bars...")
+        
+        from data_collection.collect_data import DataCollector
+        from data_collection.resampler import resample_store
+        from feature_engineering.add_indicators import FeatureEngineering
+        
+        successful, failed = DataCollector().collect_intraday(interval)
+        log_message(f"Intraday refresh completed: {successful} updated, {failed} failed")
+        
+        written = resample_store(source_interval=interval, target_intervals=targets)
+        for target, count in written.items():
+            log_message(f"Resampled {count} new {target} bars")
+        
+        if "4h" in targets:
+            FeatureEngineering().process_intraday("4h")
+        
+        return failed == 0
+        
+    except Exception as e:
+        log_message(f"Error refreshing intraday data: {e}")
+        return False
+
+def run_quality_scan():
+    """Validate the raw bars and log any flagged rows"""
+    try:
+        from data_collection.data_quality import DataQualityScanner
+        
+        report = DataQualityScanner().scan()
+        for symbol, issues in report['issues'].items():
+            log_message(f"Data quality {symbol}: {issues}")
+        
+        return report['flagged_rows'] == 0
+        
+    except Exception as e:
+        log_message(f"Error scanning data quality: {e}")
+        return False
+
 def check_system_status():
     """Check if system is ready"""
     try:
@@ -244,6 +293,10 @@ def run_4_hour_automation_with_display():
             
             log_message(f"=== AUTOMATION CYCLE #{run_count} ===")
             
+            # Bring intraday bars up to date so the cycle sees the latest session
+            refresh_intraday_data()
+            run_quality_scan()
+            
             # Run trading
             success = run_paper_trading()
             
@@ -327,6 +380,7 @@ def main():
         try:
             while True:
                 if check_system_status():
+                    refresh_intraday_data()
                     run_paper_trading()
                 log_message("Waiting 4 hours until next cycle...")
                 time.sleep(4 * 60 * 60)  # 4 hours
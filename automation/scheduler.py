@@ -179,22 +179,10 @@ class TradingSystemAutomation:
             
             from data_collection.collect_data import DataCollector
             
+            # The universe comes from the symbol manifest (config/symbols.json)
             collector = DataCollector()
-            success_count = 0
-            total_symbols = 0
-            
-            # Collect data for all symbols
-            symbols = ['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'TSLA', 'META', 'NFLX', 
-                      'AMZN', 'AMD', 'INTC']  # Add your symbols
-            
-            for symbol in symbols:
-                try:
-                    collector.collect_data(symbol)
-                    success_count += 1
-                    logger.info(f"✅ Collected data for {symbol}")
-                except Exception as e:
-                    logger.error(f"❌ Failed to collect {symbol}: {e}")
-                total_symbols += 1
+            success_count, failed_count = collector.collect_data()
+            total_symbols = max(success_count + failed_count, 1)
             
             success_rate = success_count / total_symbols
             
@@ -217,25 +205,26 @@ class TradingSystemAutomation:
             logger.info("🔄 Starting feature engineering...")
             
             from feature_engineering.add_indicators import FeatureEngineering
+            from feature_engineering.feature_graph import load_model_columns, union_columns
+            from feature_engineering.cross_sectional import INPUT_COLUMNS
+            from utils.paths import get_models_dir
+            
+            # Between retrains only the columns the current models consume (plus the
+            # cross-sectional inputs) are computed; a retrain needs every column
+            columns = None
+            if not self.retrain_due():
+                columns = union_columns(load_model_columns(get_models_dir()).values(), required=INPUT_COLUMNS)
+            
+            # Only rows added since the last run are computed and appended
+            success_count, failed_count = FeatureEngineering().process_all_files(
+                incremental=True, workers=os.cpu_count() or 1, columns=columns
+            )
+            if failed_count:
+                logger.error(f"❌ Feature engineering failed for {failed_count} symbols")
             
-            fe = FeatureEngineering()
-            success_count = 0
-            
-            # Process all data files
-            raw_dir = os.path.join(project_root, 'data', 'raw')
-            if not os.path.exists(raw_dir):
-                logger.error("Raw data directory not found")
-                return False
-                
-            for file in os.listdir(raw_dir):
-                if file.endswith('.csv'):
-                    symbol = file.replace('.csv', '')
-                    try:
-                        fe.add_technical_indicators(symbol)
-                        success_count += 1
-                        logger.info(f"✅ Updated features for {symbol}")
-                    except Exception as e:
-                        logger.error(f"❌ Feature engineering failed for {symbol}: {e}")
+            # Cross-sectional columns cover the whole panel, so they are recomputed after each update
+            from feature_engineering.cross_sectional import CrossSectionalFeatures
+            CrossSectionalFeatures().run()
             
             logger.info(f"✅ Feature engineering completed: {success_count} symbols")
             return success_count > 0
@@ -389,10 +378,7 @@ Cash Available: ${report['cash']:,.2f}"""
             logger.error("❌ Feature engineering failed, skipping training")
         
         # Step 3: Retrain models (if scheduled)
-        last_training = self.get_last_training_date()
-        days_since_training = (datetime.now() - last_training).days
-        
-        if days_since_training >= self.config['automation']['retrain_frequency']:
+        if self.retrain_due():
             if features_success:
                 models_success = self.retrain_models()
                 if models_success:
@@ -429,6 +415,11 @@ System running smoothly! 🚀"""
                 return datetime.fromisoformat(date_str)
         return datetime.now() - timedelta(days=30)  # Default to 30 days ago
     
+    def retrain_due(self):
+        """Check whether the retrain frequency has elapsed since the last training"""
+        days_since_training = (datetime.now() - self.get_last_training_date()).days
+        return days_since_training >= self.config['automation']['retrain_frequency']
+    
     def save_last_training_date(self):
         """Save last training date"""
         training_file = os.path.join(project_root, 'automation', 'last_training.txt')
@@ -62,33 +62,48 @@ class SimpleAutomation:
                 }
             }
     
-    def run_script(self, script_path, description):
-        """Run a Python script and return success status"""
-        try:
-            logger.info(f"🔄 Starting: {description}")
-            
-            # Change to project directory
-            os.chdir(self.project_root)
-            
-            # Run the script
-            result = subprocess.run([
-                sys.executable, script_path
-            ], capture_output=True, text=True, timeout=1800)  # 30 minute timeout
+    def run_script(self, script_path, description, args=None, resume_attempts=0):
+        """
+        Run a Python script and return success status
+        
+        Args:
+            script_path (str): Script path relative to the project root
+            description (str): Task name for the log
+            args (list): Extra command line arguments
+            resume_attempts (int): Reruns with --resume after a timeout or failure, so
+                                   checkpointed work is kept instead of starting over
+        """
+        command = [sys.executable, script_path] + list(args or [])
+        
+        for attempt in range(resume_attempts + 1):
+            if attempt > 0:
+                logger.info(f"🔁 Resuming: {description} (attempt {attempt + 1}/{resume_attempts + 1})")
+                if '--resume' not in command:
+                    command.append('--resume')
             
-            if result.returncode == 0:
-                logger.info(f"✅ Completed: {description}")
-                return True
-            else:
-                logger.error(f"❌ Failed: {description}")
-                logger.error(f"Error output: {result.stderr}")
-                return False
+            try:
+                logger.info(f"🔄 Starting: {description}")
                 
-        except subprocess.TimeoutExpired:
-            logger.error(f"⏰ Timeout: {description} took too long")
-            return False
-        except Exception as e:
-            logger.error(f"❌ Exception in {description}: {e}")
-            return False
+                # Change to project directory
+                os.chdir(self.project_root)
+                
+                # Run the script
+                result = subprocess.run(command, capture_output=True, text=True, timeout=1800)  # 30 minute timeout
+                
+                if result.returncode == 0:
+                    logger.info(f"✅ Completed: {description}")
+                    return True
+                else:
+                    logger.error(f"❌ Failed: {description}")
+                    logger.error(f"Error output: {result.stderr}")
+                    
+            except subprocess.TimeoutExpired:
+                logger.error(f"⏰ Timeout: {description} took too long")
+            except Exception as e:
+                logger.error(f"❌ Exception in {description}: {e}")
+                return False
+        
+        return False
     
     def daily_data_collection(self):
         """Run daily data collection"""
@@ -97,7 +112,8 @@ class SimpleAutomation:
             
         return self.run_script(
             'scripts/run_complete_pipeline.py', 
-            'Daily data collection and feature engineering'
+            'Daily data collection and feature engineering',
+            resume_attempts=2
         )
     
     def daily_paper_trading(self):
@@ -124,7 +140,8 @@ class SimpleAutomation:
             
         return self.run_script(
             'scripts/run_complete_pipeline.py',
-            'Weekly model retraining'
+            'Weekly model retraining',
+            resume_attempts=2
         )
     
     def check_system_health(self):
@@ -234,7 +251,8 @@ class SimpleAutomation:
         # Force complete pipeline run
         success = self.run_script(
             'scripts/run_complete_pipeline.py',
-            'Weekly complete pipeline maintenance'
+            'Weekly complete pipeline maintenance',
+            resume_attempts=2
         )
         
         if success:
@@ -1,7 +1,14 @@
 import os
 import json
-import yfinance as yf
+import sys
 from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.resolve() / "src"))
+from data_collection.quote_cache import QuoteCache
+
+quote_cache = QuoteCache()
 
 # Check the correct portfolio location within the project
 portfolio_file = 'outputs/paper_portfolio.json'
@@ -27,12 +34,13 @@ if os.path.exists(portfolio_file):
         total_current_value = 0
         position_details = []
         
+        # Fetch all current prices in one batch (reuses quotes cached in this cycle)
+        prices = quote_cache.get_prices(list(portfolio_data['positions'].keys()))
+        
         for symbol, pos in portfolio_data['positions'].items():
             try:
                 # Get current real-time price
-                ticker = yf.Ticker(symbol)
-                current_data = ticker.history(period='1d')
-                current_price = current_data['Close'].iloc[-1] if not current_data.empty else pos["avg_price"]
+                current_price = prices.get(symbol) or pos["avg_price"]
                 
                 shares = pos["shares"]
                 purchase_price = pos["avg_price"]
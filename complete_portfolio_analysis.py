@@ -1,6 +1,13 @@
 import json
-import yfinance as yf
+import sys
 from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.resolve() / "src"))
+from data_collection.quote_cache import QuoteCache
+
+quote_cache = QuoteCache()
 
 # Load portfolio data
 with open('outputs/paper_portfolio.json', 'r') as f:
@@ -18,12 +25,13 @@ position_details = []
 print('\n📊 CURRENT POSITIONS WITH REAL-TIME GROWTH:')
 print('-' * 60)
 
+# Fetch all current prices in one batch (reuses quotes cached in this cycle)
+prices = quote_cache.get_prices(list(portfolio['positions'].keys()))
+
 for symbol, pos in portfolio['positions'].items():
     try:
         # Get current real-time price
-        ticker = yf.Ticker(symbol)
-        current_data = ticker.history(period='1d')
-        current_price = current_data['Close'].iloc[-1] if not current_data.empty else pos['avg_price']
+        current_price = prices.get(symbol) or pos['avg_price']
         
         shares = pos['shares']
         purchase_price = pos['avg_price']
@@ -0,0 +1,144 @@
+"""
+Indicator Benchmark Script
+Compares the NumPy indicator kernels with the `ta` library for speed and accuracy
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+project_root = Path(__file__).parent.parent.resolve()
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from utils.paths import get_data_dir
+from storage.dataset_io import list_datasets, read_dataset, dataset_stem
+from feature_engineering import indicators
+
+try:
+    import ta
+    TA_AVAILABLE = True
+except ImportError:
+    TA_AVAILABLE = False
+
+def ta_indicators(df):
+    """Compute the feature set with `ta`, as add_technical_indicators used to"""
+    features = {}
+    features["SMA_10"] = ta.trend.SMAIndicator(close=df["Close"], window=10).sma_indicator()
+    features["SMA_20"] = ta.trend.SMAIndicator(close=df["Close"], window=20).sma_indicator()
+    features["EMA_10"] = ta.trend.EMAIndicator(close=df["Close"], window=10).ema_indicator()
+    features["EMA_20"] = ta.trend.EMAIndicator(close=df["Close"], window=20).ema_indicator()
+    features["RSI_14"] = ta.momentum.RSIIndicator(close=df["Close"], window=14).rsi()
+    macd = ta.trend.MACD(close=df["Close"])
+    features["MACD"] = macd.macd()
+    features["MACD_signal"] = macd.macd_signal()
+    features["MACD_hist"] = macd.macd_diff()
+    features["ATR_14"] = ta.volatility.AverageTrueRange(
+        high=df["High"], low=df["Low"], close=df["Close"], window=14
+    ).average_true_range()
+    bb = ta.volatility.BollingerBands(close=df["Close"], window=20, window_dev=2)
+    features["BB_upper"] = bb.bollinger_hband()
+    features["BB_middle"] = bb.bollinger_mavg()
+    features["BB_lower"] = bb.bollinger_lband()
+    features["OBV"] = ta.volume.OnBalanceVolumeIndicator(
+        close=df["Close"], volume=df["Volume"]
+    ).on_balance_volume()
+    return {name: series.to_numpy(dtype=float) for name, series in features.items()}
+
+def numpy_indicators(close, high, low, volume):
+    """Compute the same feature set with the NumPy kernels"""
+    features = {}
+    features["SMA_10"] = indicators.sma(close, 10)
+    features["SMA_20"] = indicators.sma(close, 20)
+    features["EMA_10"] = indicators.ema(close, 10)
+    features["EMA_20"] = indicators.ema(close, 20)
+    features["RSI_14"] = indicators.rsi(close, 14)
+    features["MACD"], features["MACD_signal"], features["MACD_hist"] = indicators.macd(close)
+    features["ATR_14"] = indicators.atr(high, low, close, 14)
+    features["BB_upper"], features["BB_middle"], features["BB_lower"] = indicators.bollinger_bands(close, 20, 2)
+    features["OBV"] = indicators.obv(close, volume)
+    return features
+
+def time_call(func, repeats):
+    """Best wall time of several calls, in seconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def max_relative_error(reference, candidate):
+    """Largest relative difference where both values are defined"""
+    both = ~np.isnan(reference) & ~np.isnan(candidate)
+    if (np.isnan(reference) != np.isnan(candidate)).any():
+        return float("inf")
+    if not both.any():
+        return 0.0
+    scale = np.maximum(np.abs(reference[both]), 1e-12)
+    return float(np.max(np.abs(reference[both] - candidate[both]) / scale))
+
+def run_benchmark(data_dir=None, repeats=20, tolerance=1e-8):
+    """
+    Benchmark both implementations on every raw dataset
+    
+    Args:
+        data_dir (str): Directory of raw datasets (defaults to MarketData)
+        repeats (int): Timing repetitions per symbol (best run is kept)
+        tolerance (float): Maximum accepted relative difference from `ta`
+    
+    Returns:
+        bool: True if every indicator matched within tolerance
+    """
+    if not TA_AVAILABLE:
+        print("❌ ta is not installed. Run: pip install ta")
+        return False
+    
+    data_dir = data_dir or get_data_dir("raw")
+    data_files = list_datasets(data_dir)
+    if not data_files:
+        print(f"⚠️ No data files found in {data_dir}")
+        return False
+    
+    print(f"⏱️ Benchmarking indicators on {len(data_files)} datasets ({repeats} repeats each)")
+    print(f"{'Symbol':<12} {'Rows':>6} {'ta (ms)':>10} {'NumPy (us)':>11} {'Speedup':>9} {'Max rel err':>12}")
+    print("-" * 66)
+    
+    total_ta = 0.0
+    total_numpy = 0.0
+    all_matched = True
+    
+    for file_path in data_files:
+        df = read_dataset(file_path).dropna(subset=["Open", "High", "Low", "Close", "Volume"]).reset_index(drop=True)
+        close = df["Close"].to_numpy(dtype=float)
+        high = df["High"].to_numpy(dtype=float)
+        low = df["Low"].to_numpy(dtype=float)
+        volume = df["Volume"].to_numpy(dtype=float)
+        
+        reference = ta_indicators(df)
+        candidate = numpy_indicators(close, high, low, volume)
+        error = max(max_relative_error(reference[name], candidate[name]) for name in reference)
+        all_matched &= error <= tolerance
+        
+        ta_time = time_call(lambda: ta_indicators(df), max(1, repeats // 10))
+        numpy_time = time_call(lambda: numpy_indicators(close, high, low, volume), repeats)
+        total_ta += ta_time
+        total_numpy += numpy_time
+        
+        status = "✅" if error <= tolerance else "❌"
+        print(f"{dataset_stem(file_path):<12} {len(df):>6} {ta_time * 1e3:>10.2f} {numpy_time * 1e6:>11.1f} "
+              f"{ta_time / numpy_time:>8.0f}x {error:>11.1e} {status}")
+    
+    print("-" * 66)
+    print(f"{'Total':<12} {'':>6} {total_ta * 1e3:>10.2f} {total_numpy * 1e6:>11.1f} {total_ta / total_numpy:>8.0f}x")
+    print(f"{'✅ All indicators match ta' if all_matched else '❌ Some indicators differ from ta'} "
+          f"(tolerance {tolerance:g})")
+    
+    return all_matched
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    sys.exit(0 if run_benchmark(data_dir) else 1)
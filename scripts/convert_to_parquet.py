@@ -0,0 +1,47 @@
+"""
+Dataset Conversion Script
+Migrates existing raw, features and enhanced CSV datasets to Parquet
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent.resolve()
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from storage.dataset_io import convert_directory, PARQUET_AVAILABLE
+
+def convert_all_datasets(remove_csv=False):
+    """Convert every CSV dataset in the data directories to Parquet"""
+    print("🗜️ Converting CSV datasets to Parquet...")
+    print("=" * 50)
+    
+    if not PARQUET_AVAILABLE:
+        print("❌ pyarrow is not installed. Run: pip install pyarrow")
+        return
+    
+    total_converted = 0
+    total_failed = 0
+    
+    for data_type in ["raw", "features", "enhanced"]:
+        data_dir = project_root / "data" / data_type
+        if not data_dir.exists():
+            print(f"⚠️ Skipping missing directory: {data_dir}")
+            continue
+        
+        converted, failed = convert_directory(str(data_dir), "parquet", remove_source=remove_csv)
+        print(f"✅ {data_type}: {converted} converted, {failed} failed")
+        
+        total_converted += converted
+        total_failed += failed
+    
+    print(f"\n📊 Conversion Summary:")
+    print(f"✅ Converted: {total_converted}")
+    print(f"❌ Failed: {total_failed}")
+    if not remove_csv:
+        print("💡 CSV files were kept. Re-run with --remove-csv to delete them.")
+
+if __name__ == "__main__":
+    convert_all_datasets(remove_csv="--remove-csv" in sys.argv)
@@ -5,6 +5,8 @@ Runs the entire AI trading system pipeline from data collection to predictions
 
 import os
 import sys
+import json
+from datetime import datetime
 from pathlib import Path
 
 # Add src to path
@@ -13,52 +15,108 @@ src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
 from data_collection.collect_data import DataCollector
+from data_collection.data_quality import DataQualityScanner
 from feature_engineering.add_indicators import FeatureEngineering
+from feature_engineering.cross_sectional import CrossSectionalFeatures
 from news_analysis.news_analyzer import NewsFeatureEnhancer
 from model_training.train_models import ModelTrainer
 from prediction.prediction_system import StockPredictor, PredictionDisplay
+from utils.paths import get_outputs_dir
 
-def run_complete_pipeline():
-    """Run the complete AI trading pipeline"""
+CHECKPOINT_FILE = os.path.join(get_outputs_dir(), "pipeline_checkpoint.json")
+
+def load_checkpoint():
+    """Load completed stage results from an interrupted run"""
+    if os.path.exists(CHECKPOINT_FILE):
+        with open(CHECKPOINT_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+def save_checkpoint(checkpoint, stage, count):
+    """Record a completed stage and its success count"""
+    checkpoint[stage] = {'count': count, 'completed_at': datetime.now().isoformat()}
+    os.makedirs(os.path.dirname(CHECKPOINT_FILE), exist_ok=True)
+    with open(CHECKPOINT_FILE + ".tmp", 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(CHECKPOINT_FILE + ".tmp", CHECKPOINT_FILE)
+
+def run_complete_pipeline(resume=False):
+    """
+    Run the complete AI trading pipeline
+    
+    Args:
+        resume (bool): Skip stages finished by an interrupted run and only
+                       re-collect symbols that failed or are stale
+    """
     print("🚀 Starting Complete AI Trading Pipeline...")
     print("=" * 60)
     
+    checkpoint = load_checkpoint() if resume else {}
+    if checkpoint:
+        print(f"⏭️ Resuming after completed stages: {', '.join(checkpoint)}")
+    
     # Step 1: Data Collection
     print("\n📊 Step 1: Data Collection")
-    collector = DataCollector()
-    successful_downloads, failed_downloads = collector.collect_data()
+    if 'collection' in checkpoint:
+        successful_downloads = checkpoint['collection']['count']
+        print(f"⏭️ Already completed ({successful_downloads} assets)")
+    else:
+        collector = DataCollector()
+        successful_downloads, failed_downloads = collector.collect_data(resume=resume)
+        
+        if successful_downloads == 0:
+            print("❌ No data collected. Exiting pipeline.")
+            return
+        save_checkpoint(checkpoint, 'collection', successful_downloads)
     
-    if successful_downloads == 0:
-        print("❌ No data collected. Exiting pipeline.")
-        return
+    # Flag bad bars before anything is computed from them
+    DataQualityScanner().scan()
     
     # Step 2: Feature Engineering
     print("\n🔧 Step 2: Feature Engineering")
-    fe = FeatureEngineering()
-    successful_features, failed_features = fe.process_all_files()
-    
-    if successful_features == 0:
-        print("❌ No features created. Exiting pipeline.")
-        return
+    if 'features' in checkpoint:
+        successful_features = checkpoint['features']['count']
+        print(f"⏭️ Already completed ({successful_features} datasets)")
+    else:
+        fe = FeatureEngineering()
+        successful_features, failed_features = fe.process_all_files(workers=os.cpu_count() or 1)
+        
+        if successful_features == 0:
+            print("❌ No features created. Exiting pipeline.")
+            return
+        
+        # Panel-wide ranks, z-scores and correlations, computed once for all symbols
+        CrossSectionalFeatures(fe.output_dir).run()
+        save_checkpoint(checkpoint, 'features', successful_features)
     
     # Step 3: News Analysis Enhancement
     print("\n📰 Step 3: News Analysis Enhancement")
-    enhancer = NewsFeatureEnhancer()
-    successful_enhancements, failed_enhancements = enhancer.enhance_all_datasets()
-    
-    if successful_enhancements == 0:
-        print("❌ No datasets enhanced. Exiting pipeline.")
-        return
+    if 'enhancement' in checkpoint:
+        successful_enhancements = checkpoint['enhancement']['count']
+        print(f"⏭️ Already completed ({successful_enhancements} datasets)")
+    else:
+        enhancer = NewsFeatureEnhancer()
+        successful_enhancements, failed_enhancements = enhancer.enhance_all_datasets()
+        
+        if successful_enhancements == 0:
+            print("❌ No datasets enhanced. Exiting pipeline.")
+            return
+        save_checkpoint(checkpoint, 'enhancement', successful_enhancements)
     
     # Step 4: Model Training
     print("\n🤖 Step 4: Model Training")
-    trainer = ModelTrainer()
-    results = trainer.train_all_models()
-    
-    successful_models = len([r for r in results if r['success']])
-    if successful_models == 0:
-        print("❌ No models trained. Exiting pipeline.")
-        return
+    if 'training' in checkpoint:
+        successful_models = checkpoint['training']['count']
+        print(f"⏭️ Already completed ({successful_models} models)")
+    else:
+        trainer = ModelTrainer()
+        results = trainer.train_all_models()
+        
+        successful_models = len([r for r in results if r['success']])
+        if successful_models == 0:
+            print("❌ No models trained. Exiting pipeline.")
+            return
+        save_checkpoint(checkpoint, 'training', successful_models)
     
     # Step 5: Make Predictions
     print("\n🔮 Step 5: Making Predictions")
@@ -81,6 +139,10 @@ def run_complete_pipeline():
     print(f"🔮 High-Confidence Predictions: {len(top_predictions)}")
     print(f"=" * 60)
     print("✅ Complete AI Trading Pipeline Finished!")
+    
+    # The next run starts fresh
+    if os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
 
 if __name__ == "__main__":
-    run_complete_pipeline()
+    run_complete_pipeline(resume="--resume" in sys.argv)
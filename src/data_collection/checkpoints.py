@@ -0,0 +1,122 @@
+"""
+Collection Checkpoints Module
+Per-symbol records that let an interrupted collection run resume
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+def file_hash(path):
+    """Get the SHA-1 of a file's contents (None if it does not exist)"""
+    if path is None or not os.path.exists(path):
+        return None
+    
+    hasher = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+class CollectionCheckpoint:
+    """
+    JSON checkpoint of the last successful fetch for each symbol
+    
+    The file is rewritten after every symbol, so a crash or timeout loses at
+    most the symbol in flight. A symbol needs collecting again when it failed,
+    has never succeeded, is older than the freshness window, or its stored
+    file no longer matches the recorded content hash.
+    """
+    
+    def __init__(self, checkpoint_file):
+        """
+        Initialize the checkpoint
+        
+        Args:
+            checkpoint_file (str): JSON file holding the records
+        """
+        self.checkpoint_file = checkpoint_file
+        self.records = {}
+        
+        if os.path.exists(checkpoint_file):
+            try:
+                with open(checkpoint_file, 'r') as f:
+                    self.records = json.load(f).get('symbols', {})
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable checkpoint {checkpoint_file}: {e}")
+    
+    def save(self):
+        """Write the records atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_file)), exist_ok=True)
+        
+        tmp_file = self.checkpoint_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated': datetime.now().isoformat(), 'symbols': self.records}, f, indent=2)
+        os.replace(tmp_file, self.checkpoint_file)
+    
+    def mark_success(self, symbol, file_path, rows=None):
+        """
+        Record a successful fetch
+        
+        Args:
+            symbol (str): Ticker symbol
+            file_path (str): Dataset the symbol was written to
+            rows (int): Number of stored rows
+        """
+        now = datetime.now().isoformat()
+        self.records[symbol] = {
+            'status': 'ok',
+            'last_success': now,
+            'last_attempt': now,
+            'file': os.path.basename(file_path) if file_path else None,
+            'content_hash': file_hash(file_path),
+            'rows': rows
+        }
+        self.save()
+    
+    def mark_failure(self, symbol, error):
+        """
+        Record a failed fetch, keeping the previous success details
+        
+        Args:
+            symbol (str): Ticker symbol
+            error (str): Error message
+        """
+        record = self.records.get(symbol, {})
+        record.update({
+            'status': 'failed',
+            'last_attempt': datetime.now().isoformat(),
+            'error': str(error)
+        })
+        self.records[symbol] = record
+        self.save()
+    
+    def is_complete(self, symbol, file_path, max_age_hours=20):
+        """
+        Check whether a symbol can be skipped on resume
+        
+        Args:
+            symbol (str): Ticker symbol
+            file_path (str): Dataset the symbol is stored in
+            max_age_hours (float): How long a successful fetch stays fresh
+        
+        Returns:
+            bool: True if the last fetch succeeded, is fresh and the file is unchanged
+        """
+        record = self.records.get(symbol)
+        if not record or record.get('status') != 'ok':
+            return False
+        
+        last_success = datetime.fromisoformat(record['last_success'])
+        if datetime.now() - last_success > timedelta(hours=max_age_hours):
+            return False
+        
+        return record.get('content_hash') is not None and record['content_hash'] == file_hash(file_path)
+    
+    def summary(self):
+        """Count records by status"""
+        counts = {}
+        for record in self.records.values():
+            counts[record.get('status', 'unknown')] = counts.get(record.get('status', 'unknown'), 0) + 1
+        return counts
@@ -3,80 +3,317 @@ Data Collection Module
 Collects historical market data for stocks, forex, and cryptocurrency
 """
 
-import yfinance as yf
 import pandas as pd
+import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.paths import get_data_dir
+from data_collection.checkpoints import CollectionCheckpoint
+from data_collection.download_engine import DownloadEngine
+from data_collection.providers import get_provider, safe_symbol_name
+from data_collection.universe import all_symbols, asset_class_map, get_manifest_path, load_manifest, shard_symbols
+from storage.dataset_io import dataset_path, find_dataset, read_dataset, write_dataset
+from storage.intraday_store import IntradayStore
+from utils.trading_calendar import get_calendar, infer_asset_class
+
+# Longest history Yahoo serves for each intraday interval
+INTRADAY_MAX_PERIOD = {
+    "1m": "7d",
+    "2m": "60d",
+    "5m": "60d",
+    "15m": "60d",
+    "30m": "60d",
+    "60m": "730d",
+    "90m": "60d",
+    "1h": "730d"
+}
 
 class DataCollector:
-    def __init__(self, output_dir=None):
-        """Initialize the data collector with output directory"""
+    def __init__(self, output_dir=None, provider=None, manifest=None):
+        """
+        Initialize the data collector with output directory
+        
+        Args:
+            output_dir (str): Directory for raw datasets
+            provider (MarketDataProvider): Data source (defaults to get_provider())
+            manifest (str): Symbol manifest file (defaults to config/symbols.json)
+        """
         if output_dir is None:
             self.output_dir = get_data_dir("raw")  # Uses MarketData directory
         else:
             self.output_dir = output_dir
         
-        # Symbol definitions
-        self.stocks = [
-            "AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "TSLA", "NFLX", "AMD", "INTC"
-        ]
+        if provider is None:
+            self.provider = get_provider()
+        else:
+            self.provider = provider
         
-        self.forex = [
-            "EURUSD=X", "JPY=X", "GBPUSD=X", "CHF=X", "AUDUSD=X", "CAD=X"
-        ]
+        # Symbol definitions come from the manifest
+        self.manifest_path = get_manifest_path(manifest)
+        self.universe = load_manifest(self.manifest_path)
         
-        self.crypto = [
-            "BTC-USD", "ETH-USD", "SOL-USD", "BNB-USD", "ADA-USD", "DOGE-USD"
-        ]
+        self.stocks = self.universe.get("stocks", [])
+        self.forex = self.universe.get("forex", [])
+        self.crypto = self.universe.get("crypto", [])
         
-        self.all_symbols = self.stocks + self.forex + self.crypto
+        self.all_symbols = all_symbols(self.universe)
         
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def collect_data(self, period="5y", interval="1d"):
+    def get_file_path(self, symbol):
+        """
+        Get the raw data file path for a symbol
+        
+        Args:
+            symbol (str): Ticker symbol (e.g., "BTC-USD")
+            
+        Returns:
+            str: Path of the stored dataset, or where a new one will be written
+        """
+        stem = safe_symbol_name(symbol)
+        return find_dataset(self.output_dir, stem) or dataset_path(self.output_dir, stem)
+    
+    def load_existing_data(self, symbol):
+        """
+        Load previously stored bars for a symbol
+        
+        Args:
+            symbol (str): Ticker symbol
+            
+        Returns:
+            pandas.DataFrame: Stored bars with parsed dates, or None if nothing is stored
+        """
+        file_path = find_dataset(self.output_dir, safe_symbol_name(symbol))
+        
+        if file_path is None:
+            return None
+        
+        # Legacy CSVs carry yfinance's ticker row under the header; reading drops it
+        df = read_dataset(file_path)
+        if 'Date' not in df.columns or df.empty:
+            return None
+        
+        return df
+    
+    def get_last_stored_date(self, symbol):
+        """
+        Get the most recent bar date stored for a symbol
+        
+        Args:
+            symbol (str): Ticker symbol
+            
+        Returns:
+            pandas.Timestamp: Last stored date, or None if nothing is stored
+        """
+        df = self.load_existing_data(symbol)
+        if df is None:
+            return None
+        return df['Date'].max()
+    
+    def merge_bars(self, existing_df, new_df):
+        """
+        Merge newly downloaded bars into the stored history
+        
+        Bars in the overlap window are replaced by the fresh download so that
+        revised values (late prints, split adjustments) win over stale ones.
+        
+        Args:
+            existing_df (pandas.DataFrame): Stored bars with a 'Date' column
+            new_df (pandas.DataFrame): Downloaded bars with a 'Date' column
+            
+        Returns:
+            pandas.DataFrame: Combined bars sorted by date
+        """
+        new_df = new_df.copy()
+        new_df['Date'] = pd.to_datetime(new_df['Date'])
+        
+        # Drop stored bars that the new download covers
+        first_new_date = new_df['Date'].min()
+        kept_df = existing_df[existing_df['Date'] < first_new_date]
+        
+        merged = pd.concat([kept_df, new_df], ignore_index=True)
+        merged = merged.drop_duplicates(subset=['Date'], keep='last')
+        merged = merged.sort_values('Date').reset_index(drop=True)
+        
+        return merged
+    
+    def download_symbol(self, symbol, period="5y", interval="1d", start=None):
+        """
+        Download bars for a single symbol
+        
+        Args:
+            symbol (str): Ticker symbol
+            period (str): Data period used when no start date is given
+            interval (str): Data interval
+            start (datetime): Optional first date to download from
+            
+        Returns:
+            pandas.DataFrame: Downloaded bars with 'Date' as a column
+        """
+        results = self.provider.download_batch([symbol], period=period, interval=interval, start=start)
+        return results.get(symbol, pd.DataFrame())
+    
+    def save_symbol_data(self, symbol, df, existing_df=None):
+        """
+        Write downloaded bars to the symbol's raw data file
+        
+        Args:
+            symbol (str): Ticker symbol
+            df (pandas.DataFrame): Downloaded bars with 'Date' as a column
+            existing_df (pandas.DataFrame): Stored bars to merge into (incremental mode)
+            
+        Returns:
+            bool: True if the symbol has data on disk after the call
+        """
+        if df.empty:
+            if existing_df is not None:
+                print(f"✅ {symbol} already up to date")
+                return True
+            print(f"⚠️ No data found for {symbol}")
+            return False
+        
+        if existing_df is not None:
+            # Flatten yfinance's (Price, Ticker) columns before merging
+            if isinstance(df.columns, pd.MultiIndex):
+                df.columns = df.columns.get_level_values(0)
+            
+            new_rows = len(df[pd.to_datetime(df['Date']) > existing_df['Date'].max()])
+            df = self.merge_bars(existing_df, df)
+            
+            file_path = write_dataset(df, self.get_file_path(symbol))
+            print(f"✅ Updated: {file_path} (+{new_rows} new rows, {len(df)} total)")
+        else:
+            file_path = write_dataset(df, dataset_path(self.output_dir, safe_symbol_name(symbol)))
+            print(f"✅ Saved: {file_path} ({len(df)} rows)")
+        
+        return True
+    
+    def collect_data(self, period="5y", interval="1d", incremental=False, overlap_days=5,
+                     workers=None, provider=None, resume=False, max_age_hours=20,
+                     symbols=None, checkpoint_file=None):
         """
         Collect historical market data for all symbols
         
         Args:
             period (str): Data period (e.g., "5y", "2y", "1y")
             interval (str): Data interval (e.g., "1d", "1h")
+            incremental (bool): Only fetch bars newer than the stored history and append them
+            overlap_days (int): Days before the last stored bar to re-download in incremental mode
+            workers (int): Download with a thread pool of this size using batched requests
+            provider (MarketDataProvider): Data source for this run (defaults to self.provider)
+            resume (bool): Skip symbols the checkpoint records as fresh and unchanged on disk
+            max_age_hours (float): How long a successful fetch counts as fresh when resuming
+            symbols (list): Collect only these symbols (defaults to the whole universe)
+            checkpoint_file (str): Checkpoint to record outcomes in (defaults to the output directory's)
+            
+        Returns:
+            tuple: (successful_count, failed_count); skipped symbols count as successful
         """
-        print(f"📊 Starting data collection for {len(self.all_symbols)} symbols...")
+        # Intraday bars go to the partitioned intraday store, not the daily files
+        if interval in INTRADAY_MAX_PERIOD:
+            return self.collect_intraday(interval, symbols=symbols, workers=workers or 4, provider=provider)
+        
+        requested = symbols if symbols is not None else self.all_symbols
+        
+        # Every outcome is checkpointed so a rerun only retries failed or stale symbols
+        if checkpoint_file is None:
+            checkpoint_file = os.path.join(self.output_dir, ".collection_checkpoint.json")
+        checkpoint = CollectionCheckpoint(checkpoint_file)
+        symbols = requested
+        skipped = 0
+        if resume:
+            symbols = [s for s in requested
+                       if not checkpoint.is_complete(s, self.get_file_path(s), max_age_hours)]
+            skipped = len(requested) - len(symbols)
+        
+        print(f"📊 Starting data collection for {len(symbols)} symbols...")
         print(f"📁 Output directory: {self.output_dir}")
+        if resume:
+            print(f"⏭️ Resuming: {skipped} symbols already collected in the last {max_age_hours}h")
+        if incremental:
+            print(f"🔁 Incremental mode: re-checking last {overlap_days} days")
         
-        successful_downloads = 0
+        successful_downloads = skipped
         failed_downloads = 0
         
-        for symbol in self.all_symbols:
-            print(f"📥 Downloading {symbol}...")
-            try:
-                # Download data
-                df = yf.download(symbol, period=period, interval=interval)
-                
-                if not df.empty:
-                    # Reset index to make 'Date' a column
-                    df.reset_index(inplace=True)
-                    
-                    # Create safe filename
-                    safe_name = symbol.replace("=", "").replace("-", "_")
-                    file_path = os.path.join(self.output_dir, f"{safe_name}.csv")
-                    
-                    # Save to CSV
-                    df.to_csv(file_path, index=False)
-                    print(f"✅ Saved: {file_path} ({len(df)} rows)")
-                    successful_downloads += 1
-                else:
-                    print(f"⚠️ No data found for {symbol}")
+        # Stored history decides where each symbol's download starts
+        existing = {}
+        starts = {}
+        for symbol in symbols:
+            existing[symbol] = self.load_existing_data(symbol) if incremental else None
+            if existing[symbol] is not None:
+                starts[symbol] = existing[symbol]['Date'].max() - pd.Timedelta(days=overlap_days)
+            else:
+                starts[symbol] = None
+        
+        # Skip symbols whose market has had no session since the last stored bar
+        if incremental:
+            today = pd.Timestamp.now().normalize()
+            classes = asset_class_map(self.universe)
+            closed = []
+            for symbol in symbols:
+                if existing[symbol] is None:
+                    continue
+                last_date = existing[symbol]['Date'].max().normalize()
+                next_session = get_calendar(classes.get(symbol) or infer_asset_class(symbol)).next_session(last_date)
+                if last_date < today and (next_session is None or next_session > today):
+                    closed.append(symbol)
+            
+            for symbol in closed:
+                print(f"✅ {symbol} already up to date (market closed since {existing[symbol]['Date'].max().date()})")
+                checkpoint.mark_success(symbol, self.get_file_path(symbol))
+                successful_downloads += 1
+            symbols = [symbol for symbol in symbols if symbol not in closed]
+        
+        if workers or provider is not None:
+            engine = DownloadEngine(provider or self.provider, max_workers=workers or 8)
+            
+            print(f"⚡ Concurrent mode: {engine.max_workers} workers, "
+                  f"{engine.batch_size} tickers per request via {engine.provider.name}")
+            results, errors = engine.download(symbols, period=period,
+                                              interval=interval, starts=starts)
+            
+            for symbol in symbols:
+                if symbol in errors:
+                    print(f"❌ Failed to download {symbol}: {errors[symbol]}")
+                    checkpoint.mark_failure(symbol, errors[symbol])
+                    failed_downloads += 1
+                    continue
+                try:
+                    if self.save_symbol_data(symbol, results[symbol], existing[symbol]):
+                        checkpoint.mark_success(symbol, self.get_file_path(symbol))
+                        successful_downloads += 1
+                    else:
+                        checkpoint.mark_failure(symbol, "no data returned")
+                        failed_downloads += 1
+                except Exception as e:
+                    print(f"❌ Failed to save {symbol}: {e}")
+                    checkpoint.mark_failure(symbol, e)
                     failed_downloads += 1
+        else:
+            for symbol in symbols:
+                print(f"📥 Downloading {symbol}...")
+                try:
+                    df = self.download_symbol(symbol, period=period, interval=interval,
+                                              start=starts[symbol])
                     
-            except Exception as e:
-                print(f"❌ Failed to download {symbol}: {e}")
-                failed_downloads += 1
+                    if self.save_symbol_data(symbol, df, existing[symbol]):
+                        checkpoint.mark_success(symbol, self.get_file_path(symbol))
+                        successful_downloads += 1
+                    else:
+                        checkpoint.mark_failure(symbol, "no data returned")
+                        failed_downloads += 1
+                        
+                except Exception as e:
+                    print(f"❌ Failed to download {symbol}: {e}")
+                    checkpoint.mark_failure(symbol, e)
+                    failed_downloads += 1
         
         print(f"\n📊 Data Collection Summary:")
         print(f"✅ Successful: {successful_downloads}")
@@ -85,11 +322,231 @@ class DataCollector:
         
         return successful_downloads, failed_downloads
 
+    def shard_report_path(self, shard_index, shard_count):
+        """Get where a shard writes its completion report"""
+        return os.path.join(self.output_dir, ".shards", f"shard_{shard_index}_of_{shard_count}.json")
+    
+    def collect_shard(self, shard_index, shard_count, **kwargs):
+        """
+        Collect one shard of the universe and write its completion report
+        
+        Shards can run as local processes (collect_sharded) or on separate
+        hosts sharing the output directory; each keeps its own checkpoint so
+        concurrent shards never overwrite each other's records.
+        
+        Args:
+            shard_index (int): Shard to collect, 0 <= shard_index < shard_count
+            shard_count (int): Total number of shards
+            **kwargs: Passed to collect_data (e.g., incremental, resume, workers)
+            
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        symbols = shard_symbols(self.all_symbols, shard_index, shard_count)
+        checkpoint_file = os.path.join(self.output_dir, ".shards",
+                                       f"checkpoint_{shard_index}_of_{shard_count}.json")
+        
+        print(f"🧩 Shard {shard_index + 1}/{shard_count}: {len(symbols)} symbols")
+        if symbols:
+            successful, failed = self.collect_data(symbols=symbols, checkpoint_file=checkpoint_file, **kwargs)
+        else:
+            # Nothing to collect, but the empty report still marks the shard as finished
+            successful, failed = 0, 0
+        
+        # The checkpoint already holds each symbol's outcome
+        records = CollectionCheckpoint(checkpoint_file).records
+        report = {
+            'shard_index': shard_index,
+            'shard_count': shard_count,
+            'finished': datetime.now().isoformat(),
+            'symbols': len(symbols),
+            'successful': [s for s in symbols if records.get(s, {}).get('status') == 'ok'],
+            'failed': {s: records.get(s, {}).get('error', 'not attempted')
+                       for s in symbols if records.get(s, {}).get('status') != 'ok'}
+        }
+        
+        report_file = self.shard_report_path(shard_index, shard_count)
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+        with open(report_file + ".tmp", 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(report_file + ".tmp", report_file)
+        
+        return successful, failed
+    
+    def merge_shard_reports(self, shard_count):
+        """
+        Combine the shard completion reports into one collection report
+        
+        Args:
+            shard_count (int): Number of shards the run was split into
+            
+        Returns:
+            dict: Combined report, also written to .collection_report.json
+        """
+        report = {
+            'finished': datetime.now().isoformat(),
+            'shard_count': shard_count,
+            'symbols': 0,
+            'successful': [],
+            'failed': {},
+            'missing_shards': []
+        }
+        
+        for shard_index in range(shard_count):
+            report_file = self.shard_report_path(shard_index, shard_count)
+            if not os.path.exists(report_file):
+                report['missing_shards'].append(shard_index)
+                continue
+            
+            with open(report_file, 'r') as f:
+                shard = json.load(f)
+            report['symbols'] += shard['symbols']
+            report['successful'].extend(shard['successful'])
+            report['failed'].update(shard['failed'])
+        
+        with open(os.path.join(self.output_dir, ".collection_report.json"), 'w') as f:
+            json.dump(report, f, indent=2)
+        
+        print(f"\n🧩 Sharded Collection Summary ({shard_count} shards):")
+        print(f"✅ Successful: {len(report['successful'])}")
+        print(f"❌ Failed: {len(report['failed'])}")
+        if report['missing_shards']:
+            print(f"⚠️ Shards without a report: {report['missing_shards']}")
+        
+        return report
+    
+    def collect_sharded(self, processes=4, **kwargs):
+        """
+        Collect the universe with one worker process per shard
+        
+        Worker processes build their provider from the environment
+        (TRADING_DATA_PROVIDER), since provider objects are not shared
+        across processes.
+        
+        Args:
+            processes (int): Number of shards and worker processes
+            **kwargs: Passed to collect_data in every shard
+            
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        os.makedirs(os.path.join(self.output_dir, ".shards"), exist_ok=True)
+        
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(run_shard, self.output_dir, self.manifest_path, shard_index, processes, kwargs)
+                for shard_index in range(processes)
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"❌ Shard failed: {e}")
+        
+        report = self.merge_shard_reports(processes)
+        return len(report['successful']), len(report['failed'])
+    
+    def collect_intraday(self, interval="5m", symbols=None, store=None, workers=4, provider=None):
+        """
+        Collect intraday bars into the partitioned intraday store
+        
+        Each symbol resumes from the day of its last stored bar; that day is
+        re-downloaded and merged so partial sessions get completed.
+        
+        Args:
+            interval (str): Bar interval (e.g., "1m", "5m", "1h")
+            symbols (list): Symbols to collect (defaults to all symbols)
+            store (IntradayStore): Destination store (defaults to data/intraday)
+            workers (int): Download thread pool size
+            provider (MarketDataProvider): Data source for this run (defaults to self.provider)
+            
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        if store is None:
+            store = IntradayStore()
+        if symbols is None:
+            symbols = self.all_symbols
+        
+        period = INTRADAY_MAX_PERIOD.get(interval, "60d")
+        
+        print(f"⏱️ Starting {interval} intraday collection for {len(symbols)} symbols...")
+        print(f"📁 Intraday store: {store.root_dir}")
+        
+        # Resume from the last stored day, unless it is older than the provider keeps
+        oldest_available = pd.Timestamp.now(tz="UTC").tz_localize(None) - pd.Timedelta(days=int(period[:-1]) - 1)
+        starts = {}
+        for symbol in symbols:
+            last = store.last_timestamp(safe_symbol_name(symbol), interval)
+            if last is not None and last >= oldest_available:
+                starts[symbol] = last.normalize()
+            else:
+                starts[symbol] = None
+        
+        engine = DownloadEngine(provider or self.provider, max_workers=workers)
+        results, errors = engine.download(symbols, period=period, interval=interval, starts=starts)
+        
+        successful = 0
+        failed = 0
+        
+        for symbol in symbols:
+            if symbol in errors:
+                print(f"❌ Failed to download {symbol}: {errors[symbol]}")
+                failed += 1
+                continue
+            
+            df = results.get(symbol, pd.DataFrame())
+            if df.empty:
+                if starts[symbol] is not None:
+                    print(f"✅ {symbol} already up to date")
+                    successful += 1
+                else:
+                    print(f"⚠️ No {interval} data found for {symbol}")
+                    failed += 1
+                continue
+            
+            try:
+                partitions = store.write(safe_symbol_name(symbol), interval, df)
+                print(f"✅ {symbol}: {len(df)} bars across {partitions} day partitions")
+                successful += 1
+            except Exception as e:
+                print(f"❌ Failed to store {symbol}: {e}")
+                failed += 1
+        
+        print(f"\n⏱️ Intraday Collection Summary:")
+        print(f"✅ Successful: {successful}")
+        print(f"❌ Failed: {failed}")
+        
+        return successful, failed
+
+def run_shard(output_dir, manifest, shard_index, shard_count, kwargs):
+    """Collect one shard in a worker process"""
+    collector = DataCollector(output_dir, manifest=manifest)
+    return collector.collect_shard(shard_index, shard_count, **kwargs)
+
+def get_option(name):
+    """Get the value following a command line flag, or None"""
+    if name in sys.argv and sys.argv.index(name) + 1 < len(sys.argv):
+        return sys.argv[sys.argv.index(name) + 1]
+    return None
+
 if __name__ == "__main__":
     # Initialize collector
     collector = DataCollector()
     
-    # Collect data
-    collector.collect_data()
+    # Pass --incremental to only append new bars, --resume to skip symbols that
+    # the last run already collected
+    options = {'incremental': "--incremental" in sys.argv, 'resume': "--resume" in sys.argv}
+    
+    if get_option("--shard"):
+        # One shard on this host, e.g. --shard 2/8 (0-based); merge later with --merge-shards 8
+        shard_index, shard_count = map(int, get_option("--shard").split("/"))
+        collector.collect_shard(shard_index, shard_count, **options)
+    elif get_option("--merge-shards"):
+        collector.merge_shard_reports(int(get_option("--merge-shards")))
+    elif get_option("--processes"):
+        collector.collect_sharded(int(get_option("--processes")), **options)
+    else:
+        collector.collect_data(**options)
     
     print("\n✅ Data collection completed!")
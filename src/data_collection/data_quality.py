@@ -0,0 +1,234 @@
+"""
+Data Quality Module
+Vectorized validation of raw bars across the whole symbol universe
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from storage.dataset_io import dataset_path, dataset_stem, list_datasets, read_dataset, write_dataset
+from utils.trading_calendar import get_calendar, infer_asset_class, normalize_asset_class
+
+# Row flags; a row's mask is the bitwise OR of every check it fails
+FLAG_DUPLICATE_DATE = 1
+FLAG_NON_POSITIVE_PRICE = 2
+FLAG_HIGH_BELOW_LOW = 4
+FLAG_GAP = 8
+FLAG_VOLUME_SPIKE = 16
+FLAG_STALE_REPEAT = 32
+FLAG_MISSING_VALUE = 64
+
+FLAG_NAMES = {
+    FLAG_DUPLICATE_DATE: "duplicate_date",
+    FLAG_NON_POSITIVE_PRICE: "non_positive_price",
+    FLAG_HIGH_BELOW_LOW: "high_below_low",
+    FLAG_GAP: "gap",
+    FLAG_VOLUME_SPIKE: "volume_spike",
+    FLAG_STALE_REPEAT: "stale_repeat",
+    FLAG_MISSING_VALUE: "missing_value"
+}
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+def scan_frames(frames, asset_classes=None, max_missing_sessions=0, spike_factor=10.0, spike_window=20):
+    """
+    Validate bars for many symbols in one vectorized pass
+    
+    All symbols are stacked into a single sorted array, so every check is one
+    NumPy expression over the whole universe instead of a loop per symbol.
+    
+    Args:
+        frames (dict): Symbol -> DataFrame with 'Date' and OHLCV columns
+        asset_classes (dict): Symbol -> 'stock', 'forex' or 'crypto' (inferred when missing)
+        max_missing_sessions (int): Missing calendar sessions tolerated before a gap is flagged
+        spike_factor (float): Volume above this multiple of the trailing median is a spike
+        spike_window (int): Bars in the trailing volume median
+    
+    Returns:
+        tuple: (mask DataFrame with Symbol, Date, Flags columns, report dict)
+    """
+    asset_classes = asset_classes or {}
+    symbols = sorted(frames)
+    
+    code_parts = []
+    date_parts = []
+    value_parts = []
+    for code, symbol in enumerate(symbols):
+        df = frames[symbol]
+        dates = df['Date'].values
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            dates = pd.to_datetime(df['Date']).values
+        code_parts.append(np.full(len(df), code, dtype=np.int32))
+        date_parts.append(dates.astype("datetime64[D]"))
+        value_parts.append(np.column_stack([
+            df[col].values.astype(np.float64) if col in df.columns else np.full(len(df), np.nan)
+            for col in PRICE_COLUMNS + ['Volume']
+        ]))
+    
+    if not code_parts:
+        # Same keys as a normal report, so callers need no special case for an empty universe
+        report = {
+            'symbols': 0,
+            'rows': 0,
+            'flagged_rows': 0,
+            'flag_counts': {name: 0 for name in FLAG_NAMES.values()},
+            'issues': {}
+        }
+        return pd.DataFrame(columns=['Symbol', 'Date', 'Flags']), report
+    
+    # Stable sort keeps duplicate dates in file order, so the first copy stays unflagged
+    codes = np.concatenate(code_parts)
+    dates = np.concatenate(date_parts)
+    order = np.lexsort((dates, codes))
+    codes = codes[order]
+    dates = dates[order]
+    values = np.concatenate(value_parts)[order]
+    prices = values[:, :4]
+    volume = values[:, 4]
+    flags = np.zeros(len(codes), dtype=np.uint8)
+    
+    # Position of each row within its symbol, and whether the previous row is the same symbol
+    starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+    counts = np.diff(np.r_[starts, len(codes)])
+    position = np.arange(len(codes)) - np.repeat(starts, counts)
+    same_symbol = position > 0
+    
+    prev_dates = np.r_[dates[:1], dates[:-1]]
+    prev_prices = np.vstack([prices[:1], prices[:-1]])
+    prev_volume = np.r_[volume[:1], volume[:-1]]
+    
+    with np.errstate(invalid="ignore"):
+        flags[same_symbol & (dates == prev_dates)] |= FLAG_DUPLICATE_DATE
+        flags[np.isnan(prices).any(axis=1)] |= FLAG_MISSING_VALUE
+        flags[(prices <= 0).any(axis=1)] |= FLAG_NON_POSITIVE_PRICE
+        flags[prices[:, 1] < prices[:, 2]] |= FLAG_HIGH_BELOW_LOW
+        
+        repeat = same_symbol & (prices == prev_prices).all(axis=1)
+        repeat &= (volume == prev_volume) | (volume == 0)
+        flags[repeat] |= FLAG_STALE_REPEAT
+        
+        # Gaps are counted in sessions of each symbol's trading calendar
+        symbol_classes = np.array([normalize_asset_class(asset_classes.get(s, infer_asset_class(s)))
+                                   for s in symbols])[codes]
+        later = same_symbol & (dates > prev_dates)
+        missing = np.zeros(len(codes), dtype=np.int64)
+        for asset_class in np.unique(symbol_classes[later]):
+            rows = later & (symbol_classes == asset_class)
+            calendar = get_calendar(asset_class)
+            missing[rows] = calendar.count_sessions_between(prev_dates[rows], dates[rows]) - max_missing_sessions
+        flags[missing > 0] |= FLAG_GAP
+        
+        # Trailing median over the stacked array; windows that reach into the
+        # previous symbol are discarded by requiring a full in-symbol history
+        trailing = pd.Series(volume).rolling(spike_window).median().shift(1).values
+        valid = (position >= spike_window) & (trailing > 0)
+        flags[valid & (volume > spike_factor * trailing)] |= FLAG_VOLUME_SPIKE
+    
+    symbol_names = np.array(symbols, dtype=object)
+    mask = pd.DataFrame({
+        'Symbol': pd.Categorical.from_codes(codes, categories=symbols),
+        'Date': dates.astype("datetime64[ns]"),
+        'Flags': flags
+    })
+    
+    flag_counts = {name: int(((flags & bit) > 0).sum()) for bit, name in FLAG_NAMES.items()}
+    
+    # Per-symbol counts only for symbols with at least one flagged row
+    issues = {}
+    flagged_codes = np.unique(codes[flags > 0])
+    for bit, name in FLAG_NAMES.items():
+        per_symbol = np.bincount(codes[(flags & bit) > 0], minlength=len(symbols))
+        for code in flagged_codes:
+            if per_symbol[code]:
+                issues.setdefault(symbol_names[code], {})[name] = int(per_symbol[code])
+    
+    report = {
+        'symbols': len(symbols),
+        'rows': int(len(flags)),
+        'flagged_rows': int((flags > 0).sum()),
+        'flag_counts': flag_counts,
+        'issues': issues
+    }
+    
+    return mask, report
+
+class DataQualityScanner:
+    """Scans every raw dataset and writes a quality report plus a per-row mask"""
+    
+    def __init__(self, data_dir=None, output_dir=None, asset_classes=None):
+        """
+        Initialize the scanner
+        
+        Args:
+            data_dir (str): Directory of raw datasets (defaults to MarketData)
+            output_dir (str): Where the report and mask are written (defaults to data/quality)
+            asset_classes (dict): Symbol -> asset class overrides
+        """
+        if data_dir is None:
+            self.data_dir = get_data_dir("raw")
+        else:
+            self.data_dir = data_dir
+        
+        if output_dir is None:
+            self.output_dir = get_data_dir("quality")
+        else:
+            self.output_dir = output_dir
+        
+        self.asset_classes = asset_classes or {}
+        self.report_file = os.path.join(self.output_dir, "quality_report.json")
+    
+    def load_frames(self):
+        """Load the OHLCV columns of every raw dataset, keyed by dataset name"""
+        frames = {}
+        for path in list_datasets(self.data_dir):
+            try:
+                frames[dataset_stem(path)] = read_dataset(path, columns=['Date'] + PRICE_COLUMNS + ['Volume'])
+            except Exception as e:
+                print(f"❌ Failed to read {path}: {e}")
+        return frames
+    
+    def scan(self, frames=None, save=True):
+        """
+        Validate all datasets and optionally write the report and mask
+        
+        Args:
+            frames (dict): Symbol -> DataFrame to scan instead of the raw directory
+            save (bool): Write quality_report.json and the row_mask dataset
+        
+        Returns:
+            dict: Quality report
+        """
+        start_time = time.perf_counter()
+        
+        if frames is None:
+            frames = self.load_frames()
+        mask, report = scan_frames(frames, self.asset_classes)
+        
+        report['generated'] = datetime.now().isoformat()
+        report['elapsed_seconds'] = round(time.perf_counter() - start_time, 4)
+        
+        if save:
+            os.makedirs(self.output_dir, exist_ok=True)
+            write_dataset(mask, dataset_path(self.output_dir, "row_mask"))
+            with open(self.report_file, 'w') as f:
+                json.dump(report, f, indent=2)
+        
+        print(f"🔍 Data quality: {report['flagged_rows']} of {report['rows']} rows flagged "
+              f"across {len(report['issues'])} of {report['symbols']} symbols "
+              f"({report['elapsed_seconds']:.3f}s)")
+        for name, count in report['flag_counts'].items():
+            if count:
+                print(f"⚠️ {name}: {count} rows")
+        
+        return report
+
+if __name__ == "__main__":
+    DataQualityScanner().scan()
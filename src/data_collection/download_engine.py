@@ -0,0 +1,134 @@
+"""
+Download Engine Module
+Concurrent, batched multi-symbol downloads with retry and backoff
+"""
+
+import pandas as pd
+import threading
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class DownloadEngine:
+    """Runs provider batch requests on a bounded thread pool"""
+    
+    # One semaphore per provider name so every engine respects the same limit
+    _provider_limits = {}
+    _limits_lock = threading.Lock()
+    
+    def __init__(self, provider, max_workers=8, batch_size=None, max_retries=3, backoff_seconds=1.0):
+        """
+        Initialize the download engine
+        
+        Args:
+            provider: Object with name, max_concurrency and download_batch(symbols, period, interval, start)
+            max_workers (int): Size of the thread pool
+            batch_size (int): Tickers per request (defaults to the provider's batch size)
+            max_retries (int): Retries per batch after the first attempt
+            backoff_seconds (float): Base delay for exponential backoff between retries
+        """
+        self.provider = provider
+        self.max_workers = max_workers
+        self.batch_size = batch_size or getattr(provider, 'batch_size', 20)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.semaphore = self.get_provider_semaphore(provider)
+    
+    @classmethod
+    def get_provider_semaphore(cls, provider):
+        """Get the shared concurrency limiter for a provider"""
+        with cls._limits_lock:
+            if provider.name not in cls._provider_limits:
+                limit = getattr(provider, 'max_concurrency', 4)
+                cls._provider_limits[provider.name] = threading.BoundedSemaphore(limit)
+            return cls._provider_limits[provider.name]
+    
+    def make_batches(self, symbols, starts=None):
+        """
+        Group symbols into provider requests
+        
+        Symbols are only batched together when they share the same start date,
+        since a multi-ticker request takes a single date range.
+        
+        Args:
+            symbols (list): Ticker symbols
+            starts (dict): Optional symbol -> start date (None for a full-period download)
+        
+        Returns:
+            list: (start, [symbols]) tuples
+        """
+        starts = starts or {}
+        groups = {}
+        for symbol in symbols:
+            groups.setdefault(starts.get(symbol), []).append(symbol)
+        
+        batches = []
+        for start, group in groups.items():
+            for i in range(0, len(group), self.batch_size):
+                batches.append((start, group[i:i + self.batch_size]))
+        
+        return batches
+    
+    def download_with_retry(self, batch, period, interval, start):
+        """
+        Download one batch, retrying with exponential backoff
+        
+        Args:
+            batch (list): Ticker symbols in this request
+            period (str): Data period used when no start date is given
+            interval (str): Data interval
+            start (datetime): Optional first date to download from
+        
+        Returns:
+            dict: Symbol -> DataFrame of bars
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.semaphore:
+                    return self.provider.download_batch(batch, period=period, interval=interval, start=start)
+            except Exception:
+                if attempt >= self.max_retries:
+                    raise
+                # Jitter keeps retrying workers from hitting the provider in lockstep
+                delay = self.backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.1)
+                time.sleep(delay)
+                attempt += 1
+    
+    def download(self, symbols, period="5y", interval="1d", starts=None):
+        """
+        Download bars for all symbols concurrently
+        
+        Args:
+            symbols (list): Ticker symbols
+            period (str): Data period used when no start date is given
+            interval (str): Data interval
+            starts (dict): Optional symbol -> start date for incremental downloads
+        
+        Returns:
+            tuple: (results, errors) where results maps symbol -> DataFrame and
+                   errors maps symbol -> error message
+        """
+        batches = self.make_batches(symbols, starts)
+        results = {}
+        errors = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.download_with_retry, batch, period, interval, start): batch
+                for start, batch in batches
+            }
+            
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    batch_results = future.result()
+                except Exception as e:
+                    for symbol in batch:
+                        errors[symbol] = str(e)
+                    continue
+                
+                for symbol in batch:
+                    results[symbol] = batch_results.get(symbol, pd.DataFrame())
+        
+        return results, errors
@@ -0,0 +1,416 @@
+"""
+Data Providers Module
+Market data sources (Yahoo Finance, file replay, local HTTP stand-in) and an on-disk response cache
+"""
+
+import pandas as pd
+import yfinance as yf
+import requests
+import hashlib
+import pickle
+import json
+import time
+import os
+import sys
+from io import StringIO
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from storage.dataset_io import find_dataset, read_dataset
+
+def safe_symbol_name(symbol):
+    """Convert a ticker symbol into the filename stem used in data directories"""
+    return symbol.replace("=", "").replace("-", "_")
+
+def period_start(end, period):
+    """
+    Convert a yfinance-style period string into a start timestamp
+    
+    Args:
+        end (pandas.Timestamp): End of the period
+        period (str): Period string (e.g., "5d", "6mo", "5y", "max")
+    
+    Returns:
+        pandas.Timestamp: Start of the period, or None for "max"
+    """
+    if period is None or period == "max":
+        return None
+    if period.endswith("mo"):
+        return end - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("y"):
+        return end - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("wk"):
+        return end - pd.Timedelta(weeks=int(period[:-2]))
+    if period.endswith("d"):
+        return end - pd.Timedelta(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+def normalize_bars(df):
+    """
+    Turn a downloaded frame into flat OHLCV bars with 'Date' as a column
+    
+    Args:
+        df (pandas.DataFrame): Frame indexed by date
+    
+    Returns:
+        pandas.DataFrame: Bars with a 'Date' column and single-level columns
+    """
+    df = df.dropna(how="all")
+    if df.empty:
+        return df
+    
+    # Flatten yfinance's (Price, Ticker) columns
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    
+    df = df.reset_index()
+    
+    # Intraday downloads index on 'Datetime'
+    if 'Datetime' in df.columns and 'Date' not in df.columns:
+        df = df.rename(columns={'Datetime': 'Date'})
+    
+    return df
+
+class MarketDataProvider:
+    """
+    Base class for market data sources
+    
+    Subclasses implement download_batch; single-symbol history and latest
+    prices are derived from it unless a subclass has a cheaper way.
+    """
+    
+    name = "base"
+    
+    def __init__(self, max_concurrency=4, batch_size=20):
+        """
+        Initialize the provider
+        
+        Args:
+            max_concurrency (int): Maximum simultaneous requests against the source
+            batch_size (int): Tickers requested per call
+        """
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+    
+    def download_batch(self, symbols, period="5y", interval="1d", start=None):
+        """
+        Download bars for several symbols in one request
+        
+        Args:
+            symbols (list): Ticker symbols
+            period (str): Data period used when no start date is given
+            interval (str): Data interval
+            start (datetime): Optional first date to download from
+        
+        Returns:
+            dict: Symbol -> DataFrame of bars (empty if no data was returned)
+        """
+        raise NotImplementedError
+    
+    def get_history(self, symbol, period="1d", interval="1d"):
+        """
+        Get recent bars for one symbol
+        
+        Args:
+            symbol (str): Ticker symbol
+            period (str): Data period
+            interval (str): Data interval
+        
+        Returns:
+            pandas.DataFrame: Bars with a 'Date' column (empty if unavailable)
+        """
+        return self.download_batch([symbol], period=period, interval=interval).get(symbol, pd.DataFrame())
+    
+    def get_latest_price(self, symbol, interval="1m"):
+        """
+        Get the most recent close for a symbol
+        
+        Args:
+            symbol (str): Ticker symbol
+            interval (str): Bar interval for today's data ("1m" for live, "1d" for the daily close)
+        
+        Returns:
+            float: Latest close, or None if no data is available
+        """
+        data = self.get_history(symbol, period="1d", interval=interval)
+        if data.empty:
+            # Fallback to daily data
+            data = self.get_history(symbol, period="5d", interval="1d")
+        
+        if not data.empty and 'Close' in data.columns:
+            return float(data['Close'].iloc[-1])
+        return None
+
+class YFinanceProvider(MarketDataProvider):
+    """Downloads bars from Yahoo Finance using multi-ticker requests"""
+    
+    name = "yfinance"
+    
+    def download_batch(self, symbols, period="5y", interval="1d", start=None):
+        """
+        Download bars for several symbols in one request
+        
+        Args:
+            symbols (list): Ticker symbols
+            period (str): Data period used when no start date is given
+            interval (str): Data interval
+            start (datetime): Optional first date to download from
+        
+        Returns:
+            dict: Symbol -> DataFrame of bars (empty if no data was returned)
+        """
+        kwargs = {'interval': interval, 'group_by': 'ticker', 'threads': False, 'progress': False}
+        if start is not None:
+            kwargs['start'] = start.strftime("%Y-%m-%d")
+        else:
+            kwargs['period'] = period
+        
+        data = yf.download(list(symbols), **kwargs)
+        
+        results = {}
+        for symbol in symbols:
+            if data.empty:
+                results[symbol] = pd.DataFrame()
+            elif isinstance(data.columns, pd.MultiIndex):
+                if symbol in data.columns.get_level_values(0):
+                    results[symbol] = normalize_bars(data[symbol].copy())
+                else:
+                    results[symbol] = pd.DataFrame()
+            else:
+                # Single-ticker responses may come back without a ticker level
+                results[symbol] = normalize_bars(data.copy())
+        
+        return results
+    
+    def get_history(self, symbol, period="1d", interval="1d"):
+        """Get recent bars for one symbol using Yahoo's ticker history endpoint"""
+        data = yf.Ticker(symbol).history(period=period, interval=interval)
+        return normalize_bars(data)
+
+class LocalReplayProvider(MarketDataProvider):
+    """
+    Serves bars from a directory of per-symbol datasets
+    
+    Used as a local stand-in for a remote provider when testing or benchmarking
+    the collection engine without network access.
+    """
+    
+    name = "local_replay"
+    
+    def __init__(self, source_dir, max_concurrency=8, batch_size=20, latency=0.0):
+        """
+        Initialize the provider
+        
+        Args:
+            source_dir (str): Directory containing <symbol>.parquet or <symbol>.csv files
+            max_concurrency (int): Maximum simultaneous requests
+            batch_size (int): Tickers served per call
+            latency (float): Simulated round-trip time per request in seconds
+        """
+        super().__init__(max_concurrency, batch_size)
+        self.source_dir = source_dir
+        self.latency = latency
+    
+    def load_symbol(self, symbol):
+        """Load the stored bars for a symbol, or None if there are none"""
+        file_path = find_dataset(self.source_dir, safe_symbol_name(symbol))
+        if file_path is None:
+            return None
+        
+        return read_dataset(file_path)
+    
+    def download_batch(self, symbols, period="5y", interval="1d", start=None):
+        """
+        Serve bars for several symbols as if they were downloaded
+        
+        Args:
+            symbols (list): Ticker symbols
+            period (str): Data period used when no start date is given
+            interval (str): Data interval (only the stored interval is available)
+            start (datetime): Optional first date to serve from
+        
+        Returns:
+            dict: Symbol -> DataFrame of bars (empty if the symbol is unknown)
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        
+        results = {}
+        for symbol in symbols:
+            df = self.load_symbol(symbol)
+            if df is None or df.empty:
+                results[symbol] = pd.DataFrame()
+                continue
+            
+            first_date = start if start is not None else period_start(df['Date'].max(), period)
+            if first_date is not None:
+                df = df[df['Date'] >= pd.to_datetime(first_date)]
+            
+            results[symbol] = df.reset_index(drop=True)
+        
+        return results
+
+class LocalHTTPProvider(MarketDataProvider):
+    """
+    Fetches bars from a local HTTP stand-in server
+    
+    Pairs with data_collection.replay_server, which serves replayed datasets
+    over HTTP so the full request path can be exercised and benchmarked offline.
+    """
+    
+    name = "local_http"
+    
+    def __init__(self, base_url="http://127.0.0.1:8765", max_concurrency=8, batch_size=20, timeout=10):
+        """
+        Initialize the provider
+        
+        Args:
+            base_url (str): Server address
+            max_concurrency (int): Maximum simultaneous requests
+            batch_size (int): Tickers requested per call
+            timeout (float): Request timeout in seconds
+        """
+        super().__init__(max_concurrency, batch_size)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+    
+    def download_batch(self, symbols, period="5y", interval="1d", start=None):
+        """Download bars for several symbols from the stand-in server"""
+        params = {'symbols': ",".join(symbols), 'period': period, 'interval': interval}
+        if start is not None:
+            params['start'] = pd.Timestamp(start).strftime("%Y-%m-%d")
+        
+        response = requests.get(f"{self.base_url}/history", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        payload = response.json()
+        
+        results = {}
+        for symbol in symbols:
+            if not payload.get(symbol):
+                results[symbol] = pd.DataFrame()
+                continue
+            df = pd.read_json(StringIO(payload[symbol]), orient='split')
+            df['Date'] = pd.to_datetime(df['Date'])
+            results[symbol] = df
+        
+        return results
+
+class CachedProvider(MarketDataProvider):
+    """
+    Wraps a provider with an on-disk response cache
+    
+    Identical requests made within the TTL are answered from disk, so repeated
+    lookups in one cycle (or across processes) do not hit the network again.
+    """
+    
+    def __init__(self, provider, ttl_seconds=60, cache_dir=None):
+        """
+        Initialize the cache
+        
+        Args:
+            provider (MarketDataProvider): Provider to forward cache misses to
+            ttl_seconds (float): How long a cached response stays valid
+            cache_dir (str): Cache directory (defaults to data/cache/responses)
+        """
+        super().__init__(provider.max_concurrency, provider.batch_size)
+        self.provider = provider
+        self.name = provider.name
+        self.ttl_seconds = ttl_seconds
+        
+        if cache_dir is None:
+            self.cache_dir = os.path.join(get_data_dir("cache"), "responses")
+        else:
+            self.cache_dir = cache_dir
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def cache_file(self, method, **request):
+        """Get the cache file for a request"""
+        key = json.dumps([self.provider.name, method, request], sort_keys=True, default=str)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pkl")
+    
+    def cached_call(self, method, fetch, **request):
+        """
+        Serve a request from the cache, or fetch and store it
+        
+        Args:
+            method (str): Provider method name (part of the cache key)
+            fetch (callable): Called with no arguments on a cache miss
+            **request: Request parameters (part of the cache key)
+        
+        Returns:
+            The cached or freshly fetched response
+        """
+        path = self.cache_file(method, **request)
+        
+        if os.path.exists(path) and time.time() - os.path.getmtime(path) < self.ttl_seconds:
+            try:
+                with open(path, 'rb') as f:
+                    return pickle.load(f)
+            except Exception:
+                pass  # Unreadable entry; refetch below
+        
+        response = fetch()
+        
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(response, f)
+        os.replace(tmp_path, path)
+        
+        return response
+    
+    def download_batch(self, symbols, period="5y", interval="1d", start=None):
+        """Download bars for several symbols, served from the cache when fresh"""
+        return self.cached_call(
+            "download_batch",
+            lambda: self.provider.download_batch(symbols, period=period, interval=interval, start=start),
+            symbols=list(symbols), period=period, interval=interval, start=start
+        )
+    
+    def get_history(self, symbol, period="1d", interval="1d"):
+        """Get recent bars for one symbol, served from the cache when fresh"""
+        return self.cached_call(
+            "get_history",
+            lambda: self.provider.get_history(symbol, period=period, interval=interval),
+            symbol=symbol, period=period, interval=interval
+        )
+    
+    def clear(self):
+        """Delete every cached response"""
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, file_name))
+
+def get_provider(name=None, cache_ttl=None, **kwargs):
+    """
+    Create the configured market data provider
+    
+    Args:
+        name (str): 'yfinance', 'replay' or 'http' (defaults to $TRADING_DATA_PROVIDER or 'yfinance')
+        cache_ttl (float): Response cache TTL in seconds (defaults to $TRADING_PROVIDER_CACHE_TTL
+                           or 60; 0 disables the cache)
+        **kwargs: Passed to the provider's constructor
+    
+    Returns:
+        MarketDataProvider: Provider, wrapped in a CachedProvider when the TTL is positive
+    """
+    name = name or os.environ.get("TRADING_DATA_PROVIDER", "yfinance")
+    if cache_ttl is None:
+        cache_ttl = float(os.environ.get("TRADING_PROVIDER_CACHE_TTL", 60))
+    
+    if name == "yfinance":
+        provider = YFinanceProvider(**kwargs)
+    elif name == "replay":
+        kwargs.setdefault('source_dir', os.environ.get("TRADING_REPLAY_DIR", get_data_dir("raw")))
+        provider = LocalReplayProvider(**kwargs)
+    elif name == "http":
+        kwargs.setdefault('base_url', os.environ.get("TRADING_PROVIDER_URL", "http://127.0.0.1:8765"))
+        provider = LocalHTTPProvider(**kwargs)
+    else:
+        raise ValueError(f"Unknown market data provider: {name}")
+    
+    if cache_ttl > 0:
+        return CachedProvider(provider, ttl_seconds=cache_ttl)
+    return provider
@@ -0,0 +1,198 @@
+"""
+Quote Cache Module
+Process-safe latest-price cache shared by every price lookup
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from data_collection.providers import get_provider
+from data_collection.quote_stream import get_quote_stream
+
+class QuoteCache:
+    """
+    Latest prices keyed by symbol, stored in SQLite with a TTL
+    
+    Every process (paper trader, dashboards, portfolio scripts) shares the
+    same database file, so a price fetched by one is reused by the others
+    until it expires. Stale symbols are refreshed together in one batch request.
+    When a streaming quote feed is configured, its ring buffers are read first.
+    """
+    
+    def __init__(self, provider=None, ttl_seconds=None, db_path=None, stream=None):
+        """
+        Initialize the quote cache
+        
+        Args:
+            provider (MarketDataProvider): Price source for refreshes (defaults to get_provider())
+            ttl_seconds (float): Quote lifetime (defaults to $TRADING_QUOTE_TTL or 60)
+            db_path (str): SQLite file (defaults to data/cache/quotes.sqlite)
+            stream (QuoteBuffers): Streamed prices (defaults to the $TRADING_QUOTE_FEED stream, if set)
+        """
+        # The quote table is the cache, so skip the provider's own response cache
+        self.provider = provider or get_provider(cache_ttl=0)
+        
+        if ttl_seconds is None:
+            self.ttl_seconds = float(os.environ.get("TRADING_QUOTE_TTL", 60))
+        else:
+            self.ttl_seconds = ttl_seconds
+        
+        self.stream = stream or get_quote_stream()
+        
+        if db_path is None:
+            self.db_path = os.path.join(get_data_dir("cache"), "quotes.sqlite")
+        else:
+            self.db_path = db_path
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quotes ("
+                "symbol TEXT PRIMARY KEY, price REAL NOT NULL, fetched_at REAL NOT NULL)"
+            )
+    
+    @contextmanager
+    def connect(self):
+        """Open a transaction that waits for other writers instead of failing"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def get_cached(self, symbols):
+        """
+        Get the unexpired quotes for some symbols
+        
+        Args:
+            symbols (list): Ticker symbols
+        
+        Returns:
+            dict: Symbol -> price for symbols with a fresh quote
+        """
+        if not symbols:
+            return {}
+        
+        cutoff = time.time() - self.ttl_seconds
+        placeholders = ",".join("?" * len(symbols))
+        
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT symbol, price FROM quotes WHERE symbol IN ({placeholders}) AND fetched_at >= ?",
+                list(symbols) + [cutoff]
+            ).fetchall()
+        
+        return {symbol: price for symbol, price in rows}
+    
+    def store(self, prices):
+        """
+        Save freshly fetched quotes
+        
+        Args:
+            prices (dict): Symbol -> price
+        """
+        if not prices:
+            return
+        
+        now = time.time()
+        with self.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO quotes (symbol, price, fetched_at) VALUES (?, ?, ?)",
+                [(symbol, float(price), now) for symbol, price in prices.items()]
+            )
+    
+    def fetch(self, symbols):
+        """
+        Fetch latest prices for several symbols from the provider in batches
+        
+        Minute bars are requested first; symbols without intraday data (closed
+        markets, weekends) fall back to the last daily close.
+        
+        Args:
+            symbols (list): Ticker symbols
+        
+        Returns:
+            dict: Symbol -> price for symbols that returned data
+        """
+        prices = {}
+        missing = list(symbols)
+        
+        for period, interval in [("1d", "1m"), ("5d", "1d")]:
+            if not missing:
+                break
+            
+            for i in range(0, len(missing), self.provider.batch_size):
+                batch = missing[i:i + self.provider.batch_size]
+                try:
+                    results = self.provider.download_batch(batch, period=period, interval=interval)
+                except Exception as e:
+                    print(f"❌ Error refreshing quotes for {', '.join(batch)}: {e}")
+                    continue
+                
+                for symbol, df in results.items():
+                    if not df.empty and 'Close' in df.columns:
+                        closes = df['Close'].dropna()
+                        if len(closes) > 0:
+                            prices[symbol] = float(closes.iloc[-1])
+            
+            missing = [symbol for symbol in missing if symbol not in prices]
+        
+        return prices
+    
+    def get_prices(self, symbols):
+        """
+        Get latest prices, refreshing only the stale symbols in one batch
+        
+        Args:
+            symbols (list): Ticker symbols
+        
+        Returns:
+            dict: Symbol -> price (symbols with no data are left out)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        
+        # Streamed ticks are in memory; only symbols without a recent tick hit SQLite
+        prices = {}
+        if self.stream is not None:
+            prices = self.stream.latest_prices(symbols, max_age=self.ttl_seconds)
+        
+        remaining = [symbol for symbol in symbols if symbol not in prices]
+        if remaining:
+            prices.update(self.get_cached(remaining))
+        
+        stale = [symbol for symbol in symbols if symbol not in prices]
+        if stale:
+            fetched = self.fetch(stale)
+            self.store(fetched)
+            prices.update(fetched)
+        
+        return prices
+    
+    def get_price(self, symbol):
+        """
+        Get the latest price for one symbol
+        
+        Args:
+            symbol (str): Ticker symbol
+        
+        Returns:
+            float: Latest price, or None if no data is available
+        """
+        return self.get_prices([symbol]).get(symbol)
+    
+    def invalidate(self, symbols=None):
+        """Drop cached quotes for some symbols (all if None)"""
+        with self.connect() as conn:
+            if symbols is None:
+                conn.execute("DELETE FROM quotes")
+            else:
+                conn.executemany("DELETE FROM quotes WHERE symbol = ?", [(s,) for s in symbols])
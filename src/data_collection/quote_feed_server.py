@@ -0,0 +1,142 @@
+"""
+Quote Feed Server Module
+Local TCP stand-in for a streaming quote feed, replaying stored closes as ticks
+"""
+
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from data_collection.providers import safe_symbol_name
+from data_collection.universe import all_symbols, load_manifest
+from storage.dataset_io import dataset_stem, list_datasets, read_dataset
+
+class QuoteFeedHandler(socketserver.BaseRequestHandler):
+    """Registers a client for broadcasts and holds the connection open"""
+    
+    def handle(self):
+        """Keep the client subscribed until it disconnects"""
+        with self.server.clients_lock:
+            self.server.clients.append(self.request)
+        try:
+            # Clients never send anything; recv returns b"" once they hang up
+            while self.request.recv(1024):
+                pass
+        except OSError:
+            pass
+        finally:
+            with self.server.clients_lock:
+                if self.request in self.server.clients:
+                    self.server.clients.remove(self.request)
+
+class QuoteFeedTCPServer(socketserver.ThreadingTCPServer):
+    """Threaded TCP server that can rebind its port right after a restart"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+class QuoteFeedServer:
+    """Replays each symbol's stored closes as one tick per symbol per interval"""
+    
+    def __init__(self, source_dir=None, host="127.0.0.1", port=8766, tick_interval=1.0, manifest=None):
+        """
+        Initialize the feed server
+        
+        Args:
+            source_dir (str): Directory of per-symbol datasets (defaults to raw data)
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            tick_interval (float): Seconds between rounds of ticks
+            manifest (str): Symbol manifest used to map file names back to tickers
+        """
+        if source_dir is None:
+            source_dir = get_data_dir("raw")
+        self.source_dir = source_dir
+        self.tick_interval = tick_interval
+        
+        tickers = {safe_symbol_name(s): s for s in all_symbols(load_manifest(manifest))}
+        self.series = {}
+        for path in list_datasets(source_dir):
+            stem = dataset_stem(path)
+            df = read_dataset(path, columns=['Date', 'Close', 'Volume'])
+            if 'Close' in df.columns and not df.empty:
+                volume = df['Volume'].values if 'Volume' in df.columns else [0.0] * len(df)
+                self.series[tickers.get(stem, stem)] = (df['Close'].values, volume)
+        
+        self.server = QuoteFeedTCPServer((host, port), QuoteFeedHandler)
+        self.server.clients = []
+        self.server.clients_lock = threading.Lock()
+        
+        self.stop_event = threading.Event()
+        self.threads = []
+    
+    @property
+    def address(self):
+        """(host, port) clients should connect to"""
+        return self.server.server_address[:2]
+    
+    def broadcast(self, payload):
+        """Send bytes to every client, dropping the ones that went away"""
+        with self.server.clients_lock:
+            clients = list(self.server.clients)
+        
+        for client in clients:
+            try:
+                client.sendall(payload)
+            except OSError:
+                with self.server.clients_lock:
+                    if client in self.server.clients:
+                        self.server.clients.remove(client)
+    
+    def replay(self):
+        """Step through the stored rows, looping back to the start at the end"""
+        step = 0
+        while not self.stop_event.is_set():
+            now = time.time()
+            lines = []
+            for symbol, (closes, volumes) in self.series.items():
+                i = step % len(closes)
+                lines.append(json.dumps({'symbol': symbol, 'price': float(closes[i]),
+                                         'volume': float(volumes[i]), 'timestamp': now}))
+            
+            if lines:
+                self.broadcast(("\n".join(lines) + "\n").encode())
+            
+            step += 1
+            self.stop_event.wait(self.tick_interval)
+    
+    def start(self):
+        """Start accepting clients and streaming ticks on daemon threads"""
+        for target in (self.server.serve_forever, self.replay):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+    
+    def stop(self):
+        """Stop streaming and release the port"""
+        self.stop_event.set()
+        self.server.shutdown()
+        self.server.server_close()
+        
+        with self.server.clients_lock:
+            for client in self.server.clients:
+                client.close()
+            self.server.clients.clear()
+
+if __name__ == "__main__":
+    server = QuoteFeedServer().start()
+    host, port = server.address
+    print(f"📡 Quote feed streaming {len(server.series)} symbols on {host}:{port}")
+    print(f"💡 Set TRADING_QUOTE_FEED={host}:{port} to read prices from the stream")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print("\n👋 Quote feed stopped")
@@ -0,0 +1,269 @@
+"""
+Quote Stream Module
+Streams ticks from a local quote feed into per-symbol ring buffers
+"""
+
+import numpy as np
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from data_collection.providers import safe_symbol_name
+
+class TickBuffer:
+    """
+    Fixed-size ring buffer of one symbol's latest ticks
+    
+    Ticks live in preallocated NumPy arrays, so appending never allocates and
+    reading the latest price is two array lookups.
+    """
+    
+    def __init__(self, capacity=1024):
+        """
+        Initialize the buffer
+        
+        Args:
+            capacity (int): Number of ticks kept; older ticks are overwritten
+        """
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.volumes = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+    
+    def append(self, timestamp, price, volume=0.0):
+        """Add a tick, overwriting the oldest one when full"""
+        i = self.count % self.capacity
+        self.timestamps[i] = timestamp
+        self.prices[i] = price
+        self.volumes[i] = volume
+        # Publish after the slot is written so readers never see a half-written tick
+        self.count += 1
+    
+    def latest(self):
+        """
+        Get the newest tick
+        
+        Returns:
+            tuple: (timestamp, price), or None if no tick has arrived
+        """
+        if self.count == 0:
+            return None
+        i = (self.count - 1) % self.capacity
+        return self.timestamps[i], self.prices[i]
+    
+    def window(self, n=None):
+        """
+        Get the newest ticks in arrival order
+        
+        Args:
+            n (int): Number of ticks (defaults to everything buffered)
+        
+        Returns:
+            tuple: (timestamps, prices, volumes) arrays
+        """
+        size = min(self.count, self.capacity)
+        n = size if n is None else min(n, size)
+        
+        # Indices of the last n slots, oldest first
+        idx = (np.arange(self.count - n, self.count)) % self.capacity
+        return self.timestamps[idx], self.prices[idx], self.volumes[idx]
+
+class QuoteBuffers:
+    """Ring buffers for every streamed symbol"""
+    
+    def __init__(self, capacity=1024):
+        """
+        Initialize the buffer set
+        
+        Args:
+            capacity (int): Ticks kept per symbol
+        """
+        self.capacity = capacity
+        self.buffers = {}
+        # Model and file names use safe symbol names (BTC_USD for BTC-USD)
+        self.aliases = {}
+        self.lock = threading.Lock()
+    
+    def update(self, symbol, price, volume=0.0, timestamp=None):
+        """Record a tick for a symbol"""
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            with self.lock:
+                buffer = self.buffers.setdefault(symbol, TickBuffer(self.capacity))
+                self.aliases[safe_symbol_name(symbol)] = symbol
+        
+        buffer.append(time.time() if timestamp is None else timestamp, price, volume)
+    
+    def get_buffer(self, symbol):
+        """Get a symbol's buffer by ticker or safe name (None if never streamed)"""
+        return self.buffers.get(symbol) or self.buffers.get(self.aliases.get(symbol))
+    
+    def latest_price(self, symbol, max_age=None):
+        """
+        Get a symbol's latest streamed price
+        
+        Args:
+            symbol (str): Ticker or safe symbol name
+            max_age (float): Ignore ticks older than this many seconds
+        
+        Returns:
+            float: Latest price, or None if nothing recent has arrived
+        """
+        buffer = self.get_buffer(symbol)
+        tick = buffer.latest() if buffer is not None else None
+        
+        if tick is None:
+            return None
+        if max_age is not None and time.time() - tick[0] > max_age:
+            return None
+        return float(tick[1])
+    
+    def latest_prices(self, symbols, max_age=None):
+        """
+        Get latest streamed prices for several symbols
+        
+        Returns:
+            dict: Symbol -> price for symbols with a recent tick
+        """
+        prices = {}
+        for symbol in symbols:
+            price = self.latest_price(symbol, max_age)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+    
+    def symbols(self):
+        """List the symbols that have streamed at least one tick"""
+        return list(self.buffers)
+
+class QuoteStreamClient:
+    """
+    Background reader for a newline-delimited JSON quote feed over TCP
+    
+    Each line is one tick: {"symbol": "AAPL", "price": 189.2, "volume": 100,
+    "timestamp": 1700000000.0}. The connection is re-established with backoff
+    if the feed goes away.
+    """
+    
+    def __init__(self, host="127.0.0.1", port=8766, buffers=None, capacity=1024, reconnect_seconds=1.0):
+        """
+        Initialize the stream client
+        
+        Args:
+            host (str): Feed host
+            port (int): Feed port
+            buffers (QuoteBuffers): Where ticks are written (created if None)
+            capacity (int): Ticks kept per symbol when creating buffers
+            reconnect_seconds (float): Base delay before reconnecting
+        """
+        self.host = host
+        self.port = port
+        self.buffers = buffers or QuoteBuffers(capacity)
+        self.reconnect_seconds = reconnect_seconds
+        self.ticks_received = 0
+        self.connected = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        """Start reading the feed in a daemon thread"""
+        if self.thread is None or not self.thread.is_alive():
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name="quote-stream", daemon=True)
+            self.thread.start()
+        return self
+    
+    def stop(self):
+        """Stop reading and close the connection"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+    
+    def run(self):
+        """Read ticks until stopped, reconnecting after failures"""
+        delay = self.reconnect_seconds
+        while not self.stop_event.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=5) as sock:
+                    sock.settimeout(1.0)
+                    self.connected.set()
+                    delay = self.reconnect_seconds
+                    self.read_lines(sock)
+            except OSError:
+                pass
+            finally:
+                self.connected.clear()
+            
+            # Back off up to 30s while the feed is down
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, 30.0)
+    
+    def read_lines(self, sock):
+        """Parse ticks from a connected socket into the buffers"""
+        pending = b""
+        while not self.stop_event.is_set():
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                continue
+            if not chunk:
+                return
+            
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    tick = json.loads(line)
+                    self.buffers.update(tick['symbol'], float(tick['price']),
+                                        float(tick.get('volume', 0.0)), tick.get('timestamp'))
+                    self.ticks_received += 1
+                except (ValueError, KeyError, TypeError):
+                    continue
+    
+    def wait_for(self, symbols, timeout=5.0):
+        """
+        Wait until every symbol has streamed a tick
+        
+        Returns:
+            bool: True if all symbols arrived before the timeout
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(self.buffers.get_buffer(symbol) is not None for symbol in symbols):
+                return True
+            time.sleep(0.01)
+        return False
+
+_shared_stream = None
+_shared_lock = threading.Lock()
+
+def get_quote_stream(feed=None):
+    """
+    Get this process's shared quote stream, starting it on first use
+    
+    Args:
+        feed (str): "host:port" of the quote feed (defaults to $TRADING_QUOTE_FEED)
+    
+    Returns:
+        QuoteBuffers: Streamed prices, or None when no feed is configured
+    """
+    global _shared_stream
+    
+    feed = feed or os.environ.get("TRADING_QUOTE_FEED")
+    if not feed:
+        return None
+    
+    with _shared_lock:
+        if _shared_stream is None:
+            host, port = feed.rsplit(":", 1)
+            _shared_stream = QuoteStreamClient(host, int(port)).start()
+    
+    return _shared_stream.buffers
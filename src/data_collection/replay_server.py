@@ -0,0 +1,100 @@
+"""
+Replay Server Module
+Local HTTP stand-in for a market data API, serving bars from stored datasets
+"""
+
+import json
+import threading
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from data_collection.providers import LocalReplayProvider
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """Answers GET /history?symbols=A,B&period=5y&interval=1d[&start=YYYY-MM-DD]"""
+    
+    def do_GET(self):
+        """Serve bars for the requested symbols as JSON (one 'split' frame per symbol)"""
+        url = urlparse(self.path)
+        if url.path != "/history":
+            self.send_error(404, "Unknown endpoint")
+            return
+        
+        params = parse_qs(url.query)
+        symbols = [s for s in params.get('symbols', [""])[0].split(",") if s]
+        period = params.get('period', ["5y"])[0]
+        interval = params.get('interval', ["1d"])[0]
+        start = params.get('start', [None])[0]
+        
+        try:
+            frames = self.server.provider.download_batch(symbols, period=period, interval=interval, start=start)
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        
+        payload = {
+            symbol: (df.to_json(orient='split', date_format='iso', index=False, double_precision=15) if not df.empty else None)
+            for symbol, df in frames.items()
+        }
+        body = json.dumps(payload).encode()
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Keep request logging quiet"""
+        pass
+
+class ReplayServer:
+    """Serves a directory of datasets over HTTP on a background thread"""
+    
+    def __init__(self, source_dir=None, host="127.0.0.1", port=8765, latency=0.0):
+        """
+        Initialize the server
+        
+        Args:
+            source_dir (str): Directory of per-symbol datasets (defaults to raw data)
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            latency (float): Simulated response delay in seconds
+        """
+        if source_dir is None:
+            source_dir = get_data_dir("raw")
+        
+        self.httpd = ThreadingHTTPServer((host, port), ReplayRequestHandler)
+        self.httpd.provider = LocalReplayProvider(source_dir, latency=latency)
+        self.thread = None
+    
+    @property
+    def url(self):
+        """Base URL clients should use"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Start serving on a daemon thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+if __name__ == "__main__":
+    server = ReplayServer()
+    print(f"📡 Replay server listening on {server.url}")
+    print(f"📁 Serving datasets from: {server.httpd.provider.source_dir}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Replay server stopped")
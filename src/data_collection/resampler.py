@@ -0,0 +1,232 @@
+"""
+Bar Resampler Module
+Incrementally rolls fine intraday bars (e.g., 1m) up into 1h/4h/1d bars
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from storage.intraday_store import IntradayStore
+
+class BarResampler:
+    """
+    Keeps one partial higher-timeframe bar per symbol and emits bars as they complete
+    
+    Buckets are aligned to UTC (1h on the hour, 4h at 00/04/08/12/16/20, 1d at
+    midnight). A bucket is emitted once a source bar from a later bucket
+    arrives, so each update only touches the new source bars. The newest
+    source bar is kept apart from the rest of the partial bar, since it may
+    still have been forming when it was downloaded; a re-download of it
+    replaces it instead of being ignored.
+    """
+    
+    def __init__(self, target_interval="1h", state_file=None):
+        """
+        Initialize the resampler
+        
+        Args:
+            target_interval (str): Output bar size ("1h", "4h", "1d", ...)
+            state_file (str): JSON file holding partial bars between runs (in-memory only if None)
+        """
+        self.target_interval = target_interval
+        self.bucket_ns = pd.Timedelta(target_interval.replace("d", "D")).value
+        self.state_file = state_file
+        self.state = {}
+        
+        if state_file is not None and os.path.exists(state_file):
+            self.load_state()
+    
+    def load_state(self):
+        """Load partial bars saved by a previous run"""
+        with open(self.state_file, 'r') as f:
+            self.state = json.load(f)
+    
+    def save_state(self):
+        """Save partial bars so the next run can continue them"""
+        if self.state_file is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+        
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+    
+    def last_seen(self, symbol):
+        """Get the timestamp of the last source bar processed for a symbol (None if never)"""
+        if symbol not in self.state:
+            return None
+        return pd.Timestamp(self.state[symbol]['last_ts'])
+    
+    def update(self, symbol, bars):
+        """
+        Feed new source bars and collect the higher-timeframe bars they complete
+        
+        Bars before the last processed timestamp are ignored, so the same
+        window can safely be passed twice. A bar at that timestamp replaces the
+        one seen before (a partial bar completed by a later download).
+        
+        Args:
+            symbol (str): Symbol name
+            bars (pandas.DataFrame): Source bars with Date (naive UTC), Open, High, Low, Close, Volume
+        
+        Returns:
+            pandas.DataFrame: Completed bars with 'Date' set to each bucket's start
+        """
+        partial = self.state.get(symbol)
+        
+        if bars.empty:
+            return pd.DataFrame(columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        
+        ts = pd.to_datetime(bars['Date']).values.astype("datetime64[ns]").astype(np.int64)
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        
+        # States saved before the newest source bar was kept apart cannot revise it
+        revisable = partial is not None and 'last_bar' in partial
+        if partial is None:
+            keep = np.ones(len(ts), dtype=bool)
+        elif revisable:
+            keep = ts >= partial['last_ts']
+        else:
+            keep = ts > partial['last_ts']
+        ts = ts[keep]
+        if len(ts) == 0:
+            return pd.DataFrame(columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        
+        volume = bars['Volume'].to_numpy(dtype=float)[order][keep] if 'Volume' in bars.columns else np.zeros(len(ts))
+        df = pd.DataFrame({
+            'bucket': ts - ts % self.bucket_ns,
+            'Open': bars['Open'].to_numpy(dtype=float)[order][keep],
+            'High': bars['High'].to_numpy(dtype=float)[order][keep],
+            'Low': bars['Low'].to_numpy(dtype=float)[order][keep],
+            'Close': bars['Close'].to_numpy(dtype=float)[order][keep],
+            'Volume': volume
+        })
+        
+        # The partial bar goes first so it supplies the bucket's open
+        if partial is not None:
+            if revisable:
+                previous = [partial['base']] if partial['base'] is not None else []
+                if ts[0] != partial['last_ts']:
+                    previous.append(partial['last_bar'])
+            else:
+                previous = [partial]
+            partial_rows = pd.DataFrame([{
+                'bucket': partial['bucket'], 'Open': bar['open'], 'High': bar['high'],
+                'Low': bar['low'], 'Close': bar['close'], 'Volume': bar['volume']
+            } for bar in previous], columns=df.columns)
+            df = pd.concat([partial_rows, df], ignore_index=True)
+        
+        grouped = df.groupby('bucket', sort=True).agg(
+            Open=('Open', 'first'), High=('High', 'max'), Low=('Low', 'min'),
+            Close=('Close', 'last'), Volume=('Volume', 'sum')
+        )
+        
+        # Everything but the newest bucket is complete; its newest source bar is the last row
+        newest = df[df['bucket'] == grouped.index[-1]]
+        self.state[symbol] = dict(bar_fields(newest), bucket=int(grouped.index[-1]), last_ts=int(ts[-1]),
+                                  base=bar_fields(newest.iloc[:-1]), last_bar=bar_fields(newest.iloc[-1:]))
+        
+        completed = grouped.iloc[:-1].reset_index()
+        completed['Date'] = pd.to_datetime(completed['bucket'])
+        
+        return completed[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
+    
+    def partial_bar(self, symbol):
+        """
+        Get a symbol's in-progress bar without completing it
+        
+        The partial bar is never written to the intraday store; update emits
+        the final bar for the bucket once a source bar from a later bucket
+        arrives. Until then this provisional view can change with every
+        update, including revisions of its newest source bar.
+        
+        Args:
+            symbol (str): Symbol name
+            
+        Returns:
+            pandas.DataFrame: The partial bar as one row (empty if there is none)
+        """
+        partial = self.state.get(symbol)
+        if partial is None:
+            return pd.DataFrame(columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+        
+        return pd.DataFrame([{
+            'Date': pd.Timestamp(partial['bucket']), 'Open': partial['open'], 'High': partial['high'],
+            'Low': partial['low'], 'Close': partial['close'], 'Volume': partial['volume']
+        }])
+
+def bar_fields(rows):
+    """
+    Aggregate consecutive source rows of one bucket into a state entry
+    
+    Args:
+        rows (pandas.DataFrame): Rows with Open, High, Low, Close and Volume
+    
+    Returns:
+        dict: open/high/low/close/volume, or None if there are no rows
+    """
+    if rows.empty:
+        return None
+    return {
+        'open': float(rows['Open'].iloc[0]),
+        'high': float(rows['High'].max()),
+        'low': float(rows['Low'].min()),
+        'close': float(rows['Close'].iloc[-1]),
+        'volume': float(rows['Volume'].sum())
+    }
+
+def resample_store(store=None, source_interval="1m", target_intervals=("1h", "4h", "1d"), symbols=None):
+    """
+    Roll new source bars in an intraday store up into higher timeframes
+    
+    Only source bars newer than each resampler's saved position are read;
+    completed bars are appended to the store under their own interval.
+    
+    Args:
+        store (IntradayStore): Intraday store (defaults to data/intraday)
+        source_interval (str): Stored interval to resample from
+        target_intervals (tuple): Intervals to produce
+        symbols (list): Filename-safe symbol names (defaults to every stored symbol)
+    
+    Returns:
+        dict: Target interval -> number of completed bars written
+    """
+    if store is None:
+        store = IntradayStore()
+    
+    source_dir = os.path.join(store.root_dir, source_interval)
+    if symbols is None:
+        symbols = sorted(os.listdir(source_dir)) if os.path.exists(source_dir) else []
+    
+    resamplers = {
+        target: BarResampler(target, os.path.join(store.root_dir, f"resampler_{source_interval}_to_{target}.json"))
+        for target in target_intervals
+    }
+    written = {target: 0 for target in target_intervals}
+    
+    for symbol in symbols:
+        # Read once from the earliest position any target still needs
+        positions = [r.last_seen(symbol) for r in resamplers.values()]
+        start = None if any(p is None for p in positions) else min(positions)
+        
+        bars = store.read(symbol, source_interval, start=start)
+        if bars.empty:
+            continue
+        
+        for target, resampler in resamplers.items():
+            completed = resampler.update(symbol, bars)
+            if not completed.empty:
+                store.write(symbol, target, completed)
+                written[target] += len(completed)
+    
+    for resampler in resamplers.values():
+        resampler.save_state()
+    
+    return written
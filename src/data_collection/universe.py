@@ -0,0 +1,79 @@
+"""
+Symbol Universe Module
+Loads the symbol manifest and splits it into collection shards
+"""
+
+import json
+import os
+import zlib
+
+# TRADING_SYMBOL_MANIFEST points at another manifest (e.g., a several-thousand ticker universe)
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'config', 'symbols.json')
+
+ASSET_CLASSES = ("stocks", "forex", "crypto")
+
+def get_manifest_path(path=None):
+    """Get the manifest path from the argument, the environment or the bundled default"""
+    return os.path.abspath(path or os.environ.get("TRADING_SYMBOL_MANIFEST", DEFAULT_MANIFEST))
+
+def load_manifest(path=None):
+    """
+    Load the symbol manifest
+    
+    The manifest is a JSON object mapping asset class to a list of tickers,
+    e.g. {"stocks": ["AAPL"], "forex": ["EURUSD=X"], "crypto": ["BTC-USD"]}.
+    Duplicate tickers are dropped, keeping the first occurrence.
+    
+    Args:
+        path (str): Manifest file (defaults to config/symbols.json)
+    
+    Returns:
+        dict: Asset class -> list of symbols
+    """
+    with open(get_manifest_path(path), 'r') as f:
+        manifest = json.load(f)
+    
+    seen = set()
+    universe = {}
+    for asset_class, symbols in manifest.items():
+        universe[asset_class] = []
+        for symbol in symbols:
+            symbol = symbol.strip()
+            if symbol and symbol not in seen:
+                seen.add(symbol)
+                universe[asset_class].append(symbol)
+    
+    return universe
+
+def all_symbols(manifest):
+    """Flatten a manifest into one list in manifest order"""
+    return [symbol for symbols in manifest.values() for symbol in symbols]
+
+def asset_class_map(manifest):
+    """Map each symbol to its asset class"""
+    return {symbol: asset_class for asset_class, symbols in manifest.items() for symbol in symbols}
+
+def shard_of(symbol, shard_count):
+    """
+    Get the shard a symbol belongs to
+    
+    Assignment hashes the ticker, so adding or removing symbols never moves
+    the others to a different shard (and their checkpoints stay valid).
+    """
+    return zlib.crc32(symbol.encode("utf-8")) % shard_count
+
+def shard_symbols(symbols, shard_index, shard_count):
+    """
+    Select one shard's symbols
+    
+    Args:
+        symbols (list): Full universe
+        shard_index (int): Shard to select, 0 <= shard_index < shard_count
+        shard_count (int): Total number of shards
+    
+    Returns:
+        list: Symbols in the shard, in universe order
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"Shard index {shard_index} out of range for {shard_count} shards")
+    return [symbol for symbol in symbols if shard_of(symbol, shard_count) == shard_index]
@@ -4,18 +4,37 @@ Adds technical indicators to raw market data
 """
 
 import pandas as pd
-import ta
+import numpy as np
+import hashlib
 import os
 import sys
-from glob import glob
+from concurrent.futures import ProcessPoolExecutor
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.paths import get_data_dir
+from storage.dataset_io import list_datasets, read_dataset, read_dataset_tail, write_dataset, append_dataset, dataset_path, dataset_stem, find_dataset, dataset_columns
+from storage.intraday_store import IntradayStore
+from feature_engineering.feature_spec import load_feature_spec, normalize_spec, compute_features, lookback_rows, prune_spec
+from feature_engineering.online_indicators import OnlineFeatureEngine
+from feature_engineering import indicators
+from feature_engineering.multi_timeframe import compute_multi_timeframe, interval_ns
 
 class FeatureEngineering:
-    def __init__(self, input_dir=None, output_dir=None):
-        """Initialize feature engineering with input and output directories"""
+    def __init__(self, input_dir=None, output_dir=None, spec=None):
+        """
+        Initialize feature engineering with input and output directories
+        
+        Args:
+            input_dir (str): Raw datasets (defaults to MarketData)
+            output_dir (str): Feature datasets (defaults to MarketData_Features)
+            spec (dict or str): Feature spec, or a spec file (defaults to config/features.json)
+        """
+        if isinstance(spec, dict):
+            self.spec = normalize_spec(spec)
+        else:
+            self.spec = load_feature_spec(spec)
+        
         if input_dir is None:
             self.input_dir = get_data_dir("raw")  # MarketData
         else:
@@ -29,15 +48,15 @@ class FeatureEngineering:
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def add_technical_indicators(self, df):
+    def clean_bars(self, df):
         """
-        Add technical indicators to a dataframe
+        Convert OHLCV columns to numbers and drop incomplete rows
         
         Args:
-            df (pandas.DataFrame): DataFrame with OHLCV data
+            df (pandas.DataFrame): Raw bars
             
         Returns:
-            pandas.DataFrame: DataFrame with added technical indicators
+            pandas.DataFrame: Bars with numeric prices and volume
         """
         # Identify numeric columns that exist in this CSV
         numeric_cols = [col for col in ["Open", "High", "Low", "Close", "Adj Close", "Volume"] 
@@ -50,79 +69,311 @@ class FeatureEngineering:
         # Drop rows with NaN in numeric columns
         df.dropna(subset=numeric_cols, inplace=True)
         
-        # --- 1) Moving averages ---
-        df["SMA_10"] = ta.trend.SMAIndicator(close=df["Close"], window=10).sma_indicator()
-        df["SMA_20"] = ta.trend.SMAIndicator(close=df["Close"], window=20).sma_indicator()
-        df["EMA_10"] = ta.trend.EMAIndicator(close=df["Close"], window=10).ema_indicator()
-        df["EMA_20"] = ta.trend.EMAIndicator(close=df["Close"], window=20).ema_indicator()
-        
-        # --- 2) Momentum indicators ---
-        df["RSI_14"] = ta.momentum.RSIIndicator(close=df["Close"], window=14).rsi()
-        macd = ta.trend.MACD(close=df["Close"])
-        df["MACD"] = macd.macd()
-        df["MACD_signal"] = macd.macd_signal()
-        df["MACD_hist"] = macd.macd_diff()
-        
-        # --- 3) Volatility ---
-        df["ATR_14"] = ta.volatility.AverageTrueRange(
-            high=df["High"], low=df["Low"], close=df["Close"], window=14
-        ).average_true_range()
-        
-        bb = ta.volatility.BollingerBands(close=df["Close"], window=20, window_dev=2)
-        df["BB_upper"] = bb.bollinger_hband()
-        df["BB_middle"] = bb.bollinger_mavg()
-        df["BB_lower"] = bb.bollinger_lband()
-        
-        # --- 4) Volume indicator ---
-        if "Volume" in df.columns:
-            df["OBV"] = ta.volume.OnBalanceVolumeIndicator(
-                close=df["Close"], volume=df["Volume"]
-            ).on_balance_volume()
+        return df
+    
+    def add_technical_indicators(self, df, columns=None):
+        """
+        Add the feature spec's technical indicators to a dataframe
+        
+        Args:
+            df (pandas.DataFrame): DataFrame with OHLCV data
+            columns (iterable): Only compute these feature columns (e.g., a model's inputs)
+            
+        Returns:
+            pandas.DataFrame: DataFrame with added technical indicators
+        """
+        df = self.clean_bars(df)
+        
+        # Every requested indicator, sharing intermediates across families and windows
+        features = compute_features(df, self.spec, columns)
+        
+        # One block insert instead of a column at a time
+        df = df.drop(columns=[col for col in features if col in df.columns])
+        df = pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
         
         # Drop rows with NaN from indicators
         df = df.dropna()
         
         return df
     
-    def process_all_files(self):
-        """Process all CSV files in the input directory"""
-        # Get all CSV files
-        csv_files = glob(os.path.join(self.input_dir, "*.csv"))
+    def bars_hash(self, df):
+        """
+        Fingerprint the OHLCV values of some bars
+        
+        Args:
+            df (pandas.DataFrame): Clean bars
+            
+        Returns:
+            str: Hex digest that changes when any bar's date or values change
+        """
+        columns = [col for col in ["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"] if col in df.columns]
+        hashes = pd.util.hash_pandas_object(df[columns], index=False).values
+        return hashlib.sha1(hashes.tobytes()).hexdigest()
+    
+    def state_path(self, stem):
+        """Get the file holding a symbol's saved indicator state"""
+        return os.path.join(self.output_dir, ".feature_state", f"{stem}.json")
+    
+    def process_file(self, file_path, incremental=False, columns=None):
+        """
+        Build or update one symbol's features dataset
+        
+        In incremental mode the indicator state saved by the previous run is
+        restored and only raw rows after the last processed date are computed
+        and appended. The full history is recomputed when there is no usable
+        state: first run, missing output, or raw rows that changed at or
+        before the last processed date.
+        
+        Args:
+            file_path (str): Raw dataset
+            incremental (bool): Append new rows instead of rebuilding
+            columns (iterable): Only compute these feature columns (e.g., the union of the
+                models' inputs); the dataset and saved state then hold just the pruned spec
+            
+        Returns:
+            tuple: (output_path, rows_written, mode) where mode is 'full', 'incremental' or 'unchanged'
+        """
+        if columns is not None:
+            # A pruned spec is a spec of its own: switching to or from it rebuilds the dataset once
+            pruned = FeatureEngineering(self.input_dir, self.output_dir, prune_spec(self.spec, columns))
+            return pruned.process_file(file_path, incremental)
+        
+        stem = dataset_stem(file_path)
+        state_path = self.state_path(stem)
+        df = self.clean_bars(read_dataset(file_path))
+        
+        existing = find_dataset(self.output_dir, f"{stem}_features")
+        if incremental and existing and 'Date' in df.columns:
+            engine = OnlineFeatureEngine.load(state_path)
+            processed = df['Date'] <= pd.Timestamp(engine.last_date) if engine and engine.last_date else None
+            
+            # The saved state is only valid for the same spec and the exact rows it consumed;
+            # the hash catches revised values (e.g., an overlap re-download), not just new dates
+            if (processed is not None and engine.spec == self.spec
+                    and processed.sum() == engine.rows and processed.values[:engine.rows].all()
+                    and engine.source_hash == self.bars_hash(df[processed])):
+                new_bars = df[~processed]
+                if new_bars.empty:
+                    return existing, 0, 'unchanged'
+                
+                features = pd.DataFrame(engine.update_frame(new_bars), index=new_bars.index)
+                new_rows = pd.concat([new_bars, features], axis=1).dropna()
+                append_dataset(new_rows, existing)
+                engine.source_hash = self.bars_hash(df)
+                engine.save(state_path)
+                return existing, len(new_rows), 'incremental'
+        
+        df_with_features = self.add_technical_indicators(df.copy())
+        output_path = dataset_path(self.output_dir, f"{stem}_features")
+        write_dataset(df_with_features, output_path)
+        
+        if incremental and 'Date' in df.columns:
+            # Replay the history once so the next run can start from here
+            engine = OnlineFeatureEngine(self.spec, volume="Volume" in df.columns)
+            engine.update_frame(df)
+            engine.source_hash = self.bars_hash(df)
+            engine.save(state_path)
+        elif os.path.exists(state_path):
+            # A full rebuild outside incremental mode leaves no state to trust
+            os.remove(state_path)
+        
+        return output_path, len(df_with_features), 'full'
+    
+    def latest_features(self, symbol, lookback=None, columns=None):
+        """
+        Compute only the newest feature row for a symbol
+        
+        Reads just the end of the raw dataset. When the incremental feature
+        run has saved indicator state and the last bar it consumed is unchanged
+        in the raw data, that state is advanced over the bars added since and
+        the row is exact. Otherwise the indicators are
+        computed over a trailing window long enough for every window to fill
+        and the recursive indicators to settle (see lookback_rows). OBV is a
+        running total, so without saved state it continues the total in the
+        features dataset (see anchored_obv); only when that is missing is the
+        full price and volume history read.
+        
+        Args:
+            symbol (str): Raw dataset name (e.g., 'AAPL', 'BTC_USD')
+            lookback (int): Trailing bars for the window path (defaults to lookback_rows(spec))
+            columns (iterable): Only compute these feature columns; the window path then also
+                reads just the bars they need
+        
+        Returns:
+            pandas.Series: Last bar's raw values followed by its features, or None
+        """
+        source = find_dataset(self.input_dir, symbol)
+        if source is None:
+            return None
+        
+        engine = OnlineFeatureEngine.load(self.state_path(symbol))
+        if engine is not None and engine.spec == self.spec and engine.last_features and engine.last_date:
+            last_date = pd.Timestamp(engine.last_date)
+            
+            # Grow the tail until it reaches back to the last processed bar
+            n = 8
+            bars = self.clean_bars(read_dataset_tail(source, n))
+            while len(bars) and bars['Date'].iloc[0] > last_date and len(bars) >= n:
+                n *= 4
+                bars = self.clean_bars(read_dataset_tail(source, n))
+            
+            # A revised last bar (e.g., from an overlap re-download) makes the saved state stale
+            previous = bars[bars['Date'] == last_date]
+            if len(previous) and engine.last_bar == {field: float(previous[field].iloc[-1])
+                                                     for field in engine.last_bar or {}}:
+                features = engine.last_features
+                for bar in bars[bars['Date'] > last_date].to_dict('records'):
+                    features = engine.update(bar)
+                if columns is not None:
+                    features = {name: value for name, value in features.items() if name in set(columns)}
+                if OnlineFeatureEngine.is_complete(features):
+                    return pd.concat([bars.iloc[-1], pd.Series(features, dtype=float)])
+        
+        spec = self.spec if columns is None else prune_spec(self.spec, columns)
+        bars = read_dataset_tail(source, lookback or lookback_rows(spec))
+        df = self.add_technical_indicators(bars, columns)
+        if df.empty:
+            return None
+        
+        if 'OBV' in df.columns:
+            obv = self.anchored_obv(symbol, df)
+            if obv is None:
+                # The running total needs every bar; the OHLCV columns decide which rows clean_bars keeps
+                history = self.clean_bars(read_dataset(source, columns=["Open", "High", "Low", "Close", "Adj Close", "Volume"]))
+                obv = indicators.obv(history['Close'], history['Volume'])[-1]
+            df.loc[df.index[-1], 'OBV'] = obv
+        return df.iloc[-1]
+    
+    def anchored_obv(self, symbol, bars):
+        """
+        Continue the OBV total saved by the last feature run over trailing bars
+        
+        The anchor is the newest features row whose Close and Volume, and those
+        of every earlier row the two tails share, still match the raw bars, so
+        a revised bar (e.g., from an overlap re-download) is never built upon.
+        
+        Args:
+            symbol (str): Raw dataset name
+            bars (pandas.DataFrame): Clean trailing raw bars with Date, Close and Volume
+            
+        Returns:
+            float: OBV at the last bar, or None if the features dataset has no usable anchor
+        """
+        features_file = find_dataset(self.output_dir, f"{symbol}_features")
+        if features_file is None or 'OBV' not in dataset_columns(features_file):
+            return None
+        
+        saved = read_dataset_tail(features_file, len(bars))
+        positions = pd.DataFrame({'Date': bars['Date'].values, 'position': np.arange(len(bars))})
+        common = positions.merge(saved[['Date', 'Close', 'Volume', 'OBV']], on='Date')
+        matches = ((common['Close'].to_numpy(dtype=float) == bars['Close'].to_numpy(dtype=float)[common['position']])
+                   & (common['Volume'].to_numpy(dtype=float) == bars['Volume'].to_numpy(dtype=float)[common['position']]))
+        matches = np.logical_and.accumulate(matches)
+        if not matches.any():
+            return None
+        
+        anchor = common[matches].iloc[-1]
+        close = bars['Close'].to_numpy(dtype=float)[int(anchor['position']):]
+        volume = bars['Volume'].to_numpy(dtype=float)[int(anchor['position']) + 1:]
+        return float(anchor['OBV'] + np.where(close[1:] < close[:-1], -volume, volume).sum())
+    
+    def try_process_file(self, file_path, incremental=False, columns=None):
+        """
+        Process one file, capturing any error instead of raising
+        
+        Returns:
+            tuple: (file_path, process_file result or None, error message or None)
+        """
+        try:
+            return file_path, self.process_file(file_path, incremental, columns), None
+        except Exception as e:
+            return file_path, None, str(e)
+    
+    def process_parallel(self, data_files, incremental=False, workers=4, chunk_size=None, columns=None):
+        """
+        Process files in a pool of worker processes
+        
+        Files are split into chunks so each task amortizes process start-up
+        and pickling. Every file writes only its own outputs, and outcomes
+        are yielded in input order, so results are identical to a sequential run.
+        
+        Args:
+            data_files (list): Raw dataset paths
+            incremental (bool): Passed to process_file
+            workers (int): Worker processes
+            chunk_size (int): Files per task (defaults to about four tasks per worker)
+            columns (iterable): Passed to process_file
+            
+        Yields:
+            tuple: (file_path, process_file result or None, error message or None)
+        """
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(data_files) // (workers * 4)))
+        chunks = [data_files[i:i + chunk_size] for i in range(0, len(data_files), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(process_files_chunk, self.input_dir, self.output_dir, self.spec, chunk, incremental, columns)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    yield from future.result()
+                except Exception as e:
+                    # The worker died (e.g. out of memory); fail its whole chunk
+                    for file_path in chunk:
+                        yield file_path, None, f"worker failed: {e}"
+    
+    def process_all_files(self, incremental=False, workers=1, chunk_size=None, columns=None):
+        """
+        Process all raw datasets (Parquet or CSV) in the input directory
         
-        if not csv_files:
-            print(f"⚠️ No CSV files found in {self.input_dir}")
+        Args:
+            incremental (bool): Only compute and append rows added since the last run
+            workers (int): Worker processes (1 processes files in this process)
+            chunk_size (int): Files per worker task (see process_parallel)
+            columns (iterable): Only compute these feature columns (see process_file)
+            
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        # Get all raw datasets
+        data_files = list_datasets(self.input_dir)
+        
+        if not data_files:
+            print(f"⚠️ No data files found in {self.input_dir}")
             return 0, 0
         
-        print(f"🔧 Processing {len(csv_files)} files...")
+        print(f"🔧 Processing {len(data_files)} files{' incrementally' if incremental else ''}"
+              f"{f' with {workers} workers' if workers > 1 else ''}...")
         print(f"📁 Input directory: {self.input_dir}")
         print(f"📁 Output directory: {self.output_dir}")
         
         successful_processing = 0
         failed_processing = 0
         
-        for file_path in csv_files:
+        if workers > 1 and len(data_files) > 1:
+            outcomes = self.process_parallel(data_files, incremental, workers, chunk_size, columns)
+        else:
+            outcomes = (self.try_process_file(file_path, incremental, columns) for file_path in data_files)
+        
+        for file_path, result, error in outcomes:
             file_name = os.path.basename(file_path)
-            print(f"⚡ Processing {file_name}...")
             
-            try:
-                # Read CSV with Date column
-                df = pd.read_csv(file_path, parse_dates=True)
-                
-                # Add technical indicators
-                df_with_features = self.add_technical_indicators(df)
-                
-                # Create output filename
-                output_filename = file_name.replace(".csv", "_features.csv")
-                output_path = os.path.join(self.output_dir, output_filename)
-                
-                # Save processed data
-                df_with_features.to_csv(output_path, index=False)
-                print(f"✅ Saved {output_filename} ({len(df_with_features)} rows)")
-                successful_processing += 1
-                
-            except Exception as e:
-                print(f"❌ Failed to process {file_name}: {e}")
+            if error is not None:
+                print(f"❌ Failed to process {file_name}: {error}")
                 failed_processing += 1
+                continue
+            
+            output_path, rows, mode = result
+            output_filename = os.path.basename(output_path)
+            if mode == 'incremental':
+                print(f"➕ Appended {rows} rows to {output_filename}")
+            elif mode == 'unchanged':
+                print(f"⏭️ {output_filename} is up to date")
+            else:
+                print(f"✅ Saved {output_filename} ({rows} rows)")
+            successful_processing += 1
         
         print(f"\n🔧 Feature Engineering Summary:")
         print(f"✅ Successful: {successful_processing}")
@@ -131,11 +382,123 @@ class FeatureEngineering:
         
         return successful_processing, failed_processing
 
+    def process_intraday(self, interval="4h", store=None):
+        """
+        Add technical indicators to resampled intraday bars
+        
+        Reads each symbol's bars for one interval from the intraday store and
+        writes <symbol>_features datasets into an <interval> sub-directory of
+        the output directory.
+        
+        Args:
+            interval (str): Stored bar interval (e.g., "1h", "4h")
+            store (IntradayStore): Intraday store (defaults to data/intraday)
+            
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        if store is None:
+            store = IntradayStore()
+        
+        interval_dir = os.path.join(store.root_dir, interval)
+        symbols = sorted(os.listdir(interval_dir)) if os.path.exists(interval_dir) else []
+        
+        if not symbols:
+            print(f"⚠️ No {interval} bars found in {store.root_dir}")
+            return 0, 0
+        
+        output_dir = os.path.join(self.output_dir, interval)
+        os.makedirs(output_dir, exist_ok=True)
+        
+        print(f"🔧 Processing {interval} bars for {len(symbols)} symbols...")
+        
+        successful_processing = 0
+        failed_processing = 0
+        
+        for symbol in symbols:
+            try:
+                df_with_features = self.add_technical_indicators(store.read(symbol, interval))
+                write_dataset(df_with_features, dataset_path(output_dir, f"{symbol}_features"))
+                successful_processing += 1
+            except Exception as e:
+                print(f"❌ Failed to process {symbol} {interval} bars: {e}")
+                failed_processing += 1
+        
+        print(f"✅ {interval} features: {successful_processing} saved, {failed_processing} failed")
+        
+        return successful_processing, failed_processing
+
+    def process_multi_timeframe(self, timeframes=("1h", "4h", "1d"), decision=None, store=None, source_interval=None):
+        """
+        Build one wide feature matrix per symbol from several timeframes
+        
+        Each symbol's source bars are read from the intraday store once and
+        every coarser timeframe is resampled in memory from the next finer
+        one, instead of reading and processing each interval separately.
+        Writes <symbol>_features datasets into a "<tf>_<tf>_..." sub-directory
+        of the output directory.
+        
+        Args:
+            timeframes (tuple): Bar intervals to compute features on
+            decision (str): Interval the output rows are aligned to (defaults to the finest)
+            store (IntradayStore): Intraday store (defaults to data/intraday)
+            source_interval (str): Stored interval to read (defaults to the finest timeframe)
+            
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        if store is None:
+            store = IntradayStore()
+        
+        timeframes = sorted(set(timeframes), key=interval_ns)
+        source_interval = source_interval or timeframes[0]
+        
+        source_dir = os.path.join(store.root_dir, source_interval)
+        symbols = sorted(os.listdir(source_dir)) if os.path.exists(source_dir) else []
+        
+        if not symbols:
+            print(f"⚠️ No {source_interval} bars found in {store.root_dir}")
+            return 0, 0
+        
+        output_dir = os.path.join(self.output_dir, "_".join(timeframes))
+        os.makedirs(output_dir, exist_ok=True)
+        
+        print(f"🔧 Processing {'/'.join(timeframes)} features for {len(symbols)} symbols "
+              f"(decision timeframe {decision or timeframes[0]})...")
+        
+        successful_processing = 0
+        failed_processing = 0
+        
+        for symbol in symbols:
+            try:
+                bars = self.clean_bars(store.read(symbol, source_interval))
+                df_with_features = compute_multi_timeframe(bars, self.spec, timeframes, decision, source_interval)
+                write_dataset(df_with_features, dataset_path(output_dir, f"{symbol}_features"))
+                successful_processing += 1
+            except Exception as e:
+                print(f"❌ Failed to process {symbol} multi-timeframe bars: {e}")
+                failed_processing += 1
+        
+        print(f"✅ Multi-timeframe features: {successful_processing} saved, {failed_processing} failed")
+        
+        return successful_processing, failed_processing
+
+def process_files_chunk(input_dir, output_dir, spec, file_paths, incremental, columns=None):
+    """Process a chunk of files in a worker process"""
+    fe = FeatureEngineering(input_dir, output_dir, spec)
+    return [fe.try_process_file(file_path, incremental, columns) for file_path in file_paths]
+
 if __name__ == "__main__":
     # Initialize feature engineering
     fe = FeatureEngineering()
     
-    # Process all files
-    fe.process_all_files()
+    # Process all files (--incremental only appends rows added since the last run,
+    # --workers N spreads files over N processes)
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
+    fe.process_all_files(incremental="--incremental" in sys.argv, workers=workers)
+    
+    # --timeframes 1h,4h,1d also builds multi-timeframe features from the intraday store
+    if "--timeframes" in sys.argv:
+        fe.process_multi_timeframe(sys.argv[sys.argv.index("--timeframes") + 1].split(","))
     
     print("\n✅ Feature engineering completed!")
@@ -0,0 +1,267 @@
+"""
+Cross-Sectional Features Module
+Ranks, z-scores, relative strength and reference correlations across the asset panel
+"""
+
+import numpy as np
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from utils.trading_calendar import infer_asset_class
+from storage.panel_loader import PanelLoader
+from storage.dataset_io import read_dataset, write_dataset
+
+# Reference series for rolling correlations: a panel symbol, or an asset class
+# whose equal-weighted daily return stands in for an index (SPY-like for stocks)
+DEFAULT_REFERENCES = {
+    "BTC": "BTC_USD",
+    "STOCKS": "stock"
+}
+
+# Prefix of every column this stage writes, so reruns replace them
+PREFIX = "CS_"
+
+# Feature dataset columns this stage reads, so pruned feature runs must keep them
+INPUT_COLUMNS = ('Close', 'RSI_14')
+
+def neutral_value(name):
+    """Value written where a feature is undefined (warm-up, lone symbol): mid rank, otherwise 0"""
+    return 0.5 if name.endswith("_rank") else 0.0
+
+def window_sums(values, window):
+    """
+    Sum the last `window` dates of a (symbols, dates) array, treating NaN as 0
+    
+    Returns:
+        tuple: (sums, counts of non-NaN values), both (symbols, dates)
+    """
+    valid = ~np.isnan(values)
+    padding = np.zeros((values.shape[0], 1))
+    csum = np.concatenate([padding, np.cumsum(np.where(valid, values, 0.0), axis=1)], axis=1)
+    ccount = np.concatenate([padding, np.cumsum(valid, axis=1)], axis=1)
+    
+    start = np.maximum(np.arange(values.shape[1]) + 1 - window, 0)
+    end = np.arange(1, values.shape[1] + 1)
+    return csum[:, end] - csum[:, start], ccount[:, end] - ccount[:, start]
+
+def cross_sectional_rank(values):
+    """
+    Percentile rank of each symbol among the symbols with a value on the same date
+    
+    Args:
+        values (numpy.ndarray): (symbols, dates) array, NaN where missing
+    
+    Returns:
+        numpy.ndarray: Ranks from 0 (lowest) to 1 (highest), NaN where missing or alone
+    """
+    valid = ~np.isnan(values)
+    order = np.argsort(np.where(valid, values, np.inf), axis=0, kind="stable")
+    
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, np.arange(values.shape[0], dtype=float)[:, None], axis=0)
+    
+    counts = valid.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranks = ranks / (counts - 1)
+    return np.where(valid & (counts > 1), ranks, np.nan)
+
+def cross_sectional_zscore(values):
+    """
+    Z-score of each symbol against the other symbols on the same date
+    
+    Args:
+        values (numpy.ndarray): (symbols, dates) array, NaN where missing
+    
+    Returns:
+        numpy.ndarray: Z-scores, NaN where missing or the cross-section has no spread
+    """
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    filled = np.where(valid, values, 0.0)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = filled.sum(axis=0) / counts
+        std = np.sqrt(np.where(valid, (values - mean) ** 2, 0.0).sum(axis=0) / counts)
+        z = (values - mean) / std
+    return np.where(valid & (counts > 1) & (std > 0), z, np.nan)
+
+def rolling_volatility(returns, window, min_periods=None):
+    """Rolling population standard deviation of each symbol's returns over the last `window` dates"""
+    min_periods = min_periods or max(2, window // 2)
+    sums, counts = window_sums(returns, window)
+    squares, _ = window_sums(returns * returns, window)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sums / counts
+        variance = np.maximum(squares / counts - mean * mean, 0.0)
+    return np.where(counts >= min_periods, np.sqrt(variance), np.nan)
+
+def rolling_correlation(returns, reference, window, min_periods=None):
+    """
+    Rolling correlation of every symbol's returns with one reference series
+    
+    Only dates where both the symbol and the reference have a return count,
+    and every symbol is handled in the same cumulative-sum pass.
+    
+    Args:
+        returns (numpy.ndarray): (symbols, dates) returns
+        reference (numpy.ndarray): (dates,) reference returns
+        window (int): Dates per window
+        min_periods (int): Paired observations needed (defaults to half the window)
+    
+    Returns:
+        numpy.ndarray: (symbols, dates) correlations
+    """
+    min_periods = min_periods or max(3, window // 2)
+    paired = ~np.isnan(returns) & ~np.isnan(reference)[None, :]
+    x = np.where(paired, returns, np.nan)
+    y = np.where(paired, reference[None, :], np.nan)
+    
+    sx, n = window_sums(x, window)
+    sy, _ = window_sums(y, window)
+    sxx, _ = window_sums(x * x, window)
+    syy, _ = window_sums(y * y, window)
+    sxy, _ = window_sums(x * y, window)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = n * sxy - sx * sy
+        spread = np.sqrt(np.maximum(n * sxx - sx * sx, 0.0) * np.maximum(n * syy - sy * sy, 0.0))
+        correlation = np.clip(covariance / spread, -1.0, 1.0)
+    return np.where((n >= min_periods) & (spread > 0), correlation, np.nan)
+
+def class_means(values, class_ids, class_count):
+    """Equal-weighted mean per asset class and date, ignoring missing values"""
+    membership = np.zeros((class_count, values.shape[0]))
+    membership[class_ids, np.arange(values.shape[0])] = 1.0
+    
+    valid = ~np.isnan(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (membership @ np.where(valid, values, 0.0)) / (membership @ valid)
+
+def compute_cross_sectional(panel, asset_classes=None, references=None,
+                            return_window=20, volatility_window=20, correlation_window=60):
+    """
+    Compute cross-sectional features for every symbol and date of a panel
+    
+    Returns are taken on each symbol's own rows, measured from its last
+    close (so a Monday stock return spans the weekend in a panel that also
+    holds crypto).
+    
+    Args:
+        panel (Panel): Panel with a 'Close' field (and 'RSI_14' for RSI features)
+        asset_classes (dict): Symbol -> asset class (inferred from names if None)
+        references (dict): Name -> panel symbol or asset class (defaults to DEFAULT_REFERENCES)
+        return_window (int): Dates in the return used for asset-class relative strength
+        volatility_window (int): Dates in the rolling volatility
+        correlation_window (int): Dates in the rolling reference correlations
+    
+    Returns:
+        dict: Feature name -> (symbols, dates) array
+    """
+    asset_classes = asset_classes or {symbol: infer_asset_class(symbol) for symbol in panel.symbols}
+    references = DEFAULT_REFERENCES if references is None else references
+    
+    closes = panel.filled('Close')
+    previous = np.concatenate([np.full((closes.shape[0], 1), np.nan), closes[:, :-1]], axis=1)
+    lagged = np.concatenate([np.full((closes.shape[0], return_window), np.nan),
+                             closes[:, :-return_window]], axis=1)[:, :closes.shape[1]]
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(panel.mask, closes / previous - 1.0, np.nan)
+        period_returns = np.where(panel.mask, closes / lagged - 1.0, np.nan)
+    volatility = np.where(panel.mask, rolling_volatility(returns, volatility_window), np.nan)
+    
+    features = {}
+    inputs = {'return': returns, 'volatility': volatility}
+    if 'RSI_14' in panel.fields and not np.isnan(panel.field('RSI_14')).all():
+        inputs['rsi'] = np.where(panel.mask, panel.field('RSI_14'), np.nan)
+    for name, values in inputs.items():
+        features[f"{PREFIX}{name}_rank"] = cross_sectional_rank(values)
+        features[f"{PREFIX}{name}_z"] = cross_sectional_zscore(values)
+    
+    # Relative strength: a symbol's period return minus its asset class average
+    classes = sorted(set(asset_classes[symbol] for symbol in panel.symbols))
+    class_ids = np.array([classes.index(asset_classes[symbol]) for symbol in panel.symbols])
+    period_means = class_means(period_returns, class_ids, len(classes))
+    features[f"{PREFIX}class_relative_strength"] = period_returns - period_means[class_ids]
+    
+    daily_means = class_means(returns, class_ids, len(classes))
+    for name, source in references.items():
+        if source in panel.symbol_index:
+            reference = returns[panel.symbol_index[source]]
+        elif source in classes:
+            reference = daily_means[classes.index(source)]
+        else:
+            continue
+        features[f"{PREFIX}corr_{name}"] = np.where(
+            panel.mask, rolling_correlation(returns, reference, correlation_window), np.nan
+        )
+    
+    return features
+
+class CrossSectionalFeatures:
+    """Adds panel-wide features to every symbol's feature dataset"""
+    
+    def __init__(self, data_dir=None, suffix="_features", references=None, cache_dir=None):
+        """
+        Initialize the cross-sectional stage
+        
+        Args:
+            data_dir (str): Per-symbol feature datasets (defaults to MarketData_Features)
+            suffix (str): Dataset name suffix stripped to get the symbol
+            references (dict): Name -> panel symbol or asset class for correlations
+            cache_dir (str): Panel cache directory (defaults to data/cache)
+        """
+        if data_dir is None:
+            self.data_dir = get_data_dir("features")
+        else:
+            self.data_dir = data_dir
+        
+        self.suffix = suffix
+        self.references = references
+        self.loader = PanelLoader(self.data_dir, suffix, cache_dir)
+    
+    def run(self):
+        """
+        Compute the features over the whole panel and merge them into each dataset
+        
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        # Only the inputs are loaded; earlier cross-sectional columns are replaced
+        panel = self.loader.load(fields=list(INPUT_COLUMNS), use_cache=False)
+        if panel is None:
+            return 0, 0
+        
+        print(f"🌐 Computing cross-sectional features for {len(panel.symbols)} symbols x {len(panel.dates)} dates...")
+        features = compute_cross_sectional(panel, references=self.references)
+        files = self.loader.source_files(panel.symbols)
+        
+        successful = 0
+        failed = 0
+        for i, symbol in enumerate(panel.symbols):
+            try:
+                df = read_dataset(files[symbol])
+                df = df.drop(columns=[col for col in df.columns if col.startswith(PREFIX)])
+                
+                # Panel positions of this symbol's rows (every row's date is on the panel axis)
+                positions = np.searchsorted(panel.dates, df['Date'].values.astype("datetime64[ns]"))
+                for name, values in features.items():
+                    # Models cannot take NaN, so undefined values become neutral
+                    column = values[i, positions]
+                    df[name] = np.where(np.isnan(column), neutral_value(name), column)
+                
+                write_dataset(df, files[symbol])
+                successful += 1
+            except Exception as e:
+                print(f"❌ Failed to add cross-sectional features for {symbol}: {e}")
+                failed += 1
+        
+        print(f"✅ Cross-sectional features: {successful} datasets updated, {failed} failed")
+        return successful, failed
+
+if __name__ == "__main__":
+    CrossSectionalFeatures().run()
@@ -0,0 +1,261 @@
+"""
+Feature Graph Module
+Lazy evaluation of feature columns with shared intermediates resolved on demand
+"""
+
+import numpy as np
+import json
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from feature_engineering import indicators
+
+# Written next to the models by ModelTrainer: asset -> input columns of its model
+MODEL_COLUMNS_FILE = "model_columns.json"
+
+class FeatureGraph:
+    """
+    Dependency graph from feature columns to the intermediates they are built from
+    
+    Every node is computed at most once per evaluation and only when a
+    requested column needs it: SMA_20 and BB_middle are the same rolling
+    mean node, the Bollinger bands add a standard deviation node on the
+    shared cumulative sums, MACD reuses the EMA nodes, and RSI/ATR windows
+    share one series of price changes / true ranges. Asking for a subset of
+    columns (e.g., the ones a model was trained on) skips everything else.
+    """
+    
+    def __init__(self, outputs):
+        """
+        Initialize the graph
+        
+        Args:
+            outputs (list): (family, parameters, column names) from feature_spec.spec_outputs
+        """
+        self.outputs = outputs
+        
+        # node -> (dependency nodes, function of the dependencies' values)
+        self.nodes = {
+            'shifted': (['close'], lambda close: close - (close[0] if len(close) else 0.0)),
+            'base': (['close'], lambda close: close[0] if len(close) else 0.0),
+            'csum': (['shifted'], indicators.cumulative_sum),
+            'csum_sq': (['shifted'], lambda shifted: indicators.cumulative_sum(shifted * shifted)),
+            'changes': (['close'], indicators.price_changes),
+            'true_range': (['high', 'low', 'close'], indicators.true_range)
+        }
+        # column -> (node, position in a tuple-valued node or None)
+        self.columns = {}
+        
+        for family, params, names in outputs:
+            if family in ("sma", "bollinger"):
+                window = params[0]
+                self.add_mean(window)
+                if family == "sma":
+                    self.columns[names[0]] = (f"sma_{window}", None)
+                    continue
+                
+                dev = params[1]
+                self.nodes[f"std_{window}"] = (
+                    ['shifted', f"mean_{window}", 'csum_sq'],
+                    lambda shifted, mean, csum_sq, window=window: indicators.rolling_std(shifted, window, mean, csum_sq)
+                )
+                self.nodes[f"bb_{window}_{dev}"] = (
+                    [f"sma_{window}", f"std_{window}"],
+                    lambda middle, std, dev=dev: (middle + dev * std, middle - dev * std)
+                )
+                upper, middle, lower = names
+                self.columns[upper] = (f"bb_{window}_{dev}", 0)
+                self.columns[middle] = (f"sma_{window}", None)
+                self.columns[lower] = (f"bb_{window}_{dev}", 1)
+            elif family == "ema":
+                self.add_ema(params[0])
+                self.columns[names[0]] = (f"ema_{params[0]}", None)
+            elif family == "rsi":
+                window = params[0]
+                self.nodes[f"rsi_{window}"] = (
+                    ['changes'], lambda changes, window=window: indicators.rsi_from_changes(*changes, window)
+                )
+                self.columns[names[0]] = (f"rsi_{window}", None)
+            elif family == "atr":
+                window = params[0]
+                self.nodes[f"atr_{window}"] = (
+                    ['true_range'], lambda ranges, window=window: indicators.wilder_average(ranges, window)
+                )
+                self.columns[names[0]] = (f"atr_{window}", None)
+            elif family == "macd":
+                fast, slow, sign = params
+                self.add_ema(fast)
+                self.add_ema(slow)
+                self.nodes[f"macd_{fast}_{slow}"] = ([f"ema_{fast}", f"ema_{slow}"], lambda f, s: f - s)
+                self.nodes[f"macd_signal_{fast}_{slow}_{sign}"] = (
+                    [f"macd_{fast}_{slow}"], lambda line, sign=sign: indicators.ema(line, sign)
+                )
+                self.nodes[f"macd_hist_{fast}_{slow}_{sign}"] = (
+                    [f"macd_{fast}_{slow}", f"macd_signal_{fast}_{slow}_{sign}"], lambda line, signal: line - signal
+                )
+                line, signal, hist = names
+                self.columns[line] = (f"macd_{fast}_{slow}", None)
+                self.columns[signal] = (f"macd_signal_{fast}_{slow}_{sign}", None)
+                self.columns[hist] = (f"macd_hist_{fast}_{slow}_{sign}", None)
+            elif family == "obv":
+                self.nodes['obv'] = (['close', 'volume'], indicators.obv)
+                self.columns[names[0]] = ('obv', None)
+    
+    def add_mean(self, window):
+        """Add the rolling mean nodes for a window (shifted, and with the base added back)"""
+        self.nodes[f"mean_{window}"] = (
+            ['shifted', 'csum'], lambda shifted, csum: indicators.rolling_sum(shifted, window, csum) / window
+        )
+        self.nodes[f"sma_{window}"] = ([f"mean_{window}", 'base'], lambda mean, base: mean + base)
+    
+    def add_ema(self, window):
+        """Add the EMA node for a span"""
+        self.nodes[f"ema_{window}"] = (['close'], lambda close: indicators.ema(close, window))
+    
+    def resolve(self, columns=None):
+        """
+        List the nodes needed for some columns, dependencies first
+        
+        Args:
+            columns (iterable): Requested columns (all graph columns if None); others are ignored
+        
+        Returns:
+            list: Node names in evaluation order
+        """
+        wanted = self.columns if columns is None else [col for col in columns if col in self.columns]
+        
+        order = []
+        seen = set()
+        
+        def visit(node):
+            if node in seen or node not in self.nodes:
+                return
+            seen.add(node)
+            for dependency in self.nodes[node][0]:
+                visit(dependency)
+            order.append(node)
+        
+        for col in wanted:
+            visit(self.columns[col][0])
+        return order
+    
+    def evaluate(self, df, columns=None):
+        """
+        Compute the requested feature columns
+        
+        Args:
+            df (pandas.DataFrame): Clean OHLCV bars
+            columns (iterable): Columns to compute (every column if None); names the graph
+                does not produce, such as OHLCV or news columns, are ignored
+        
+        Returns:
+            dict: Column name -> numpy.ndarray, in spec output order
+        """
+        requested = set(self.columns if columns is None else columns)
+        if "Volume" not in df.columns:
+            requested.discard("OBV")
+        
+        values = {}
+        for field in ("Close", "High", "Low", "Volume"):
+            if field in df.columns:
+                values[field.lower()] = df[field].to_numpy(dtype=float)
+        
+        for node in self.resolve(requested):
+            dependencies, function = self.nodes[node]
+            values[node] = function(*(values[dependency] for dependency in dependencies))
+        
+        features = {}
+        for _, _, names in self.outputs:
+            for name in names:
+                if name in requested:
+                    node, position = self.columns[name]
+                    features[name] = values[node] if position is None else values[node][position]
+        return features
+
+def model_columns(model):
+    """
+    Get the input columns a trained model consumes
+    
+    Args:
+        model: Fitted estimator, or a list of column names
+    
+    Returns:
+        list: Column names, or None when the model does not record them
+    """
+    if isinstance(model, (list, tuple)):
+        return list(model)
+    names = getattr(model, 'feature_names_in_', None)
+    return list(names) if names is not None else None
+
+def importance_columns(columns, importances, min_importance=0.0):
+    """
+    Keep the columns whose importance is above a threshold
+    
+    Constant columns, such as a news score repeated on every row, are never
+    split on and have zero importance, so any positive threshold drops them.
+    
+    Args:
+        columns (list): Column names in the model's input order
+        importances (numpy.ndarray): feature_importances_ of a fitted model
+        min_importance (float): Columns at or below this importance are dropped
+    
+    Returns:
+        list: Kept column names in input order
+    """
+    importances = np.asarray(importances, dtype=float)
+    return [col for col, importance in zip(columns, importances) if importance > min_importance]
+
+def load_model_columns(models_dir):
+    """
+    Read the input columns recorded for each trained model
+    
+    Args:
+        models_dir (str): Models directory
+    
+    Returns:
+        dict: Asset -> column names (empty if nothing was recorded)
+    """
+    path = os.path.join(models_dir, MODEL_COLUMNS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_model_columns(models_dir, columns_by_asset):
+    """
+    Record the input columns of newly trained models, keeping the other assets' entries
+    
+    Args:
+        models_dir (str): Models directory
+        columns_by_asset (dict): Asset -> column names
+    """
+    recorded = load_model_columns(models_dir)
+    recorded.update(columns_by_asset)
+    
+    path = os.path.join(models_dir, MODEL_COLUMNS_FILE)
+    tmp_file = path + ".tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(recorded, f, indent=2)
+    os.replace(tmp_file, path)
+
+def union_columns(column_lists, required=()):
+    """
+    Combine the input columns of several models into what a batch run must compute
+    
+    Args:
+        column_lists (iterable): Column name lists (None for a model that records none)
+        required (iterable): Columns always included (e.g., inputs of a later stage)
+    
+    Returns:
+        list: Sorted column names, or None if every column is needed
+    """
+    union = set(required)
+    found = False
+    for columns in column_lists:
+        if columns is None:
+            return None
+        union.update(columns)
+        found = True
+    return sorted(union) if found else None
@@ -0,0 +1,245 @@
+"""
+Feature Spec Module
+Declarative indicator families and window sets, computed in one pass per family
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from feature_engineering.feature_graph import FeatureGraph
+
+# YAML specs are optional; JSON always works
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+# TRADING_FEATURE_SPEC points at another spec (e.g., a research sweep over many windows)
+DEFAULT_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'config', 'features.json')
+
+# Families in output column order
+FAMILIES = ("sma", "ema", "rsi", "macd", "atr", "bollinger", "obv")
+
+# The indicator set add_technical_indicators has always produced
+DEFAULT_SPEC = {
+    "sma": {"windows": [10, 20]},
+    "ema": {"windows": [10, 20]},
+    "rsi": {"windows": [14]},
+    "macd": {"settings": [[12, 26, 9]]},
+    "atr": {"windows": [14]},
+    "bollinger": {"windows": [20], "window_dev": 2},
+    "obv": {}
+}
+
+# Bump when indicator kernels change output, so stored features are recomputed
+FEATURE_VERSION = 1
+
+# These settings keep their historical unsuffixed column names
+DEFAULT_MACD = (12, 26, 9)
+DEFAULT_BOLLINGER_WINDOW = 20
+
+def get_spec_path(path=None):
+    """Get the spec path from the argument, the environment or the bundled default"""
+    return os.path.abspath(path or os.environ.get("TRADING_FEATURE_SPEC", DEFAULT_SPEC_PATH))
+
+def normalize_spec(spec):
+    """
+    Validate a spec and put it in canonical form
+    
+    Window lists are sorted and de-duplicated and unknown families are
+    rejected, so two specs that describe the same features compare equal.
+    
+    Args:
+        spec (dict): Family -> options
+    
+    Returns:
+        dict: Canonical spec with families in FAMILIES order
+    """
+    unknown = set(spec) - set(FAMILIES)
+    if unknown:
+        raise ValueError(f"Unknown indicator families: {', '.join(sorted(unknown))}")
+    
+    normalized = {}
+    for family in FAMILIES:
+        if family not in spec:
+            continue
+        options = dict(spec[family] or {})
+        
+        if family == "macd":
+            settings = sorted({tuple(int(w) for w in setting) for setting in options.get("settings", [DEFAULT_MACD])})
+            if any(len(setting) != 3 for setting in settings):
+                raise ValueError("MACD settings must be [fast, slow, signal] triples")
+            options["settings"] = [list(setting) for setting in settings]
+        elif family != "obv":
+            windows = sorted({int(window) for window in options.get("windows", [])})
+            if not windows or windows[0] < 1:
+                raise ValueError(f"{family} needs a list of positive windows")
+            options["windows"] = windows
+        
+        if family == "bollinger":
+            options["window_dev"] = float(options.get("window_dev", 2))
+        
+        normalized[family] = options
+    
+    return normalized
+
+def load_feature_spec(path=None):
+    """
+    Load a feature spec file
+    
+    A missing default spec falls back to DEFAULT_SPEC. Files ending in .yaml
+    or .yml need PyYAML.
+    
+    Args:
+        path (str): JSON or YAML spec (defaults to config/features.json)
+    
+    Returns:
+        dict: Canonical spec
+    """
+    path = get_spec_path(path)
+    if not os.path.exists(path) and path == get_spec_path(DEFAULT_SPEC_PATH):
+        return normalize_spec(DEFAULT_SPEC)
+    
+    with open(path, 'r') as f:
+        if path.endswith((".yaml", ".yml")):
+            if not YAML_AVAILABLE:
+                raise ImportError("PyYAML is required for YAML feature specs. Run: pip install pyyaml")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    
+    return normalize_spec(spec)
+
+def spec_hash(spec):
+    """
+    Get a short stable hash identifying the features a spec produces
+    
+    Args:
+        spec (dict): Feature spec (normalized before hashing)
+    
+    Returns:
+        str: 12 hex characters covering the canonical spec and FEATURE_VERSION
+    """
+    canonical = json.dumps({'version': FEATURE_VERSION, 'spec': normalize_spec(spec)}, sort_keys=True)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+def spec_outputs(spec):
+    """
+    List every indicator a spec asks for
+    
+    Args:
+        spec (dict): Canonical spec
+    
+    Returns:
+        list: (family, parameters, column names) in output order
+    """
+    outputs = []
+    for family, options in spec.items():
+        if family == "macd":
+            for fast, slow, sign in options["settings"]:
+                suffix = "" if (fast, slow, sign) == DEFAULT_MACD else f"_{fast}_{slow}_{sign}"
+                outputs.append((family, (fast, slow, sign),
+                                [f"MACD{suffix}", f"MACD_signal{suffix}", f"MACD_hist{suffix}"]))
+        elif family == "bollinger":
+            for window in options["windows"]:
+                suffix = "" if window == DEFAULT_BOLLINGER_WINDOW else f"_{window}"
+                outputs.append((family, (window, options["window_dev"]),
+                                [f"BB_upper{suffix}", f"BB_middle{suffix}", f"BB_lower{suffix}"]))
+        elif family == "obv":
+            outputs.append((family, (), ["OBV"]))
+        else:
+            for window in options["windows"]:
+                outputs.append((family, (window,), [f"{family.upper()}_{window}"]))
+    return outputs
+
+def spec_columns(spec):
+    """List the feature columns a spec produces"""
+    return [name for _, _, names in spec_outputs(spec) for name in names]
+
+def lookback_rows(spec, tolerance=1e-3):
+    """
+    Get how many trailing bars the last row of a spec's features needs
+    
+    Window indicators need their window (MACD needs slow + signal - 1 bars).
+    Recursive ones (EMA, RSI, ATR, MACD) are seeded at the first bar, so
+    extra bars are added until the seed's weight decays below `tolerance`.
+    OBV is a running total over all history and cannot be recovered from a
+    window.
+    
+    Args:
+        spec (dict): Canonical spec
+        tolerance (float): Largest remaining weight of the seed value
+    
+    Returns:
+        int: Number of bars
+    """
+    rows = 1
+    for family, params, _ in spec_outputs(spec):
+        if family == "macd":
+            fast, slow, sign = params
+            warmup, alphas = slow + sign - 1, [2.0 / (slow + 1), 2.0 / (sign + 1)]
+        elif family in ("sma", "bollinger"):
+            warmup, alphas = params[0], []
+        elif family == "ema":
+            warmup, alphas = params[0], [2.0 / (params[0] + 1)]
+        elif family in ("rsi", "atr"):
+            warmup, alphas = params[0], [1.0 / params[0]]
+        else:
+            continue
+        
+        settle = sum(math.ceil(math.log(tolerance) / math.log(1.0 - alpha)) for alpha in alphas if alpha < 1)
+        rows = max(rows, warmup + settle)
+    return rows
+
+def prune_spec(spec, columns):
+    """
+    Reduce a spec to the indicators that produce some columns
+    
+    Args:
+        spec (dict): Canonical spec
+        columns (iterable): Columns that are needed (e.g., a model's inputs)
+    
+    Returns:
+        dict: Canonical spec covering just those columns (empty if none are spec columns)
+    """
+    columns = set(columns)
+    pruned = {}
+    for family, params, names in spec_outputs(spec):
+        if not columns.intersection(names):
+            continue
+        options = pruned.setdefault(family, {})
+        if family == "macd":
+            options.setdefault("settings", []).append(list(params))
+        elif family == "bollinger":
+            options.setdefault("windows", []).append(params[0])
+            options["window_dev"] = params[1]
+        elif family != "obv":
+            options.setdefault("windows", []).append(params[0])
+    return normalize_spec(pruned)
+
+def compute_features(df, spec, columns=None):
+    """
+    Compute the indicators in a spec, or only the ones some columns need
+    
+    Columns are evaluated lazily through a FeatureGraph: one cumulative sum
+    serves every SMA window and Bollinger middle band (BB_middle is the
+    SMA_20 node), one cumulative sum of squares every Bollinger width, one
+    true range series every ATR window, and EMAs are computed once per span
+    and reused by MACD. Intermediates no requested column depends on are
+    never computed.
+    
+    Args:
+        df (pandas.DataFrame): Clean OHLCV bars
+        spec (dict): Canonical spec
+        columns (iterable): Columns to compute (every spec column if None)
+    
+    Returns:
+        dict: Column name -> numpy.ndarray, in output order
+    """
+    return FeatureGraph(spec_outputs(spec)).evaluate(df, columns)
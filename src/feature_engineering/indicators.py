@@ -0,0 +1,329 @@
+"""
+Indicators Module
+Vectorized NumPy technical indicator kernels matching the `ta` library
+"""
+
+import numpy as np
+
+# lfilter runs the EMA recursion in C; without scipy a plain loop is used
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+def recursive_filter(values, alpha, initial):
+    """
+    Run y[i] = alpha * x[i] + (1 - alpha) * y[i - 1] starting from y[-1] = initial
+    
+    Args:
+        values (numpy.ndarray): Input without NaNs
+        alpha (float): Smoothing factor
+        initial (float): State before the first input
+    
+    Returns:
+        numpy.ndarray: Smoothed values
+    """
+    if len(values) == 0:
+        return np.array([], dtype=float)
+    
+    if SCIPY_AVAILABLE:
+        return lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * initial])[0]
+    
+    out = np.empty(len(values))
+    state = initial
+    for i, value in enumerate(values):
+        state = alpha * value + (1.0 - alpha) * state
+        out[i] = state
+    return out
+
+def cumulative_sum(values):
+    """Cumulative sum with a leading zero; one serves every rolling window over the same input"""
+    return np.cumsum(np.concatenate(([0.0], values)))
+
+def rolling_sum(values, window, csum=None):
+    """
+    Sum of each full window via cumulative sums (NaN for the first window - 1 rows)
+    
+    Args:
+        values (numpy.ndarray): Input series
+        window (int): Window length
+        csum (numpy.ndarray): Precomputed cumulative_sum(values), to share across windows
+    
+    Returns:
+        numpy.ndarray: Window sums
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        if csum is None:
+            csum = cumulative_sum(values)
+        out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+def rolling_std(shifted, window, mean, csum_sq=None):
+    """
+    Population standard deviation of each full window from a cumulative sum of squares
+    
+    Args:
+        shifted (numpy.ndarray): Input offset by its first value (as sma_multi uses)
+        window (int): Window length
+        mean (numpy.ndarray): Rolling mean of the shifted input for the same window
+        csum_sq (numpy.ndarray): Precomputed cumulative_sum(shifted ** 2), to share across windows
+    
+    Returns:
+        numpy.ndarray: Standard deviations, NaN until a full window is available
+    """
+    if csum_sq is None:
+        csum_sq = cumulative_sum(shifted * shifted)
+    variance = rolling_sum(shifted, window, csum_sq) / window - mean * mean
+    return np.sqrt(np.maximum(variance, 0.0))
+
+def sma_multi(values, windows):
+    """
+    Simple moving averages for several windows from one cumulative sum
+    
+    Args:
+        values (numpy.ndarray): Input series
+        windows (list): Window lengths
+    
+    Returns:
+        dict: Window -> averages, NaN until a full window is available
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return {window: values.copy() for window in windows}
+    
+    # Offsetting by the first value keeps the running sums small and precise
+    base = values[0]
+    shifted = values - base
+    csum = cumulative_sum(shifted)
+    return {window: rolling_sum(shifted, window, csum) / window + base for window in windows}
+
+def sma(values, window):
+    """
+    Simple moving average (ta.trend.SMAIndicator)
+    
+    Args:
+        values (numpy.ndarray): Input series
+        window (int): Window length
+    
+    Returns:
+        numpy.ndarray: Averages, NaN until a full window is available
+    """
+    return sma_multi(values, [window])[window]
+
+def ema(values, window=None, alpha=None, min_periods=None):
+    """
+    Exponential moving average with adjust=False (ta.trend.EMAIndicator)
+    
+    Leading NaNs are skipped, as pandas' ewm does, and the first output is
+    the first valid input.
+    
+    Args:
+        values (numpy.ndarray): Input series (NaNs only at the start)
+        window (int): Span; alpha defaults to 2 / (window + 1)
+        alpha (float): Smoothing factor, overriding the span
+        min_periods (int): Valid inputs needed before output starts (defaults to window)
+    
+    Returns:
+        numpy.ndarray: Averages
+    """
+    values = np.asarray(values, dtype=float)
+    if alpha is None:
+        alpha = 2.0 / (window + 1)
+    if min_periods is None:
+        min_periods = window or 1
+    
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+    
+    first = valid[0]
+    out[first:] = recursive_filter(values[first:], alpha, values[first])
+    out[first:first + min_periods - 1] = np.nan
+    return out
+
+def rsi_multi(close, windows):
+    """
+    Relative strength index for several windows from one set of price changes
+    
+    Args:
+        close (numpy.ndarray): Closing prices
+        windows (list): Lookback lengths
+    
+    Returns:
+        dict: Window -> RSI values between 0 and 100
+    """
+    up, down = price_changes(close)
+    return {window: rsi_from_changes(up, down, window) for window in windows}
+
+def price_changes(close):
+    """Split bar-to-bar changes into gains and losses (both positive, 0 on the first bar)"""
+    close = np.asarray(close, dtype=float)
+    diff = np.diff(close, prepend=np.nan)
+    
+    with np.errstate(invalid="ignore"):
+        up = np.where(diff > 0, diff, 0.0)
+        down = np.where(diff < 0, -diff, 0.0)
+    return up, down
+
+def rsi_from_changes(up, down, window):
+    """RSI for one window from price_changes' gains and losses"""
+    ema_up = ema(up, alpha=1.0 / window, min_periods=window)
+    ema_down = ema(down, alpha=1.0 / window, min_periods=window)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ema_down == 0, 100.0, 100.0 - 100.0 / (1.0 + ema_up / ema_down))
+
+def rsi(close, window=14):
+    """
+    Relative strength index with Wilder smoothing (ta.momentum.RSIIndicator)
+    
+    Args:
+        close (numpy.ndarray): Closing prices
+        window (int): Lookback length
+    
+    Returns:
+        numpy.ndarray: RSI values between 0 and 100
+    """
+    return rsi_multi(close, [window])[window]
+
+def macd(close, window_fast=12, window_slow=26, window_sign=9, emas=None):
+    """
+    Moving average convergence divergence (ta.trend.MACD)
+    
+    Args:
+        close (numpy.ndarray): Closing prices
+        window_fast (int): Fast EMA span
+        window_slow (int): Slow EMA span
+        window_sign (int): Signal EMA span
+        emas (dict): Span -> EMA of close already computed, reused and filled in
+    
+    Returns:
+        tuple: (macd, signal, histogram) arrays
+    """
+    if emas is None:
+        emas = {}
+    for window in (window_fast, window_slow):
+        if window not in emas:
+            emas[window] = ema(close, window)
+    
+    line = emas[window_fast] - emas[window_slow]
+    signal = ema(line, window_sign)
+    return line, signal, line - signal
+
+def true_range(high, low, close):
+    """True range; the first row has no previous close and uses High - Low"""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    prev_close = np.concatenate(([np.nan], np.asarray(close, dtype=float)[:-1]))
+    
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.nanmax(ranges, axis=0)
+
+def atr_multi(high, low, close, windows):
+    """
+    Average true range for several windows from one true range series
+    
+    Like `ta`, rows before the first full window are 0 rather than NaN.
+    
+    Args:
+        high (numpy.ndarray): Highs
+        low (numpy.ndarray): Lows
+        close (numpy.ndarray): Closes
+        windows (list): Smoothing lengths
+    
+    Returns:
+        dict: Window -> ATR values
+    """
+    ranges = true_range(high, low, close)
+    return {window: wilder_average(ranges, window) for window in windows}
+
+def wilder_average(ranges, window):
+    """Wilder smoothing seeded with the first window's mean (0 before it, as `ta` does for ATR)"""
+    out = np.zeros(len(ranges))
+    if len(ranges) >= window:
+        seed = ranges[:window].mean()
+        out[window - 1] = seed
+        out[window:] = recursive_filter(ranges[window:], 1.0 / window, seed)
+    return out
+
+def atr(high, low, close, window=14):
+    """
+    Average true range (ta.volatility.AverageTrueRange)
+    
+    Args:
+        high (numpy.ndarray): Highs
+        low (numpy.ndarray): Lows
+        close (numpy.ndarray): Closes
+        window (int): Smoothing length
+    
+    Returns:
+        numpy.ndarray: ATR values
+    """
+    return atr_multi(high, low, close, [window])[window]
+
+def bollinger_multi(close, windows, window_dev=2):
+    """
+    Bollinger bands for several windows from one pair of cumulative sums
+    
+    The middle band is the SMA, so the same shifted cumulative sum also
+    serves sma_multi's windows.
+    
+    Args:
+        close (numpy.ndarray): Closing prices
+        windows (list): Window lengths
+        window_dev (float): Band width in standard deviations
+    
+    Returns:
+        dict: Window -> (upper, middle, lower) arrays
+    """
+    close = np.asarray(close, dtype=float)
+    if len(close) == 0:
+        return {window: (close.copy(), close.copy(), close.copy()) for window in windows}
+    
+    shifted = close - close[0]
+    csum = cumulative_sum(shifted)
+    csum_sq = cumulative_sum(shifted * shifted)
+    
+    result = {}
+    for window in windows:
+        mean = rolling_sum(shifted, window, csum) / window
+        std = rolling_std(shifted, window, mean, csum_sq)
+        
+        middle = mean + close[0]
+        result[window] = (middle + window_dev * std, middle, middle - window_dev * std)
+    return result
+
+def bollinger_bands(close, window=20, window_dev=2):
+    """
+    Bollinger bands with population standard deviation (ta.volatility.BollingerBands)
+    
+    Args:
+        close (numpy.ndarray): Closing prices
+        window (int): Window length
+        window_dev (float): Band width in standard deviations
+    
+    Returns:
+        tuple: (upper, middle, lower) arrays
+    """
+    return bollinger_multi(close, [window], window_dev)[window]
+
+def obv(close, volume):
+    """
+    On-balance volume (ta.volume.OnBalanceVolumeIndicator)
+    
+    Args:
+        close (numpy.ndarray): Closing prices
+        volume (numpy.ndarray): Volumes
+    
+    Returns:
+        numpy.ndarray: Cumulative signed volume
+    """
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    
+    falling = np.zeros(len(close), dtype=bool)
+    falling[1:] = close[1:] < close[:-1]
+    return np.cumsum(np.where(falling, -volume, volume))
@@ -0,0 +1,165 @@
+"""
+Multi-Timeframe Features Module
+Computes the feature spec on several bar sizes and aligns them to one decision timeframe
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from feature_engineering.feature_spec import compute_features
+
+def interval_ns(interval):
+    """Get the length of an interval string ("1h", "4h", "1d", ...) in nanoseconds"""
+    return pd.Timedelta(interval.replace("d", "D")).value
+
+class Bars:
+    """
+    OHLCV arrays for one timeframe, keyed by bucket start (int64 ns, naive UTC)
+    
+    Buckets are aligned to UTC like BarResampler's, so bars built here line
+    up with the ones resample_store writes.
+    """
+    
+    def __init__(self, interval, start, open_, high, low, close, volume):
+        self.interval = interval
+        self.start = start
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+    
+    @classmethod
+    def from_frame(cls, df, interval):
+        """Build from a DataFrame of bars with Date, Open, High, Low, Close and optionally Volume"""
+        df = df.sort_values('Date', kind="stable")
+        volume = df['Volume'].to_numpy(dtype=float) if 'Volume' in df.columns else np.zeros(len(df))
+        return cls(
+            interval,
+            pd.to_datetime(df['Date']).values.astype("datetime64[ns]").astype(np.int64),
+            df['Open'].to_numpy(dtype=float), df['High'].to_numpy(dtype=float),
+            df['Low'].to_numpy(dtype=float), df['Close'].to_numpy(dtype=float), volume
+        )
+    
+    def resample(self, interval):
+        """
+        Aggregate into a coarser timeframe in one reduceat pass per field
+        
+        Args:
+            interval (str): Target interval, a multiple of this one
+        
+        Returns:
+            Bars: One bar per non-empty bucket (the last may still be forming)
+        """
+        bucket_ns = interval_ns(interval)
+        buckets = self.start - self.start % bucket_ns
+        first = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+        last = np.concatenate([first[1:], [len(buckets)]]) - 1
+        
+        return Bars(
+            interval, buckets[first], self.open[first],
+            np.maximum.reduceat(self.high, first), np.minimum.reduceat(self.low, first),
+            self.close[last], np.add.reduceat(self.volume, first)
+        )
+    
+    def complete(self, available_until):
+        """Keep only the bars whose bucket has closed by `available_until` (int64 ns)"""
+        keep = self.start + interval_ns(self.interval) <= available_until
+        return Bars(self.interval, self.start[keep], self.open[keep], self.high[keep],
+                    self.low[keep], self.close[keep], self.volume[keep])
+    
+    def to_frame(self):
+        """Convert to a DataFrame with the usual OHLCV columns"""
+        return pd.DataFrame({
+            'Date': pd.to_datetime(self.start), 'Open': self.open, 'High': self.high,
+            'Low': self.low, 'Close': self.close, 'Volume': self.volume
+        })
+
+def resample_chain(source, intervals):
+    """
+    Build every timeframe from the source bars, each from the finest one that divides it
+    
+    1d bars come from 4h bars, which come from 1h bars, so the source is
+    scanned once and each coarser frame only aggregates the frame below it.
+    
+    Args:
+        source (Bars): Finest bars (e.g., stored 1h bars)
+        intervals (iterable): Intervals to build
+    
+    Returns:
+        dict: Interval -> Bars, including every bucket that has started
+    """
+    frames = {source.interval: source}
+    for interval in sorted(set(intervals), key=interval_ns):
+        if interval in frames:
+            continue
+        target_ns = interval_ns(interval)
+        if target_ns % interval_ns(source.interval) != 0:
+            raise ValueError(f"{interval} is not a multiple of the {source.interval} source bars")
+        
+        base = max((frame for frame in frames.values() if target_ns % interval_ns(frame.interval) == 0),
+                   key=lambda frame: interval_ns(frame.interval))
+        frames[interval] = base.resample(interval)
+    return frames
+
+def compute_multi_timeframe(df, spec, timeframes, decision=None, source_interval=None):
+    """
+    Compute a feature spec on several timeframes as one matrix on the decision timeframe
+    
+    Each decision bar gets, for every other timeframe, the features of the
+    latest bar of that timeframe that had closed when the decision bar
+    closed, so coarser features never look ahead into a bucket still
+    forming. Decision timeframe features keep their names; the others get
+    an "_<interval>" suffix (e.g., RSI_14_1d).
+    
+    Args:
+        df (pandas.DataFrame): Source bars with Date (naive UTC) and OHLCV columns
+        spec (dict): Canonical feature spec
+        timeframes (iterable): Intervals to compute (e.g., ("1h", "4h", "1d"))
+        decision (str): Interval rows are aligned to (defaults to the finest timeframe)
+        source_interval (str): Interval of the source bars (defaults to the finest timeframe)
+    
+    Returns:
+        pandas.DataFrame: Decision timeframe bars with every timeframe's features
+    """
+    timeframes = sorted(set(timeframes), key=interval_ns)
+    decision = decision or timeframes[0]
+    source_interval = source_interval or timeframes[0]
+    if decision not in timeframes:
+        raise ValueError(f"Decision timeframe {decision} must be one of {', '.join(timeframes)}")
+    
+    source = Bars.from_frame(df, source_interval)
+    if len(source.start) == 0:
+        return pd.DataFrame()
+    
+    # Source bars are complete, so a bucket has closed once the source covers its end
+    available_until = source.start[-1] + interval_ns(source_interval)
+    frames = {interval: bars.complete(available_until)
+              for interval, bars in resample_chain(source, timeframes).items() if interval in timeframes}
+    
+    decision_bars = frames[decision]
+    result = decision_bars.to_frame()
+    decision_close = decision_bars.start + interval_ns(decision)
+    
+    columns = {}
+    for interval in timeframes:
+        bars = frames[interval]
+        features = compute_features(bars.to_frame(), spec)
+        if interval == decision:
+            columns.update(features)
+            continue
+        
+        # Latest bar of this timeframe closed at or before each decision bar's close
+        closes = bars.start + interval_ns(interval)
+        positions = np.searchsorted(closes, decision_close, side="right") - 1
+        for name, values in features.items():
+            aligned = np.full(len(positions), np.nan)
+            aligned[positions >= 0] = values[positions[positions >= 0]]
+            columns[f"{name}_{interval}"] = aligned
+    
+    result = pd.concat([result, pd.DataFrame(columns, index=result.index)], axis=1)
+    return result.dropna().reset_index(drop=True)
@@ -0,0 +1,402 @@
+"""
+Online Indicators Module
+Stateful technical indicators updated one bar at a time in O(1)
+"""
+
+import json
+import math
+import numbers
+import os
+import sys
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from feature_engineering.feature_spec import DEFAULT_SPEC, normalize_spec, spec_outputs
+
+NAN = float("nan")
+
+# Fields of the last consumed bar kept in the state, to notice when that bar is revised
+BAR_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+def bar_value(bar, field):
+    """Read a field from a bar (dict or pandas row); a bare number is its own value"""
+    if isinstance(bar, numbers.Real):
+        return float(bar)
+    return float(bar[field])
+
+class OnlineIndicator:
+    """
+    Base class for indicators that consume one bar per update
+    
+    All state lives in plain attributes (numbers, lists and nested
+    indicators), so `to_dict` / `from_dict` round-trip it through JSON and a
+    run can pick up exactly where the previous one stopped.
+    """
+    
+    def update(self, bar):
+        """
+        Consume the next bar
+        
+        Args:
+            bar: Mapping with OHLCV fields (or a number for single-input indicators)
+        
+        Returns:
+            Indicator value(s) after this bar
+        """
+        raise NotImplementedError
+    
+    def to_dict(self):
+        """Serialize parameters and state"""
+        state = {'type': type(self).__name__}
+        for name, value in vars(self).items():
+            if isinstance(value, OnlineIndicator):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = list(value)
+            state[name] = value
+        return state
+    
+    @staticmethod
+    def from_dict(state):
+        """
+        Rebuild an indicator serialized with `to_dict`
+        
+        Args:
+            state (dict): Serialized indicator
+        
+        Returns:
+            OnlineIndicator: Indicator continuing from the saved state
+        """
+        state = dict(state)
+        cls = INDICATOR_TYPES[state.pop('type')]
+        indicator = cls.__new__(cls)
+        for name, value in state.items():
+            if isinstance(value, dict) and 'type' in value:
+                value = OnlineIndicator.from_dict(value)
+            setattr(indicator, name, value)
+        return indicator
+
+class RollingWindow(OnlineIndicator):
+    """
+    Running sum and sum of squares over the last `window` values
+    
+    Values are stored relative to the first one seen, and the sums are
+    recomputed exactly each time the ring buffer wraps, so rounding error
+    cannot build up over long streams (amortized O(1) per update).
+    """
+    
+    def __init__(self, window):
+        self.window = window
+        self.values = [0.0] * window
+        self.position = 0
+        self.count = 0
+        self.base = None
+        self.total = 0.0
+        self.total_sq = 0.0
+    
+    def push(self, value):
+        """Add a value, evicting the oldest once the window is full"""
+        if self.base is None:
+            self.base = value
+        shifted = value - self.base
+        
+        if self.count >= self.window:
+            old = self.values[self.position]
+            self.total -= old
+            self.total_sq -= old * old
+        
+        self.values[self.position] = shifted
+        self.total += shifted
+        self.total_sq += shifted * shifted
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+        
+        if self.position == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+    
+    @property
+    def full(self):
+        return self.count >= self.window
+    
+    def mean(self):
+        """Mean of the window (NaN until full)"""
+        return self.total / self.window + self.base if self.full else NAN
+    
+    def std(self):
+        """Population standard deviation of the window (NaN until full)"""
+        if not self.full:
+            return NAN
+        mean = self.total / self.window
+        return math.sqrt(max(self.total_sq / self.window - mean * mean, 0.0))
+
+class SMA(OnlineIndicator):
+    """Simple moving average"""
+    
+    def __init__(self, window, field="Close"):
+        """
+        Args:
+            window (int): Window length
+            field (str): Bar field to average
+        """
+        self.field = field
+        self.rolling = RollingWindow(window)
+    
+    def update(self, bar):
+        self.rolling.push(bar_value(bar, self.field))
+        return self.rolling.mean()
+
+class EMA(OnlineIndicator):
+    """Exponential moving average with adjust=False, seeded with the first value"""
+    
+    def __init__(self, window=None, alpha=None, min_periods=None, field="Close"):
+        """
+        Args:
+            window (int): Span; alpha defaults to 2 / (window + 1)
+            alpha (float): Smoothing factor, overriding the span
+            min_periods (int): Values needed before output starts (defaults to window)
+            field (str): Bar field to average
+        """
+        self.alpha = alpha if alpha is not None else 2.0 / (window + 1)
+        self.min_periods = min_periods if min_periods is not None else (window or 1)
+        self.field = field
+        self.value = NAN
+        self.count = 0
+    
+    def update(self, bar):
+        value = bar_value(bar, self.field)
+        # Leading NaNs are skipped, as pandas' ewm does
+        if not math.isnan(value):
+            if self.count == 0:
+                self.value = value
+            else:
+                self.value = self.alpha * value + (1.0 - self.alpha) * self.value
+            self.count += 1
+        return self.value if self.count >= self.min_periods else NAN
+
+class RSI(OnlineIndicator):
+    """Relative strength index with Wilder smoothing"""
+    
+    def __init__(self, window=14, field="Close"):
+        self.field = field
+        self.prev_close = None
+        self.up = EMA(alpha=1.0 / window, min_periods=window)
+        self.down = EMA(alpha=1.0 / window, min_periods=window)
+    
+    def update(self, bar):
+        close = bar_value(bar, self.field)
+        diff = close - self.prev_close if self.prev_close is not None else 0.0
+        self.prev_close = close
+        
+        up = self.up.update(max(diff, 0.0))
+        down = self.down.update(max(-diff, 0.0))
+        if math.isnan(down):
+            return NAN
+        return 100.0 if down == 0 else 100.0 - 100.0 / (1.0 + up / down)
+
+class MACD(OnlineIndicator):
+    """Moving average convergence divergence; update returns (macd, signal, histogram)"""
+    
+    def __init__(self, window_fast=12, window_slow=26, window_sign=9, field="Close"):
+        self.field = field
+        self.fast = EMA(window_fast)
+        self.slow = EMA(window_slow)
+        self.signal = EMA(window_sign)
+    
+    def update(self, bar):
+        close = bar_value(bar, self.field)
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        return line, signal, line - signal
+
+class ATR(OnlineIndicator):
+    """Average true range; like `ta`, 0 until the first full window"""
+    
+    def __init__(self, window=14):
+        self.window = window
+        self.prev_close = None
+        self.count = 0
+        self.total = 0.0
+        self.value = 0.0
+    
+    def update(self, bar):
+        high = bar_value(bar, "High")
+        low = bar_value(bar, "Low")
+        
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = bar_value(bar, "Close")
+        self.count += 1
+        
+        # Seeded with the first window's mean, then Wilder smoothing
+        if self.count < self.window:
+            self.total += true_range
+        elif self.count == self.window:
+            self.value = (self.total + true_range) / self.window
+        else:
+            alpha = 1.0 / self.window
+            self.value = alpha * true_range + (1.0 - alpha) * self.value
+        return self.value
+
+class BollingerBands(OnlineIndicator):
+    """Bollinger bands with population standard deviation; update returns (upper, middle, lower)"""
+    
+    def __init__(self, window=20, window_dev=2, field="Close"):
+        self.window_dev = window_dev
+        self.field = field
+        self.rolling = RollingWindow(window)
+    
+    def update(self, bar):
+        self.rolling.push(bar_value(bar, self.field))
+        middle = self.rolling.mean()
+        width = self.window_dev * self.rolling.std()
+        return middle + width, middle, middle - width
+
+class OBV(OnlineIndicator):
+    """On-balance volume"""
+    
+    def __init__(self):
+        self.prev_close = None
+        self.value = 0.0
+    
+    def update(self, bar):
+        close = bar_value(bar, "Close")
+        volume = bar_value(bar, "Volume")
+        
+        falling = self.prev_close is not None and close < self.prev_close
+        self.value += -volume if falling else volume
+        self.prev_close = close
+        return self.value
+
+INDICATOR_TYPES = {cls.__name__: cls for cls in
+                   (RollingWindow, SMA, EMA, RSI, MACD, ATR, BollingerBands, OBV)}
+
+# Feature spec family -> indicator built from that family's parameters
+FAMILY_INDICATORS = {
+    "sma": SMA,
+    "ema": EMA,
+    "rsi": RSI,
+    "macd": MACD,
+    "atr": ATR,
+    "bollinger": BollingerBands,
+    "obv": OBV
+}
+
+class OnlineFeatureEngine:
+    """
+    Streaming counterpart of FeatureEngineering.add_technical_indicators
+    
+    Produces the same feature spec columns for each new bar from saved state
+    instead of recomputing the whole history.
+    """
+    
+    def __init__(self, spec=None, volume=True):
+        """
+        Initialize the engine
+        
+        Args:
+            spec (dict): Canonical feature spec (defaults to the add_technical_indicators defaults)
+            volume (bool): Whether bars carry Volume (adds OBV when the spec has it)
+        """
+        self.spec = normalize_spec(spec if spec is not None else DEFAULT_SPEC)
+        
+        # (column names, indicator) pairs in feature column order
+        self.indicators = []
+        for family, params, names in spec_outputs(self.spec):
+            if family == "obv" and not volume:
+                continue
+            self.indicators.append((names, FAMILY_INDICATORS[family](*params)))
+        
+        self.rows = 0
+        self.last_date = None
+        self.last_features = None
+        self.last_bar = None
+        # Set by the caller to fingerprint the bars consumed so far (see FeatureEngineering.bars_hash)
+        self.source_hash = None
+    
+    def update(self, bar):
+        """
+        Consume one OHLCV bar
+        
+        Args:
+            bar: Mapping or pandas row with Open/High/Low/Close(/Volume) and optionally Date
+        
+        Returns:
+            dict: Feature name -> value after this bar
+        """
+        features = {}
+        for names, indicator in self.indicators:
+            value = indicator.update(bar)
+            if len(names) == 1:
+                features[names[0]] = value
+            else:
+                features.update(zip(names, value))
+        
+        self.rows += 1
+        if 'Date' in bar:
+            self.last_date = str(bar['Date'])
+        self.last_features = features
+        self.last_bar = {field: bar_value(bar, field) for field in BAR_FIELDS if field in bar}
+        return features
+    
+    def update_frame(self, df):
+        """
+        Consume the rows of a DataFrame in order
+        
+        Args:
+            df (pandas.DataFrame): OHLCV bars
+        
+        Returns:
+            list: One feature dict per row
+        """
+        return [self.update(row) for row in df.to_dict('records')]
+    
+    @staticmethod
+    def is_complete(features):
+        """Check a feature row has no warm-up NaNs (the rows add_technical_indicators keeps)"""
+        return not any(math.isnan(value) for value in features.values())
+    
+    def to_dict(self):
+        """Serialize the spec and every indicator's state"""
+        return {
+            'spec': self.spec,
+            'rows': self.rows,
+            'last_date': self.last_date,
+            'last_features': self.last_features,
+            'last_bar': self.last_bar,
+            'source_hash': self.source_hash,
+            'indicators': [[names, indicator.to_dict()] for names, indicator in self.indicators]
+        }
+    
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild an engine serialized with `to_dict`"""
+        engine = cls.__new__(cls)
+        engine.spec = state.get('spec')
+        engine.rows = state['rows']
+        engine.last_date = state.get('last_date')
+        engine.last_features = state.get('last_features')
+        engine.last_bar = state.get('last_bar')
+        engine.source_hash = state.get('source_hash')
+        engine.indicators = [(names, OnlineIndicator.from_dict(indicator))
+                             for names, indicator in state['indicators']]
+        return engine
+    
+    def save(self, path):
+        """Write the engine state to a JSON file atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated': datetime.now().isoformat(), **self.to_dict()}, f)
+        os.replace(tmp_file, path)
+    
+    @classmethod
+    def load(cls, path):
+        """Load engine state saved with `save` (None if the file is missing)"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
@@ -6,7 +6,6 @@ Trains machine learning models for stock prediction
 import pandas as pd
 import os
 import sys
-from glob import glob
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
@@ -15,10 +14,28 @@ import joblib
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.paths import get_data_dir, get_models_dir
+from storage.dataset_io import list_datasets, read_dataset, dataset_stem, dataset_columns, find_dataset
+from storage.feature_store import FeatureStore
+from storage.memory_budget import read_compact, compact_frame
+from feature_engineering.feature_graph import importance_columns, save_model_columns
 
 class ModelTrainer:
-    def __init__(self, data_dir=None, models_dir=None):
-        """Initialize model trainer"""
+    def __init__(self, data_dir=None, models_dir=None, feature_spec=None, feature_store=None, compact=False,
+                 min_importance=None):
+        """
+        Initialize model trainer
+        
+        Args:
+            data_dir (str): Directory with enhanced feature datasets
+            models_dir (str): Directory models are saved to
+            feature_spec (dict or str): Train on this feature spec's cached features from the
+                feature store instead of the enhanced datasets' technical columns
+            feature_store (FeatureStore): Store to request features from (defaults to data/feature_store)
+            compact (bool): Load feature columns as float32 and labels as int8, halving each
+                dataset's footprint (the forests train on float32 internally either way)
+            min_importance (float): Retrain without features at or below this importance, so
+                the saved model (and the features computed for it) only uses the rest
+        """
         if data_dir is None:
             self.data_dir = get_data_dir("enhanced")  # MarketData_Features_Enhanced
         else:
@@ -29,9 +46,48 @@ class ModelTrainer:
         else:
             self.models_dir = models_dir
         
+        self.feature_spec = feature_spec
+        if feature_store is None and feature_spec is not None:
+            feature_store = FeatureStore()
+        self.feature_store = feature_store
+        self.compact = compact
+        self.min_importance = min_importance
+        
         # Create models directory
         os.makedirs(self.models_dir, exist_ok=True)
     
+    def load_asset_data(self, asset, data_file):
+        """
+        Load an asset's training data
+        
+        With a feature store the technical features come from the store's
+        cached materialization for the spec, and the news columns are taken
+        from the enhanced dataset when it exists.
+        
+        Args:
+            asset (str): Asset name (e.g., 'AAPL', 'BTC_USD')
+            data_file (str): Enhanced dataset (may be None with a feature store)
+            
+        Returns:
+            pandas.DataFrame: Training data
+        """
+        if self.feature_store is None:
+            return read_compact(data_file) if self.compact else read_dataset(data_file)
+        
+        df = self.feature_store.get(asset, self.feature_spec)
+        if self.compact:
+            compact_frame(df)
+        
+        if data_file is not None:
+            # News sentiment is one value per asset, repeated on every row
+            news_cols = [col for col in dataset_columns(data_file) if col.startswith('news_')]
+            if news_cols:
+                news = read_dataset(data_file, columns=news_cols)
+                for col in news_cols:
+                    df[col] = news[col].iloc[-1]
+        
+        return df
+    
     def create_labels(self, df):
         """
         Create binary labels for price movement prediction
@@ -47,7 +103,7 @@ class ModelTrainer:
         
         # Create label: 1 if next day's close > today's close, else 0
         df['NextClose'] = df['Close'].shift(-1)
-        df['Label'] = (df['NextClose'] > df['Close']).astype(int)
+        df['Label'] = (df['NextClose'] > df['Close']).astype('int8' if self.compact else int)
         
         # Drop last row (no next day)
         df = df[:-1]
@@ -106,21 +162,23 @@ class ModelTrainer:
         
         return clf, accuracy, report, X.columns.tolist()
     
-    def train_single_asset(self, data_file):
+    def train_single_asset(self, data_file, asset=None):
         """
         Train a model for a single asset
         
         Args:
             data_file (str): Path to asset data file
+            asset (str): Asset name (defaults to the data file's name)
             
         Returns:
             dict: Training results
         """
-        asset = os.path.basename(data_file).replace('_enhanced_features.csv', '')
+        if asset is None:
+            asset = dataset_stem(data_file).replace('_enhanced_features', '')
         
         try:
             # Load data
-            df = pd.read_csv(data_file)
+            df = self.load_asset_data(asset, data_file)
             
             # Create labels
             df_with_labels = self.create_labels(df)
@@ -137,6 +195,14 @@ class ModelTrainer:
             
             # Train model
             model, accuracy, report, feature_names = self.train_model(X, y)
+            features_dropped = 0
+            
+            if self.min_importance is not None:
+                # Constant columns (like the repeated news scores) have zero importance
+                kept = importance_columns(feature_names, model.feature_importances_, self.min_importance)
+                if kept and len(kept) < len(feature_names):
+                    features_dropped = len(feature_names) - len(kept)
+                    model, accuracy, report, feature_names = self.train_model(X[kept], y)
             
             # Save model
             model_filename = f'{asset}_enhanced_rf_model.joblib'
@@ -156,7 +222,9 @@ class ModelTrainer:
                 'report': report,
                 'feature_importance': feature_importance,
                 'model_path': model_path,
-                'features_used': len(feature_names)
+                'features_used': len(feature_names),
+                'features_dropped': features_dropped,
+                'feature_names': feature_names
             }
             
         except Exception as e:
@@ -168,25 +236,30 @@ class ModelTrainer:
     
     def train_all_models(self):
         """Train models for all enhanced datasets"""
-        enhanced_files = glob(os.path.join(self.data_dir, '*_enhanced_features.csv'))
+        if self.feature_store is not None:
+            # Every asset with raw data; enhanced datasets only contribute news columns
+            assets = self.feature_store.symbols()
+            data_files = [find_dataset(self.data_dir, f'{asset}_enhanced_features') for asset in assets]
+        else:
+            data_files = list_datasets(self.data_dir, '_enhanced_features')
+            assets = [dataset_stem(file).replace('_enhanced_features', '') for file in data_files]
         
-        if not enhanced_files:
+        if not assets:
             print(f"⚠️ No enhanced feature files found in {self.data_dir}")
             return []
         
-        print(f"🤖 Training models for {len(enhanced_files)} assets...")
-        print(f"📁 Data directory: {self.data_dir}")
+        print(f"🤖 Training models for {len(assets)} assets...")
+        print(f"📁 Data directory: {self.feature_store.root_dir if self.feature_store else self.data_dir}")
         print(f"📁 Models directory: {self.models_dir}")
         
         results = []
         successful_training = 0
         failed_training = 0
         
-        for file in enhanced_files:
-            asset = os.path.basename(file).replace('_enhanced_features.csv', '')
+        for asset, file in zip(assets, data_files):
             print(f"\n🔧 Training model for {asset}...")
             
-            result = self.train_single_asset(file)
+            result = self.train_single_asset(file, asset)
             results.append(result)
             
             if result['success']:
@@ -199,6 +272,9 @@ class ModelTrainer:
                 print(f"❌ {asset} - Error: {result['error']}")
                 failed_training += 1
         
+        # Batch feature runs between retrains compute only what these models consume
+        save_model_columns(self.models_dir, {r['asset']: r['feature_names'] for r in results if r['success']})
+        
         print(f"\n🤖 Model Training Summary:")
         print(f"✅ Successful: {successful_training}")
         print(f"❌ Failed: {failed_training}")
@@ -212,8 +288,11 @@ class ModelTrainer:
         return results
 
 if __name__ == "__main__":
-    # Initialize trainer
-    trainer = ModelTrainer()
+    # Initialize trainer (--feature-spec <file> trains on cached features for that spec,
+    # --compact loads float32 features, --min-importance X prunes weak features)
+    feature_spec = sys.argv[sys.argv.index("--feature-spec") + 1] if "--feature-spec" in sys.argv else None
+    min_importance = float(sys.argv[sys.argv.index("--min-importance") + 1]) if "--min-importance" in sys.argv else None
+    trainer = ModelTrainer(feature_spec=feature_spec, compact="--compact" in sys.argv, min_importance=min_importance)
     
     # Train all models
     results = trainer.train_all_models()
@@ -154,6 +154,7 @@ import os
 # Add src to path for imports  
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.paths import get_data_dir
+from storage.dataset_io import list_datasets, read_dataset, write_dataset, dataset_path, dataset_stem
 
 class NewsFeatureEnhancer:
     def __init__(self, features_dir=None, output_dir=None):
@@ -178,17 +179,17 @@ class NewsFeatureEnhancer:
         Add news sentiment features to existing feature dataset
         
         Args:
-            feature_file (str): Path to features CSV file
+            feature_file (str): Path to features dataset (Parquet or CSV)
             output_file (str): Path for enhanced output file
             
         Returns:
             dict: Sentiment features that were added
         """
         # Extract symbol from filename
-        symbol = os.path.basename(feature_file).replace('_features.csv', '')
+        symbol = dataset_stem(feature_file).replace('_features', '')
         
         # Load existing features
-        df = pd.read_csv(feature_file)
+        df = read_dataset(feature_file)
         
         print(f"Fetching news sentiment for {symbol}...")
         sentiment_features = self.analyzer.get_sentiment_features(symbol)
@@ -198,16 +199,14 @@ class NewsFeatureEnhancer:
             df[f'news_{key}'] = value
         
         # Save enhanced dataset
-        df.to_csv(output_file, index=False)
+        write_dataset(df, output_file)
         print(f"Saved enhanced dataset to {output_file}")
         
         return sentiment_features
     
     def enhance_all_datasets(self):
         """Enhance all feature datasets with news sentiment"""
-        from glob import glob
-        
-        feature_files = glob(os.path.join(self.features_dir, '*_features.csv'))
+        feature_files = list_datasets(self.features_dir, '_features')
         
         if not feature_files:
             print(f"⚠️ No feature files found in {self.features_dir}")
@@ -222,8 +221,8 @@ class NewsFeatureEnhancer:
         failed_enhancements = 0
         
         for file in feature_files:
-            asset = os.path.basename(file).replace('_features.csv', '')
-            enhanced_file = os.path.join(self.output_dir, f'{asset}_enhanced_features.csv')
+            asset = dataset_stem(file).replace('_features', '')
+            enhanced_file = dataset_path(self.output_dir, f'{asset}_enhanced_features')
             
             try:
                 sentiment_features = self.add_news_features_to_dataset(file, enhanced_file)
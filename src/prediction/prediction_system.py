@@ -15,10 +15,35 @@ import numpy as np
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from news_analysis.news_analyzer import NewsAnalyzer
 from utils.paths import get_models_dir, get_data_dir, get_outputs_dir
+from storage.dataset_io import find_dataset, read_dataset, read_dataset_tail, dataset_columns
+from storage.memory_budget import DEFAULT_MEMORY_BUDGET, budget_chunks
+from storage.feature_store import FeatureStore
+from feature_engineering.add_indicators import FeatureEngineering
+from feature_engineering.feature_graph import model_columns
+from feature_engineering.cross_sectional import PREFIX as CROSS_SECTIONAL_PREFIX, neutral_value
 
 class StockPredictor:
-    def __init__(self, models_dir=None, data_dir=None):
-        """Initialize the stock predictor"""
+    def __init__(self, models_dir=None, data_dir=None, bar_store=None, quote_stream=None,
+                 feature_spec=None, feature_store=None, latest_only=False, compact=False,
+                 memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Initialize the stock predictor
+        
+        Args:
+            models_dir (str): Directory with trained models
+            data_dir (str): Directory with enhanced feature datasets
+            bar_store (BarStore): Optional memory-mapped store to read the latest row from
+            quote_stream (QuoteBuffers): Optional streamed prices reported alongside predictions
+            feature_spec (dict or str): Read features for this spec from the feature store
+                (use the spec the models were trained with)
+            feature_store (FeatureStore): Store to request features from (defaults to data/feature_store)
+            latest_only (bool): Compute just the newest feature row from the end of the raw
+                data instead of reading a batch feature dataset
+            compact (bool): Read only the last row of feature datasets and predict on float32 features
+            memory_budget (int): Bytes of models to hold at once; models are then loaded in chunks
+                during predict_all instead of all at startup (defaults to TRADING_MEMORY_BUDGET,
+                None loads every model)
+        """
         if models_dir is None:
             self.models_dir = get_models_dir()  # models/
         else:
@@ -28,23 +53,76 @@ class StockPredictor:
             self.data_dir = get_data_dir("enhanced")  # MarketData_Features_Enhanced
         else:
             self.data_dir = data_dir
+        self.bar_store = bar_store
+        self.quote_stream = quote_stream
+        self.feature_spec = feature_spec
+        if feature_store is None and feature_spec is not None:
+            feature_store = FeatureStore()
+        self.feature_store = feature_store
+        self.feature_engineering = FeatureEngineering(spec=feature_spec) if latest_only else None
+        # Cross-sectional columns come from the panel stage's output, not from one symbol's bars
+        self.cross_sectional_dir = get_data_dir("features")
+        self.compact = compact
+        self.memory_budget = memory_budget
         self.models = {}
+        self.model_files = {}
         self.news_analyzer = NewsAnalyzer()
         self.load_models()
     
     def load_models(self):
-        """Load all trained models"""
+        """Load all trained models (with a memory budget, only find them)"""
         model_files = glob(os.path.join(self.models_dir, '*_enhanced_rf_model.joblib'))
         
         for model_file in model_files:
             asset = os.path.basename(model_file).replace('_enhanced_rf_model.joblib', '')
-            try:
-                self.models[asset] = joblib.load(model_file)
+            self.model_files[asset] = model_file
+            if self.memory_budget is None:
+                self.load_model(asset)
+        
+        if self.memory_budget is None:
+            print(f"📊 Loaded {len(self.models)} models")
+        else:
+            print(f"📊 Found {len(self.model_files)} models (loaded in chunks of "
+                  f"{self.memory_budget / 1024 ** 2:.0f} MB)")
+    
+    def load_model(self, asset):
+        """
+        Load one asset's model into memory
+        
+        Args:
+            asset (str): Asset symbol
+            
+        Returns:
+            bool: True if the model is loaded
+        """
+        try:
+            self.models[asset] = joblib.load(self.model_files[asset])
+            if self.memory_budget is None:
                 print(f"✅ Loaded model for {asset}")
-            except Exception as e:
-                print(f"❌ Failed to load model for {asset}: {e}")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to load model for {asset}: {e}")
+            return False
+    
+    def latest_cross_sectional(self, asset, columns):
+        """
+        Get the newest cross-sectional values written for an asset
+        
+        Args:
+            asset (str): Asset symbol
+            columns (list): Cross-sectional column names
+            
+        Returns:
+            dict: Column -> value for the columns the features dataset has
+        """
+        feature_file = find_dataset(self.cross_sectional_dir, f'{asset}_features')
+        if feature_file is None or not set(columns).intersection(dataset_columns(feature_file)):
+            return {}
         
-        print(f"📊 Loaded {len(self.models)} models")
+        tail = read_dataset_tail(feature_file, 1)
+        if tail.empty:
+            return {}
+        return {col: tail[col].iloc[-1] for col in columns if col in tail.columns and pd.notna(tail[col].iloc[-1])}
     
     def get_latest_features(self, asset):
         """
@@ -56,13 +134,31 @@ class StockPredictor:
         Returns:
             numpy.ndarray: Feature array for prediction
         """
-        feature_file = os.path.join(self.data_dir, f'{asset}_enhanced_features.csv')
+        stem = f'{asset}_enhanced_features'
         
-        if not os.path.exists(feature_file):
-            print(f"Feature file not found for {asset}")
-            return None
-        
-        df = pd.read_csv(feature_file)
+        if self.feature_engineering is not None:
+            # Only the trailing raw bars are read and only the last row of the columns
+            # the model was trained on is computed
+            latest = self.feature_engineering.latest_features(asset, columns=model_columns(self.models.get(asset)))
+            if latest is None:
+                print(f"Raw data not found for {asset}")
+                return None
+            df = latest.to_frame().T
+        elif self.feature_store is not None:
+            # Cached materialization of the indicators the model uses; computed only if the raw data changed
+            df = self.feature_store.get(asset, self.feature_spec, columns=model_columns(self.models.get(asset)))
+        elif self.bar_store is not None and self.bar_store.exists(stem):
+            # Only the last row is paged in from the memory-mapped columns
+            df = self.bar_store.tail(stem, 1)
+        else:
+            feature_file = find_dataset(self.data_dir, stem)
+            
+            if feature_file is None:
+                print(f"Feature file not found for {asset}")
+                return None
+            
+            # Compact mode parses only the last row instead of the whole history
+            df = read_dataset_tail(feature_file, 1) if self.compact else read_dataset(feature_file)
         
         # Get the last row (most recent data) and prepare features
         last_row = df.iloc[-1].copy()
@@ -80,6 +176,23 @@ class StockPredictor:
         for key, value in current_sentiment.items():
             last_row[f'news_{key}'] = value
         
+        model = self.models.get(asset)
+        if hasattr(model, 'feature_names_in_'):
+            # Computed rows (latest_only, feature store) have no panel-wide columns, so the
+            # last values the cross-sectional stage wrote are used, or neutral ones if none
+            missing = [col for col in model.feature_names_in_
+                       if col.startswith(CROSS_SECTIONAL_PREFIX) and col not in last_row.index]
+            if missing:
+                cross_sectional = self.latest_cross_sectional(asset, missing)
+                for col in missing:
+                    last_row[col] = cross_sectional.get(col, neutral_value(col))
+            
+            # Match the training columns by name: computed rows carry no news columns, and
+            # models trained with min_importance use only a subset of the dataset's columns
+            last_row = last_row.reindex(model.feature_names_in_)
+        
+        if self.compact:
+            return last_row.values.astype(np.float32).reshape(1, -1)
         return last_row.values.reshape(1, -1)
     
     def predict(self, asset):
@@ -92,9 +205,18 @@ class StockPredictor:
         Returns:
             tuple: (prediction_dict, error_message)
         """
-        if asset not in self.models:
+        if asset not in self.model_files:
             return None, f"No model available for {asset}"
         
+        # Outside predict_all's chunks a budgeted model is loaded just for this call
+        if asset not in self.models:
+            if not self.load_model(asset):
+                return None, f"Could not load model for {asset}"
+            try:
+                return self.predict(asset)
+            finally:
+                self.models.pop(asset, None)
+        
         features = self.get_latest_features(asset)
         if features is None:
             return None, f"Could not get features for {asset}"
@@ -107,12 +229,20 @@ class StockPredictor:
             proba = self.models[asset].predict_proba(features)[0]
             confidence = max(proba)
             
-            return {
+            result = {
                 'prediction': 'UP' if prediction == 1 else 'DOWN',
                 'confidence': confidence,
                 'up_probability': proba[1] if len(proba) > 1 else 0,
                 'down_probability': proba[0] if len(proba) > 0 else 0
-            }, None
+            }
+            
+            # Latest streamed tick, read from memory (asset is the safe name, e.g. BTC_USD)
+            if self.quote_stream is not None:
+                current_price = self.quote_stream.latest_price(asset)
+                if current_price is not None:
+                    result['current_price'] = current_price
+            
+            return result, None
             
         except Exception as e:
             return None, f"Prediction failed for {asset}: {e}"
@@ -121,14 +251,24 @@ class StockPredictor:
         """Make predictions for all available assets"""
         predictions = {}
         
-        print(f"🔮 Making predictions for {len(self.models)} assets...")
+        print(f"🔮 Making predictions for {len(self.model_files)} assets...")
+        
+        assets = list(self.model_files)
+        sizes = [os.path.getsize(self.model_files[asset]) for asset in assets]
         
-        for asset in self.models.keys():
-            pred, error = self.predict(asset)
-            if pred:
-                predictions[asset] = pred
-            else:
-                print(f"❌ Error predicting {asset}: {error}")
+        for chunk in budget_chunks(assets, sizes, self.memory_budget):
+            # Models of a chunk are released before the next chunk is loaded
+            loaded = [asset for asset in chunk if asset not in self.models and self.load_model(asset)]
+            
+            for asset in chunk:
+                pred, error = self.predict(asset)
+                if pred:
+                    predictions[asset] = pred
+                else:
+                    print(f"❌ Error predicting {asset}: {error}")
+            
+            for asset in loaded:
+                del self.models[asset]
         
         return predictions
     
@@ -0,0 +1,252 @@
+"""
+Bar Store Module
+Memory-mapped per-symbol column store with a sorted date index
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import shutil
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from storage.dataset_io import list_datasets, read_dataset, dataset_stem
+
+class BarStore:
+    """
+    Stores each dataset as one .npy file per column plus an int64 date index
+    
+    Layout for a dataset named AAPL_enhanced_features:
+        <root>/AAPL_enhanced_features/meta.json   column names, dtypes, row count
+        <root>/AAPL_enhanced_features/Date.npy    int64 nanoseconds, sorted
+        <root>/AAPL_enhanced_features/c<i>.npy    one fixed-width column each
+    
+    Columns are opened with numpy memory mapping, so slicing a date range only
+    touches the pages that hold those rows.
+    """
+    
+    def __init__(self, root_dir=None, dtype="float64"):
+        """
+        Initialize the bar store
+        
+        Args:
+            root_dir (str): Directory holding one sub-directory per dataset (defaults to data/bars)
+            dtype (str): Column dtype for newly written datasets ('float64' or 'float32')
+        """
+        if root_dir is None:
+            self.root_dir = get_data_dir("bars")
+        else:
+            self.root_dir = root_dir
+        
+        self.dtype = dtype
+        self._open = {}
+        
+        os.makedirs(self.root_dir, exist_ok=True)
+    
+    def dataset_dir(self, name):
+        """Get the directory holding a dataset's column files"""
+        return os.path.join(self.root_dir, name)
+    
+    def exists(self, name):
+        """Check whether a dataset has been written to the store"""
+        return os.path.exists(os.path.join(self.dataset_dir(name), "meta.json"))
+    
+    def write(self, name, df, dtype=None):
+        """
+        Write a dataset to the store, replacing any previous version
+        
+        Args:
+            name (str): Dataset name (e.g., 'AAPL' or 'AAPL_enhanced_features')
+            df (pandas.DataFrame): Dataset with a 'Date' column
+            dtype (str): Column dtype (defaults to the store's dtype)
+        
+        Returns:
+            int: Number of rows written
+        """
+        if 'Date' not in df.columns:
+            raise ValueError("'Date' column not found in dataframe")
+        
+        dtype = dtype or self.dtype
+        
+        df = df.copy()
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.sort_values('Date').drop_duplicates(subset=['Date'], keep='last')
+        
+        # Only fixed-width numeric columns can be memory mapped
+        columns = [col for col in df.columns
+                   if col != 'Date' and pd.api.types.is_numeric_dtype(df[col])]
+        
+        # Write into a temporary directory and swap it in so readers never see half a dataset
+        target_dir = self.dataset_dir(name)
+        tmp_dir = target_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        
+        dates = df['Date'].values.astype("datetime64[ns]").astype(np.int64)
+        np.save(os.path.join(tmp_dir, "Date.npy"), dates)
+        
+        for i, col in enumerate(columns):
+            values = df[col].to_numpy(dtype=dtype)
+            np.save(os.path.join(tmp_dir, f"c{i}.npy"), values)
+        
+        meta = {
+            'columns': columns,
+            'dtype': dtype,
+            'rows': int(len(df))
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), 'w') as f:
+            json.dump(meta, f, indent=2)
+        
+        self._open.pop(name, None)
+        shutil.rmtree(target_dir, ignore_errors=True)
+        os.rename(tmp_dir, target_dir)
+        
+        return meta['rows']
+    
+    def open(self, name):
+        """
+        Open a dataset's memory-mapped columns
+        
+        Args:
+            name (str): Dataset name
+        
+        Returns:
+            dict: 'meta', 'dates' (int64 memmap) and 'columns' (name -> memmap)
+        """
+        if name in self._open:
+            return self._open[name]
+        
+        data_dir = self.dataset_dir(name)
+        with open(os.path.join(data_dir, "meta.json"), 'r') as f:
+            meta = json.load(f)
+        
+        columns = {}
+        for i, col in enumerate(meta['columns']):
+            columns[col] = np.load(os.path.join(data_dir, f"c{i}.npy"), mmap_mode='r')
+        
+        handle = {
+            'meta': meta,
+            'dates': np.load(os.path.join(data_dir, "Date.npy"), mmap_mode='r'),
+            'columns': columns
+        }
+        self._open[name] = handle
+        
+        return handle
+    
+    def columns(self, name):
+        """Get a dataset's column names in stored order (excluding 'Date')"""
+        return list(self.open(name)['meta']['columns'])
+    
+    def locate(self, name, start=None, end=None):
+        """
+        Find the row range covering a date range with binary search
+        
+        Args:
+            name (str): Dataset name
+            start (str or datetime): First date to include (None for the beginning)
+            end (str or datetime): Last date to include (None for the end)
+        
+        Returns:
+            tuple: (first_row, stop_row) suitable for slicing
+        """
+        dates = self.open(name)['dates']
+        
+        first = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).value, side='left'))
+        stop = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).value, side='right'))
+        
+        return first, max(first, stop)
+    
+    def read_rows(self, name, first, stop, columns=None):
+        """
+        Read a row range into a DataFrame
+        
+        Args:
+            name (str): Dataset name
+            first (int): First row
+            stop (int): Row to stop before
+            columns (list): Only read these columns; missing names are ignored
+        
+        Returns:
+            pandas.DataFrame: Rows with a 'Date' column followed by the requested columns
+        """
+        handle = self.open(name)
+        
+        if columns is None:
+            columns = handle['meta']['columns']
+        
+        data = {'Date': pd.to_datetime(np.asarray(handle['dates'][first:stop]))}
+        for col in columns:
+            if col in handle['columns']:
+                data[col] = np.asarray(handle['columns'][col][first:stop])
+        
+        return pd.DataFrame(data)
+    
+    def read(self, name, start=None, end=None, columns=None):
+        """
+        Read the rows of a dataset that fall within a date range
+        
+        Args:
+            name (str): Dataset name
+            start (str or datetime): First date to include
+            end (str or datetime): Last date to include
+            columns (list): Only read these columns
+        
+        Returns:
+            pandas.DataFrame: Matching rows
+        """
+        first, stop = self.locate(name, start, end)
+        return self.read_rows(name, first, stop, columns)
+    
+    def tail(self, name, n=1, columns=None):
+        """
+        Read the last n rows of a dataset
+        
+        Args:
+            name (str): Dataset name
+            n (int): Number of rows
+            columns (list): Only read these columns
+        
+        Returns:
+            pandas.DataFrame: The most recent rows
+        """
+        rows = self.open(name)['meta']['rows']
+        return self.read_rows(name, max(0, rows - n), rows, columns)
+    
+    def build_from_directory(self, directory, suffix=""):
+        """
+        Write every dataset in a data directory into the store
+        
+        Args:
+            directory (str): Data directory with Parquet or CSV datasets
+            suffix (str): Required dataset name suffix (e.g., '_enhanced_features')
+        
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        successful = 0
+        failed = 0
+        
+        for path in list_datasets(directory, suffix):
+            name = dataset_stem(path)
+            try:
+                rows = self.write(name, read_dataset(path))
+                print(f"✅ Stored {name} ({rows} rows)")
+                successful += 1
+            except Exception as e:
+                print(f"❌ Failed to store {name}: {e}")
+                failed += 1
+        
+        return successful, failed
+
+if __name__ == "__main__":
+    # Build bar stores from the raw and enhanced datasets
+    store = BarStore()
+    
+    for data_type, suffix in [("raw", ""), ("enhanced", "_enhanced_features")]:
+        print(f"\n📦 Building bar store from {data_type} data...")
+        store.build_from_directory(get_data_dir(data_type), suffix)
+    
+    print(f"\n✅ Bar store ready in: {os.path.abspath(store.root_dir)}")
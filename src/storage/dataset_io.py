@@ -0,0 +1,270 @@
+"""
+Dataset I/O Module
+Reads and writes per-symbol datasets as Parquet (default) or CSV
+"""
+
+import pandas as pd
+import io
+import os
+from glob import glob
+
+# Parquet support is optional; fall back to CSV when pyarrow is missing
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+FORMAT_EXTENSIONS = {
+    "parquet": ".parquet",
+    "csv": ".csv"
+}
+
+# TRADING_DATA_FORMAT=csv keeps the old text files
+DEFAULT_FORMAT = os.environ.get("TRADING_DATA_FORMAT", "parquet" if PARQUET_AVAILABLE else "csv")
+
+def get_default_format():
+    """Get the storage format used for newly written datasets"""
+    if DEFAULT_FORMAT == "parquet" and not PARQUET_AVAILABLE:
+        return "csv"
+    return DEFAULT_FORMAT
+
+def dataset_stem(path):
+    """Get a dataset's name without directory or extension (e.g., 'AAPL_features')"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def dataset_path(directory, stem, fmt=None):
+    """
+    Build the path a dataset should be written to
+    
+    Args:
+        directory (str): Data directory
+        stem (str): Dataset name without extension (e.g., 'AAPL_features')
+        fmt (str): 'parquet' or 'csv' (defaults to the configured format)
+    
+    Returns:
+        str: Full path including the format's extension
+    """
+    fmt = fmt or get_default_format()
+    return os.path.join(directory, f"{stem}{FORMAT_EXTENSIONS[fmt]}")
+
+def find_dataset(directory, stem):
+    """
+    Find an existing dataset, preferring Parquet over CSV
+    
+    Args:
+        directory (str): Data directory
+        stem (str): Dataset name without extension
+    
+    Returns:
+        str: Path of the stored dataset, or None if it does not exist
+    """
+    for fmt in ("parquet", "csv"):
+        path = dataset_path(directory, stem, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+def list_datasets(directory, suffix=""):
+    """
+    List datasets in a directory, one path per dataset name
+    
+    When both a Parquet and a CSV copy exist, the Parquet file is returned.
+    
+    Args:
+        directory (str): Data directory
+        suffix (str): Required name suffix (e.g., '_features')
+    
+    Returns:
+        list: Dataset paths sorted by name
+    """
+    datasets = {}
+    for fmt in ("csv", "parquet"):
+        pattern = os.path.join(directory, f"*{suffix}{FORMAT_EXTENSIONS[fmt]}")
+        for path in glob(pattern):
+            datasets[dataset_stem(path)] = path
+    
+    return [datasets[stem] for stem in sorted(datasets)]
+
+def normalize_dataset(df):
+    """
+    Give a dataset consistent column types
+    
+    Flattens yfinance's (Price, Ticker) header, parses 'Date', drops rows whose
+    date cannot be parsed (such as the ticker row yfinance writes under the
+    header) and converts every other column to a numeric dtype where possible.
+    
+    Args:
+        df (pandas.DataFrame): Dataset as read or downloaded
+    
+    Returns:
+        pandas.DataFrame: Typed dataset
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'], errors="coerce")
+        df = df.dropna(subset=['Date'])
+    
+    for col in df.columns:
+        if col == 'Date' or pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            pass
+    
+    return df.reset_index(drop=True)
+
+def read_dataset(path, columns=None):
+    """
+    Read a dataset written by write_dataset (or a legacy CSV)
+    
+    Args:
+        path (str): Dataset path (.parquet or .csv)
+        columns (list): Only load these columns; missing names are ignored
+    
+    Returns:
+        pandas.DataFrame: Typed dataset
+    """
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        if columns is not None:
+            available = pq.read_schema(path).names
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(path, columns=columns)
+    
+    if columns is not None:
+        wanted = set(columns)
+        df = pd.read_csv(path, usecols=lambda col: col in wanted)
+    else:
+        df = pd.read_csv(path)
+    
+    return normalize_dataset(df)
+
+def read_dataset_tail(path, n):
+    """
+    Read only the last n rows of a dataset
+    
+    Parquet files are read from their last row groups only; CSV files are
+    read backwards from the end in growing blocks until n lines are found,
+    so the cost depends on n rather than on the length of the history.
+    
+    Args:
+        path (str): Dataset path (.parquet or .csv)
+        n (int): Number of rows
+    
+    Returns:
+        pandas.DataFrame: Typed trailing rows (fewer if the dataset is shorter)
+    """
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        parquet_file = pq.ParquetFile(path)
+        tables = []
+        rows = 0
+        for i in reversed(range(parquet_file.num_row_groups)):
+            tables.insert(0, parquet_file.read_row_group(i))
+            rows += parquet_file.metadata.row_group(i).num_rows
+            if rows >= n:
+                break
+        df = pa.concat_tables(tables).to_pandas() if tables else pd.read_parquet(path)
+        return df.iloc[-n:].reset_index(drop=True)
+    
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body_start = f.tell()
+        position = f.seek(0, os.SEEK_END)
+        
+        data = b""
+        block = 16384
+        # One extra line, since the first one read may be cut off mid-row
+        while position > body_start and data.count(b"\n") <= n + 1:
+            step = min(block, position - body_start)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+            block *= 2
+    
+    lines = [line for line in data.split(b"\n") if line.strip()]
+    df = pd.read_csv(io.BytesIO(header + b"\n".join(lines[-n:]) + b"\n"))
+    return normalize_dataset(df)
+
+def dataset_columns(path):
+    """List a dataset's column names without reading its rows"""
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def write_dataset(df, path, compression="snappy"):
+    """
+    Write a dataset, choosing the format from the path's extension
+    
+    Args:
+        df (pandas.DataFrame): Dataset to write
+        path (str): Destination path (.parquet or .csv)
+        compression (str): Parquet compression codec
+    
+    Returns:
+        str: The path written
+    """
+    df = normalize_dataset(df.copy())
+    
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        df.to_parquet(path, index=False, compression=compression)
+    else:
+        df.to_csv(path, index=False)
+    
+    return path
+
+def append_dataset(df, path):
+    """
+    Append rows to a dataset, creating it if it does not exist
+    
+    CSV rows are appended in place under the existing header; a Parquet file
+    cannot grow in place, so its rows are read back and rewritten.
+    
+    Args:
+        df (pandas.DataFrame): Rows to append
+        path (str): Dataset path (.parquet or .csv)
+    
+    Returns:
+        str: The path written
+    """
+    if not os.path.exists(path):
+        return write_dataset(df, path)
+    
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        return write_dataset(pd.concat([pd.read_parquet(path), df], ignore_index=True), path)
+    
+    header = pd.read_csv(path, nrows=0).columns
+    normalize_dataset(df.copy()).reindex(columns=header).to_csv(path, mode="a", header=False, index=False)
+    return path
+
+def convert_directory(directory, fmt="parquet", remove_source=False):
+    """
+    Convert every dataset in a directory to another format
+    
+    Args:
+        directory (str): Data directory
+        fmt (str): Target format ('parquet' or 'csv')
+        remove_source (bool): Delete the original files after converting
+    
+    Returns:
+        tuple: (converted_count, failed_count)
+    """
+    converted = 0
+    failed = 0
+    
+    source_ext = FORMAT_EXTENSIONS["csv" if fmt == "parquet" else "parquet"]
+    for source_path in sorted(glob(os.path.join(directory, f"*{source_ext}"))):
+        target_path = dataset_path(directory, dataset_stem(source_path), fmt)
+        try:
+            write_dataset(read_dataset(source_path), target_path)
+            if remove_source:
+                os.remove(source_path)
+            converted += 1
+        except Exception as e:
+            print(f"❌ Failed to convert {source_path}: {e}")
+            failed += 1
+    
+    return converted, failed
@@ -0,0 +1,358 @@
+"""
+Feature Store Module
+Versioned feature materializations keyed by symbol, feature spec and source data
+"""
+
+import atexit
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Windows has no flock; msvcrt locks a byte of the lock file instead
+    import msvcrt
+    FCNTL_AVAILABLE = False
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from storage.dataset_io import find_dataset, list_datasets, read_dataset, write_dataset, dataset_path, dataset_stem
+from data_collection.checkpoints import file_hash
+from feature_engineering.feature_spec import load_feature_spec, normalize_spec, spec_hash, prune_spec
+from feature_engineering.add_indicators import FeatureEngineering
+
+# Stored versions beyond this many bytes are evicted least recently used first
+DEFAULT_MAX_BYTES = int(os.environ.get("TRADING_FEATURE_STORE_MAX_BYTES", 2 * 1024 ** 3))
+
+# Cache hit access times are written at most this often (and on gc/exit)
+FLUSH_SECONDS = 60
+
+class FeatureStore:
+    """
+    Caches computed features per (symbol, spec hash, source fingerprint)
+    
+    Layout:
+        <root>/index.json                       one entry per stored version
+        <root>/specs/<spec_hash>.json           the spec each hash stands for
+        <root>/<symbol>/<spec_hash>/<fingerprint>.parquet
+    
+    The fingerprint is a hash of the raw dataset's contents, so new bars or
+    revised history produce a new version, while an unchanged source and
+    spec is a cache hit that skips computation entirely. Outputs are never
+    overwritten in place; old versions are removed by `gc`.
+    
+    Several processes (trainer, predictor, pool workers) can share a store:
+    the index is re-read and merged under a file lock before every write.
+    Cache hits only touch memory; their access times are written in one batch
+    by `flush`, which runs on `gc`, at exit and at most every FLUSH_SECONDS.
+    """
+    
+    def __init__(self, root_dir=None, raw_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the feature store
+        
+        Args:
+            root_dir (str): Store directory (defaults to data/feature_store)
+            raw_dir (str): Raw datasets features are computed from (defaults to MarketData)
+            max_bytes (int): Size budget enforced after each new version (None disables)
+        """
+        if root_dir is None:
+            self.root_dir = get_data_dir("feature_store")
+        else:
+            self.root_dir = root_dir
+        
+        if raw_dir is None:
+            self.raw_dir = get_data_dir("raw")
+        else:
+            self.raw_dir = raw_dir
+        
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(self.root_dir, "index.json")
+        self.lock = threading.RLock()
+        # key -> (last access, hits) from cache hits not yet written to the index
+        self.pending = {}
+        self.flushed = time.monotonic()
+        
+        os.makedirs(os.path.join(self.root_dir, "specs"), exist_ok=True)
+        self.entries = self.read_index()
+        atexit.register(self.flush)
+    
+    @contextmanager
+    def index_lock(self):
+        """Hold the index exclusively across threads and processes"""
+        with self.lock, open(self.index_file + ".lock", 'a+') as f:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def read_index(self):
+        """Read the index on disk (empty if missing or unreadable)"""
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f).get('entries', {})
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable feature store index {self.index_file}: {e}")
+            return {}
+    
+    def merged_index(self, added=None):
+        """
+        Combine the index on disk with this process's changes (call under index_lock)
+        
+        Args:
+            added (dict): New entries by key
+        
+        Returns:
+            dict: Every process's entries with the pending access times applied
+        """
+        entries = self.read_index()
+        entries.update(added or {})
+        for key, (last_access, hits) in self.pending.items():
+            if key in entries:
+                entries[key]['last_access'] = max(entries[key]['last_access'], last_access)
+                entries[key]['hits'] = entries[key].get('hits', 0) + hits
+        return entries
+    
+    def write_index(self, entries):
+        """Write merged entries atomically and adopt them (call under index_lock)"""
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'updated': datetime.now().isoformat(), 'entries': entries}, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+        self.entries = entries
+        self.pending = {}
+        self.flushed = time.monotonic()
+    
+    def save_index(self, added=None):
+        """Merge this process's changes into the index on disk"""
+        with self.index_lock():
+            self.write_index(self.merged_index(added))
+    
+    def flush(self):
+        """Write access times batched from cache hits"""
+        if self.pending:
+            self.save_index()
+    
+    @staticmethod
+    def resolve_spec(spec):
+        """Turn a spec dict, spec file path or None (the configured spec) into a canonical spec"""
+        return normalize_spec(spec) if isinstance(spec, dict) else load_feature_spec(spec)
+    
+    def source_path(self, symbol):
+        """Get the raw dataset for a symbol (None if missing)"""
+        return find_dataset(self.raw_dir, symbol)
+    
+    def symbols(self):
+        """List the symbols that have raw data"""
+        return [dataset_stem(path) for path in list_datasets(self.raw_dir)]
+    
+    def key(self, symbol, spec=None):
+        """
+        Get the version key features for a symbol would be stored under
+        
+        Args:
+            symbol (str): Raw dataset name (e.g., 'AAPL', 'BTC_USD')
+            spec: Spec dict or spec file (defaults to the configured spec)
+        
+        Returns:
+            str: "<symbol>/<spec_hash>/<fingerprint>"
+        """
+        source = self.source_path(symbol)
+        if source is None:
+            raise FileNotFoundError(f"No raw dataset for {symbol} in {self.raw_dir}")
+        return f"{symbol}/{spec_hash(self.resolve_spec(spec))}/{file_hash(source)[:16]}"
+    
+    def get(self, symbol, spec=None, columns=None):
+        """
+        Get a symbol's features for a spec, computing them only on a cache miss
+        
+        Args:
+            symbol (str): Raw dataset name (e.g., 'AAPL', 'BTC_USD')
+            spec: Spec dict or spec file (defaults to the configured spec)
+            columns (iterable): Only the indicators producing these columns (e.g., a model's
+                inputs); the pruned spec is stored and keyed as a spec of its own
+        
+        Returns:
+            pandas.DataFrame: Raw bars with the spec's feature columns
+        """
+        spec = self.resolve_spec(spec)
+        if columns is not None:
+            spec = prune_spec(spec, columns)
+        key = self.key(symbol, spec)
+        
+        if key not in self.entries:
+            # Another process may have stored it since the index was read
+            with self.index_lock():
+                self.entries = self.merged_index()
+        
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and os.path.exists(os.path.join(self.root_dir, entry['path'])):
+                now = datetime.now().isoformat()
+                entry['last_access'] = now
+                entry['hits'] = entry.get('hits', 0) + 1
+                self.pending[key] = (now, self.pending.get(key, (now, 0))[1] + 1)
+                path = os.path.join(self.root_dir, entry['path'])
+            else:
+                path = None
+        
+        if path is not None:
+            if time.monotonic() - self.flushed >= FLUSH_SECONDS:
+                self.flush()
+            return read_dataset(path)
+        
+        return self.materialize(symbol, spec, key)
+    
+    def materialize(self, symbol, spec, key):
+        """Compute and store one version (see get)"""
+        fe = FeatureEngineering(self.raw_dir, os.path.join(self.root_dir, symbol), spec)
+        df = fe.add_technical_indicators(read_dataset(self.source_path(symbol))).reset_index(drop=True)
+        
+        symbol_name, hash_value, fingerprint = key.split("/")
+        version_dir = os.path.join(self.root_dir, symbol_name, hash_value)
+        os.makedirs(version_dir, exist_ok=True)
+        path = write_dataset(df, dataset_path(version_dir, fingerprint))
+        
+        spec_file = os.path.join(self.root_dir, "specs", f"{hash_value}.json")
+        if not os.path.exists(spec_file):
+            with open(spec_file, 'w') as f:
+                json.dump(spec, f, indent=2)
+        
+        now = datetime.now().isoformat()
+        self.save_index({key: {
+            'symbol': symbol_name,
+            'spec_hash': hash_value,
+            'fingerprint': fingerprint,
+            'path': os.path.relpath(path, self.root_dir),
+            'bytes': os.path.getsize(path),
+            'rows': len(df),
+            'created': now,
+            'last_access': now,
+            'hits': 0
+        }})
+        
+        if self.max_bytes is not None:
+            self.gc(self.max_bytes, keep=[key])
+        return df
+    
+    def total_bytes(self):
+        """Get the size of every stored version"""
+        return sum(entry['bytes'] for entry in self.entries.values())
+    
+    def gc(self, max_bytes=None, keep=()):
+        """
+        Evict least recently used versions until the store fits a size budget
+        
+        Pending access times are flushed first, and version files missing
+        from the index (e.g., written by a process that crashed before
+        recording them) are adopted so they count against the budget.
+        
+        Args:
+            max_bytes (int): Size budget (defaults to the store's max_bytes)
+            keep (iterable): Keys that must not be evicted
+        
+        Returns:
+            int: Number of versions removed
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        removed = 0
+        
+        with self.index_lock():
+            entries = self.merged_index()
+            adopted = self.unindexed_versions(entries)
+            entries.update(adopted)
+            
+            total = sum(entry['bytes'] for entry in entries.values())
+            for key in sorted(entries, key=lambda k: entries[k]['last_access']):
+                if total <= max_bytes:
+                    break
+                if key in keep:
+                    continue
+                
+                entry = entries.pop(key)
+                path = os.path.join(self.root_dir, entry['path'])
+                if os.path.exists(path):
+                    os.remove(path)
+                total -= entry['bytes']
+                removed += 1
+            
+            if removed or adopted or self.pending:
+                self.write_index(entries)
+            else:
+                self.entries = entries
+            if removed:
+                self.remove_empty_dirs()
+        
+        return removed
+    
+    def unindexed_versions(self, entries):
+        """
+        Build index entries for stored version files the index does not list
+        
+        Args:
+            entries (dict): Current index entries
+        
+        Returns:
+            dict: Key -> entry, with the file's modification time as its last access
+        """
+        indexed = {entry['path'] for entry in entries.values()}
+        adopted = {}
+        for symbol in os.listdir(self.root_dir):
+            symbol_dir = os.path.join(self.root_dir, symbol)
+            if symbol == "specs" or not os.path.isdir(symbol_dir):
+                continue
+            for hash_value in os.listdir(symbol_dir):
+                version_dir = os.path.join(symbol_dir, hash_value)
+                if not os.path.isdir(version_dir):
+                    continue
+                for path in list_datasets(version_dir):
+                    relative = os.path.relpath(path, self.root_dir)
+                    if relative in indexed:
+                        continue
+                    
+                    modified = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+                    fingerprint = dataset_stem(path)
+                    adopted[f"{symbol}/{hash_value}/{fingerprint}"] = {
+                        'symbol': symbol,
+                        'spec_hash': hash_value,
+                        'fingerprint': fingerprint,
+                        'path': relative,
+                        'bytes': os.path.getsize(path),
+                        'rows': None,
+                        'created': modified,
+                        'last_access': modified,
+                        'hits': 0
+                    }
+        return adopted
+    
+    def remove_empty_dirs(self):
+        """Drop symbol and spec directories left empty by evictions"""
+        for symbol in os.listdir(self.root_dir):
+            symbol_dir = os.path.join(self.root_dir, symbol)
+            if symbol == "specs" or not os.path.isdir(symbol_dir):
+                continue
+            for hash_value in os.listdir(symbol_dir):
+                version_dir = os.path.join(symbol_dir, hash_value)
+                if os.path.isdir(version_dir) and not os.listdir(version_dir):
+                    os.rmdir(version_dir)
+            if not os.listdir(symbol_dir):
+                shutil.rmtree(symbol_dir)
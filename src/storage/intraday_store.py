@@ -0,0 +1,163 @@
+"""
+Intraday Store Module
+Intraday bars partitioned by interval, symbol and day
+"""
+
+import pandas as pd
+import os
+import sys
+from glob import glob
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from storage.dataset_io import dataset_path, dataset_stem, find_dataset, read_dataset, write_dataset, FORMAT_EXTENSIONS
+
+class IntradayStore:
+    """
+    Stores intraday bars as one small file per symbol per day
+    
+    Layout: <root>/<interval>/<symbol>/<YYYY-MM-DD>.parquet
+    
+    Timestamps are stored as naive UTC in the 'Date' column. Appending new
+    bars only rewrites the partitions for the days they fall on, and range
+    reads only open the partitions inside the range.
+    """
+    
+    def __init__(self, root_dir=None):
+        """
+        Initialize the intraday store
+        
+        Args:
+            root_dir (str): Store directory (defaults to data/intraday)
+        """
+        if root_dir is None:
+            self.root_dir = get_data_dir("intraday")
+        else:
+            self.root_dir = root_dir
+        
+        os.makedirs(self.root_dir, exist_ok=True)
+    
+    def symbol_dir(self, symbol, interval):
+        """Get the directory holding a symbol's partitions for an interval"""
+        return os.path.join(self.root_dir, interval, symbol)
+    
+    def days(self, symbol, interval):
+        """
+        List the days stored for a symbol
+        
+        Args:
+            symbol (str): Symbol name (filename-safe, e.g., 'BTC_USD')
+            interval (str): Bar interval (e.g., '5m')
+        
+        Returns:
+            list: Sorted 'YYYY-MM-DD' strings
+        """
+        symbol_dir = self.symbol_dir(symbol, interval)
+        days = set()
+        for ext in FORMAT_EXTENSIONS.values():
+            days.update(dataset_stem(path) for path in glob(os.path.join(symbol_dir, f"*{ext}")))
+        return sorted(days)
+    
+    @staticmethod
+    def to_utc(timestamps):
+        """Convert timestamps to naive UTC (tz-aware values are converted, naive ones kept)"""
+        timestamps = pd.to_datetime(timestamps)
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        return timestamps
+    
+    def write(self, symbol, interval, df):
+        """
+        Add bars to the store, replacing stored bars with the same timestamp
+        
+        Args:
+            symbol (str): Symbol name (filename-safe)
+            interval (str): Bar interval
+            df (pandas.DataFrame): Bars with a 'Date' column
+        
+        Returns:
+            int: Number of day partitions written
+        """
+        if df.empty:
+            return 0
+        
+        df = df.copy()
+        df['Date'] = self.to_utc(df['Date'])
+        
+        symbol_dir = self.symbol_dir(symbol, interval)
+        os.makedirs(symbol_dir, exist_ok=True)
+        
+        partitions = 0
+        for day, day_df in df.groupby(df['Date'].dt.strftime("%Y-%m-%d")):
+            existing_path = find_dataset(symbol_dir, day)
+            if existing_path is not None:
+                day_df = pd.concat([read_dataset(existing_path), day_df], ignore_index=True)
+            
+            day_df = day_df.drop_duplicates(subset=['Date'], keep='last').sort_values('Date')
+            
+            path = dataset_path(symbol_dir, day)
+            write_dataset(day_df, path)
+            if existing_path is not None and existing_path != path:
+                os.remove(existing_path)  # Partition migrated to the current format
+            partitions += 1
+        
+        return partitions
+    
+    def read(self, symbol, interval, start=None, end=None, columns=None):
+        """
+        Read bars within a time range, opening only the partitions it covers
+        
+        Args:
+            symbol (str): Symbol name (filename-safe)
+            interval (str): Bar interval
+            start (str or datetime): First timestamp to include (naive UTC)
+            end (str or datetime): Last timestamp to include (naive UTC)
+            columns (list): Only read these columns
+        
+        Returns:
+            pandas.DataFrame: Bars sorted by time (empty if none match)
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        
+        symbol_dir = self.symbol_dir(symbol, interval)
+        if columns is not None and 'Date' not in columns:
+            columns = ['Date'] + list(columns)
+        
+        frames = []
+        for day in self.days(symbol, interval):
+            if start is not None and day < start.strftime("%Y-%m-%d"):
+                continue
+            if end is not None and day > end.strftime("%Y-%m-%d"):
+                break
+            frames.append(read_dataset(find_dataset(symbol_dir, day), columns=columns))
+        
+        if not frames:
+            return pd.DataFrame()
+        
+        df = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            df = df[df['Date'] >= start]
+        if end is not None:
+            df = df[df['Date'] <= end]
+        
+        return df.reset_index(drop=True)
+    
+    def last_timestamp(self, symbol, interval):
+        """
+        Get the latest stored bar time for a symbol
+        
+        Args:
+            symbol (str): Symbol name (filename-safe)
+            interval (str): Bar interval
+        
+        Returns:
+            pandas.Timestamp: Latest bar time (naive UTC), or None if nothing is stored
+        """
+        days = self.days(symbol, interval)
+        if not days:
+            return None
+        
+        df = read_dataset(find_dataset(self.symbol_dir(symbol, interval), days[-1]), columns=['Date'])
+        return df['Date'].max() if not df.empty else None
@@ -0,0 +1,141 @@
+"""
+Memory Budget Module
+Compact float32 feature frames and symbol chunks sized to a memory budget
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from storage.dataset_io import read_dataset, dataset_columns, normalize_dataset, FORMAT_EXTENSIONS, PARQUET_AVAILABLE
+
+if PARQUET_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+# Bytes of loaded data a run may hold at once (e.g. 12 GiB on a 16 GB box); unset means no limit
+DEFAULT_MEMORY_BUDGET = int(os.environ["TRADING_MEMORY_BUDGET"]) if os.environ.get("TRADING_MEMORY_BUDGET") else None
+
+# Columns compact mode leaves in float64: prices that labels and trade P&L are computed from
+EXACT_COLUMNS = ('Close',)
+
+def compact_frame(df, keep=EXACT_COLUMNS):
+    """
+    Downcast a frame's float64 columns to float32 in place
+    
+    Args:
+        df (pandas.DataFrame): Loaded dataset
+        keep (tuple): Columns left at full precision
+    
+    Returns:
+        pandas.DataFrame: The same frame with half-size feature columns
+    """
+    for col in df.columns:
+        if col not in keep and df[col].dtype == np.float64:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+def read_compact(path, columns=None, keep=EXACT_COLUMNS):
+    """
+    Read a dataset with float32 feature columns
+    
+    Parquet columns are cast in Arrow before conversion and CSV columns are
+    parsed straight into float32, so a float64 copy of the whole frame never
+    exists.
+    
+    Args:
+        path (str): Dataset path (.parquet or .csv)
+        columns (list): Only load these columns; missing names are ignored
+        keep (tuple): Columns left at full precision
+    
+    Returns:
+        pandas.DataFrame: Typed dataset
+    """
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        table = pq.read_table(path, columns=[col for col in columns if col in pq.read_schema(path).names]
+                              if columns is not None else None)
+        fields = [field.with_type(pa.float32()) if pa.types.is_float64(field.type) and field.name not in keep
+                  else field for field in table.schema]
+        return table.cast(pa.schema(fields)).to_pandas()
+    
+    header = dataset_columns(path)
+    wanted = header if columns is None else [col for col in header if col in set(columns)]
+    dtypes = {col: np.float32 for col in wanted if col != 'Date' and col not in keep}
+    try:
+        return normalize_dataset(pd.read_csv(path, usecols=wanted, dtype=dtypes))
+    except (ValueError, TypeError):
+        # Legacy files with non-numeric rows under the header are parsed normally first
+        return compact_frame(read_dataset(path, columns=columns), keep)
+
+def estimate_bytes(path, columns=None, compact=False):
+    """
+    Estimate the memory a dataset takes once loaded, without reading its rows
+    
+    Parquet row counts come from the file footer; CSV rows are counted by
+    scanning the file for line breaks without parsing it.
+    
+    Args:
+        path (str): Dataset path (.parquet or .csv)
+        columns (list): Columns that will be loaded (all if None)
+        compact (bool): Whether feature columns will be float32
+    
+    Returns:
+        int: Estimated bytes
+    """
+    names = dataset_columns(path)
+    loaded = names if columns is None else [col for col in names if col in set(columns)]
+    # Dates and the exact columns stay 8 bytes wide in compact mode
+    row_bytes = sum(4 if compact and col != 'Date' and col not in EXACT_COLUMNS else 8 for col in loaded)
+    
+    if path.endswith(FORMAT_EXTENSIONS["parquet"]):
+        return pq.ParquetFile(path).metadata.num_rows * row_bytes
+    
+    return csv_rows(path) * row_bytes
+
+def csv_rows(path, block=1 << 20):
+    """Count a CSV file's data rows (lines after the header)"""
+    lines = 0
+    last = b"\n"
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(block), b""):
+            lines += data.count(b"\n")
+            last = data[-1:]
+    
+    # A last row without a trailing line break still counts
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+def budget_chunks(items, sizes, budget):
+    """
+    Split items into consecutive chunks whose sizes fit a budget
+    
+    An item larger than the budget on its own still gets a chunk of its own.
+    
+    Args:
+        items (list): Items in processing order (e.g., symbols)
+        sizes (list): Estimated bytes of each item
+        budget (int): Bytes per chunk (None puts everything in one chunk)
+    
+    Returns:
+        list: Lists of items
+    """
+    if budget is None:
+        return [list(items)] if len(items) else []
+    
+    chunks = []
+    current = []
+    used = 0
+    for item, size in zip(items, sizes):
+        if current and used + size > budget:
+            chunks.append(current)
+            current = []
+            used = 0
+        current.append(item)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,273 @@
+"""
+Panel Loader Module
+Builds an aligned symbol x date x field array from per-symbol datasets
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import sys
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from utils.paths import get_data_dir
+from storage.dataset_io import list_datasets, read_dataset, dataset_stem
+from utils.trading_calendar import forward_fill, infer_asset_class, master_calendar
+
+class Panel:
+    """Aligned multi-asset data: values[symbol, date, field] with a validity mask"""
+    
+    def __init__(self, symbols, dates, fields, values, mask):
+        """
+        Initialize the panel
+        
+        Args:
+            symbols (list): Symbol names (first axis)
+            dates (numpy.ndarray): Sorted datetime64[ns] dates (second axis)
+            fields (list): Field names (third axis)
+            values (numpy.ndarray): Array of shape (symbols, dates, fields), NaN where missing
+            mask (numpy.ndarray): Boolean array of shape (symbols, dates), True where a row exists
+        """
+        self.symbols = list(symbols)
+        self.dates = dates
+        self.fields = list(fields)
+        self.values = values
+        self.mask = mask
+        
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+    
+    @property
+    def shape(self):
+        """Panel shape as (symbols, dates, fields)"""
+        return self.values.shape
+    
+    def field(self, name):
+        """Get one field as a (symbols, dates) array"""
+        return self.values[:, :, self.field_index[name]]
+    
+    def frame(self, name):
+        """Get one field as a DataFrame indexed by date with one column per symbol"""
+        return pd.DataFrame(self.field(name).T, index=pd.DatetimeIndex(self.dates), columns=self.symbols)
+    
+    def row(self, symbol, date_idx):
+        """Get one symbol's fields on one date as a Series"""
+        return pd.Series(self.values[self.symbol_index[symbol], date_idx], index=self.fields)
+    
+    def filled(self, name, limit=None):
+        """
+        Get one field forward-filled across dates a symbol has no row for
+        
+        Args:
+            name (str): Field name
+            limit (int): Maximum number of consecutive dates to fill
+        
+        Returns:
+            numpy.ndarray: (symbols, dates) array, NaN before a symbol's first row
+        """
+        return forward_fill(self.field(name), self.mask, limit=limit, axis=1)
+
+def build_panel(frames, fields=None, dates=None):
+    """
+    Align per-symbol frames onto the union of their dates or a master calendar
+    
+    Args:
+        frames (dict): Symbol -> DataFrame with a 'Date' column
+        fields (list): Fields to include (defaults to numeric columns shared by every frame)
+        dates (numpy.ndarray): Sorted master dates; rows on other dates are dropped
+    
+    Returns:
+        Panel: Aligned panel
+    """
+    symbols = list(frames.keys())
+    
+    if fields is None:
+        fields = None
+        for df in frames.values():
+            numeric = [col for col in df.columns
+                       if col != 'Date' and pd.api.types.is_numeric_dtype(df[col])]
+            fields = numeric if fields is None else [col for col in fields if col in numeric]
+        fields = fields or []
+    
+    date_arrays = [pd.to_datetime(df['Date']).values.astype("datetime64[ns]") for df in frames.values()]
+    if dates is not None:
+        dates = np.asarray(dates, dtype="datetime64[ns]")
+    elif date_arrays:
+        dates = np.unique(np.concatenate(date_arrays))
+    else:
+        dates = np.array([], dtype="datetime64[ns]")
+    
+    values = np.full((len(symbols), len(dates), len(fields)), np.nan)
+    mask = np.zeros((len(symbols), len(dates)), dtype=bool)
+    
+    for i, (symbol, symbol_dates) in enumerate(zip(symbols, date_arrays)):
+        df = frames[symbol]
+        
+        # Keep the first row for any duplicated date
+        _, rows = np.unique(symbol_dates, return_index=True)
+        
+        positions = np.searchsorted(dates, symbol_dates[rows])
+        on_axis = positions < len(dates)
+        on_axis[on_axis] = dates[positions[on_axis]] == symbol_dates[rows][on_axis]
+        rows = rows[on_axis]
+        positions = positions[on_axis]
+        mask[i, positions] = True
+        
+        for j, field in enumerate(fields):
+            if field in df.columns:
+                values[i, positions, j] = df[field].to_numpy(dtype=float)[rows]
+    
+    return Panel(symbols, dates, fields, values, mask)
+
+def stack_panels(panels, dates=None):
+    """
+    Combine panels over disjoint symbols onto one date axis
+    
+    Gives the same panel as build_panel over all the frames at once, so
+    frames can be aligned a chunk at a time and released.
+    
+    Args:
+        panels (list): Panels with different symbols
+        dates (numpy.ndarray): Sorted master dates (defaults to the union of the panels' dates)
+    
+    Returns:
+        Panel: Panel over every symbol and the fields all panels share
+    """
+    symbols = [symbol for panel in panels for symbol in panel.symbols]
+    fields = [field for field in panels[0].fields if all(field in panel.field_index for panel in panels)]
+    
+    if dates is not None:
+        dates = np.asarray(dates, dtype="datetime64[ns]")
+    else:
+        dates = np.unique(np.concatenate([panel.dates for panel in panels]))
+    
+    values = np.full((len(symbols), len(dates), len(fields)), np.nan)
+    mask = np.zeros((len(symbols), len(dates)), dtype=bool)
+    
+    first = 0
+    for panel in panels:
+        positions = np.searchsorted(dates, panel.dates)
+        on_axis = positions < len(dates)
+        on_axis[on_axis] = dates[positions[on_axis]] == panel.dates[on_axis]
+        
+        rows = slice(first, first + len(panel.symbols))
+        mask[rows, positions[on_axis]] = panel.mask[:, on_axis]
+        for j, field in enumerate(fields):
+            values[rows, positions[on_axis], j] = panel.field(field)[:, on_axis]
+        first += len(panel.symbols)
+    
+    return Panel(symbols, dates, fields, values, mask)
+
+class PanelLoader:
+    """Loads datasets into a Panel and caches it on disk"""
+    
+    def __init__(self, data_dir=None, suffix="_enhanced_features", cache_dir=None):
+        """
+        Initialize the panel loader
+        
+        Args:
+            data_dir (str): Directory with per-symbol datasets (defaults to enhanced data)
+            suffix (str): Dataset name suffix stripped to get the symbol
+            cache_dir (str): Directory for cached panels (defaults to data/cache)
+        """
+        if data_dir is None:
+            self.data_dir = get_data_dir("enhanced")
+        else:
+            self.data_dir = data_dir
+        
+        if cache_dir is None:
+            self.cache_dir = get_data_dir("cache")
+        else:
+            self.cache_dir = cache_dir
+        
+        self.suffix = suffix
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def source_files(self, symbols=None):
+        """Get symbol -> dataset path for the requested symbols (all if None)"""
+        files = {}
+        for path in list_datasets(self.data_dir, self.suffix):
+            symbol = dataset_stem(path)
+            if self.suffix:
+                symbol = symbol[:-len(self.suffix)]
+            if symbols is None or symbol in symbols:
+                files[symbol] = path
+        return files
+    
+    def fingerprint(self, files, fields=None):
+        """
+        Fingerprint the source files and request
+        
+        Any change in file size or modification time produces a new fingerprint,
+        which invalidates the cached panel.
+        
+        Args:
+            files (dict): Symbol -> dataset path
+            fields (list): Requested fields
+        
+        Returns:
+            str: Hex digest
+        """
+        hasher = hashlib.sha1()
+        hasher.update(json.dumps(fields).encode())
+        for symbol in sorted(files):
+            stat = os.stat(files[symbol])
+            hasher.update(f"{symbol}|{os.path.basename(files[symbol])}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        return hasher.hexdigest()
+    
+    def cache_path(self, files, fields=None, calendar=False):
+        """Get the cache file for a request (one file per symbol set, field list and date axis)"""
+        request = json.dumps({'dir': os.path.abspath(self.data_dir), 'symbols': sorted(files),
+                              'fields': fields, 'calendar': calendar})
+        key = hashlib.sha1(request.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"panel_{key}.npz")
+    
+    def load(self, symbols=None, fields=None, use_cache=True, calendar=False):
+        """
+        Load an aligned panel, reusing the cache when the sources are unchanged
+        
+        Args:
+            symbols (list): Symbols to load (all datasets if None)
+            fields (list): Fields to include (shared numeric columns if None)
+            use_cache (bool): Read and write the on-disk cache
+            calendar (bool): Use the master trading calendar of the symbols' asset
+                             classes as the date axis instead of the union of their dates
+        
+        Returns:
+            Panel: Aligned panel (None if no datasets were found)
+        """
+        files = self.source_files(symbols)
+        if not files:
+            print(f"⚠️ No datasets found in {self.data_dir}")
+            return None
+        
+        fingerprint = self.fingerprint(files, fields)
+        cache_file = self.cache_path(files, fields, calendar)
+        
+        if use_cache and os.path.exists(cache_file):
+            try:
+                with np.load(cache_file, allow_pickle=False) as cached:
+                    if str(cached['fingerprint']) == fingerprint:
+                        return Panel(cached['symbols'].tolist(), cached['dates'],
+                                     cached['fields'].tolist(), cached['values'], cached['mask'])
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable panel cache {cache_file}: {e}")
+        
+        frames = {symbol: read_dataset(path, columns=['Date'] + fields if fields else None)
+                  for symbol, path in sorted(files.items())}
+        dates = None
+        if calendar:
+            first = min(df['Date'].min() for df in frames.values())
+            last = max(df['Date'].max() for df in frames.values())
+            dates = master_calendar({infer_asset_class(symbol) for symbol in frames}, first, last)
+        panel = build_panel(frames, fields, dates)
+        
+        if use_cache:
+            np.savez(cache_file, fingerprint=np.array(fingerprint), symbols=np.array(panel.symbols, dtype=str),
+                     dates=panel.dates, fields=np.array(panel.fields, dtype=str),
+                     values=panel.values, mask=panel.mask)
+        
+        return panel
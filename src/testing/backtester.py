@@ -31,10 +31,15 @@ from glob import glob
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.paths import get_data_dir, get_outputs_dir
+from storage.dataset_io import find_dataset, read_dataset
+from storage.panel_loader import build_panel, stack_panels
+from storage.memory_budget import DEFAULT_MEMORY_BUDGET, read_compact, estimate_bytes, budget_chunks
+from utils.trading_calendar import infer_asset_class, master_calendar
 from prediction.prediction_system import StockPredictor
 
 class Backtester:
-    def __init__(self, start_date=None, end_date=None, initial_capital=10000):
+    def __init__(self, start_date=None, end_date=None, initial_capital=10000, bar_store=None,
+                 compact=False, memory_budget=DEFAULT_MEMORY_BUDGET):
         """
         Initialize backtester
         
@@ -42,7 +47,14 @@ class Backtester:
             start_date (str): Start date for backtesting (YYYY-MM-DD)
             end_date (str): End date for backtesting (YYYY-MM-DD)
             initial_capital (float): Starting capital for backtesting
+            bar_store (BarStore): Optional memory-mapped store to slice data from
+            compact (bool): Load feature columns as float32 (prices stay float64)
+            memory_budget (int): Bytes of loaded frames to hold at once; assets are then loaded
+                and aligned in chunks (defaults to TRADING_MEMORY_BUDGET, None loads every asset together)
         """
+        self.bar_store = bar_store
+        self.compact = compact
+        self.memory_budget = memory_budget
         self.start_date = start_date
         self.end_date = end_date
         self.initial_capital = initial_capital
@@ -51,33 +63,38 @@ class Backtester:
         self.trade_history = []  # All trades
         self.portfolio_value_history = []  # Portfolio value over time
         
-    def load_historical_data(self, asset, data_type="enhanced"):
+        # Columns the simulated strategy reads; other features are not loaded
+        self.backtest_columns = ['Date', 'Close', 'RSI_14']
+        
+    def load_historical_data(self, asset, data_type="enhanced", columns=None):
         """
         Load historical data for an asset
         
         Args:
             asset (str): Asset symbol
             data_type (str): 'raw', 'features', or 'enhanced'
+            columns (list): Only load these columns (all columns if None)
             
         Returns:
             pandas.DataFrame: Historical data
         """
         data_dir = f"../../data/{data_type}"
+        stem = self.dataset_name(asset, data_type)
         
-        if data_type == "raw":
-            filename = f"{asset}.csv"
-        elif data_type == "features":
-            filename = f"{asset}_features.csv"
-        else:  # enhanced
-            filename = f"{asset}_enhanced_features.csv"
+        # The bar store binary-searches the date range instead of parsing the whole file
+        if self.bar_store is not None and self.bar_store.exists(stem):
+            return self.bar_store.read(stem, self.start_date, self.end_date, columns)
         
-        filepath = os.path.join(data_dir, filename)
+        filepath = find_dataset(data_dir, stem)
         
-        if not os.path.exists(filepath):
-            print(f"Data file not found: {filepath}")
+        if filepath is None:
+            print(f"Data file not found: {os.path.join(data_dir, stem)}")
             return None
         
-        df = pd.read_csv(filepath)
+        if self.compact:
+            df = read_compact(filepath, columns=columns)
+        else:
+            df = read_dataset(filepath, columns=columns)
         
         # Convert Date column to datetime
         if 'Date' in df.columns:
@@ -91,6 +108,24 @@ class Backtester:
         
         return df
     
+    @staticmethod
+    def dataset_name(asset, data_type):
+        """Get the dataset name holding an asset's data of one type"""
+        if data_type == "raw":
+            return asset
+        elif data_type == "features":
+            return f"{asset}_features"
+        else:  # enhanced
+            return f"{asset}_enhanced_features"
+    
+    def estimate_data_bytes(self, asset, data_type="enhanced", columns=None):
+        """Estimate the memory an asset's loaded data takes (0 for bar store or missing data)"""
+        stem = self.dataset_name(asset, data_type)
+        if self.bar_store is not None and self.bar_store.exists(stem):
+            return 0
+        filepath = find_dataset(f"../../data/{data_type}", stem)
+        return estimate_bytes(filepath, columns, self.compact) if filepath is not None else 0
+    
     def simulate_prediction(self, asset, row_data):
         """
         Simulate a prediction for a specific row of data
@@ -233,25 +268,42 @@ class Backtester:
         print(f"💰 Initial Capital: ${self.initial_capital:,.2f}")
         print(f"📊 Assets: {', '.join(assets)}")
         
-        # Load data for all assets
-        asset_data = {}
-        for asset in assets:
-            data = self.load_historical_data(asset, "enhanced")
-            if data is not None and len(data) > 0:
-                asset_data[asset] = data
-                print(f"✅ Loaded {len(data)} days of data for {asset}")
-            else:
-                print(f"❌ Failed to load data for {asset}")
-        
-        if not asset_data:
+        # Load data for all assets, aligning each budget-sized chunk as it is loaded
+        if self.memory_budget is not None:
+            sizes = [self.estimate_data_bytes(asset, "enhanced", self.backtest_columns) for asset in assets]
+        else:
+            sizes = [0] * len(assets)
+        
+        chunk_panels = []
+        for chunk in budget_chunks(assets, sizes, self.memory_budget):
+            asset_data = {}
+            for asset in chunk:
+                data = self.load_historical_data(asset, "enhanced", columns=self.backtest_columns)
+                if data is not None and len(data) > 0:
+                    asset_data[asset] = data
+                    print(f"✅ Loaded {len(data)} days of data for {asset}")
+                else:
+                    print(f"❌ Failed to load data for {asset}")
+            
+            # Only the chunk's aligned arrays are kept; its frames are released
+            if asset_data:
+                chunk_panels.append(build_panel(asset_data))
+        
+        if not chunk_panels:
             print("❌ No data loaded. Cannot run backtest.")
             return None
         
-        # Get all unique dates
-        all_dates = set()
-        for data in asset_data.values():
-            all_dates.update(data['Date'].dt.date)
-        all_dates = sorted(list(all_dates))
+        # Align all assets onto the master calendar of their asset classes
+        first_date = min(chunk.dates[0] for chunk in chunk_panels)
+        last_date = max(chunk.dates[-1] for chunk in chunk_panels)
+        calendar_dates = master_calendar({infer_asset_class(asset) for chunk in chunk_panels for asset in chunk.symbols},
+                                         first_date, last_date)
+        
+        panel = stack_panels(chunk_panels, dates=calendar_dates)
+        all_dates = [pd.Timestamp(date).date() for date in panel.dates]
+        
+        # Holdings are valued at their last close on days their market is shut
+        last_closes = panel.filled('Close')
         
         print(f"📅 Trading over {len(all_dates)} days")
         
@@ -260,13 +312,11 @@ class Backtester:
             current_prices = {}
             
             # Process each asset for this date
-            for asset, data in asset_data.items():
-                day_data = data[data['Date'].dt.date == date]
-                
-                if len(day_data) == 0:
+            for asset in panel.symbols:
+                if not panel.mask[panel.symbol_index[asset], i]:
                     continue
                 
-                row = day_data.iloc[0]
+                row = panel.row(asset, i)
                 current_price = row['Close']
                 current_prices[asset] = current_price
                 
@@ -286,7 +336,8 @@ class Backtester:
                                          pd.to_datetime(date), prediction['confidence'])
             
             # Record portfolio value
-            portfolio_value = self.calculate_portfolio_value(current_prices)
+            valuation_prices = {asset: last_closes[panel.symbol_index[asset], i] for asset in self.positions}
+            portfolio_value = self.calculate_portfolio_value(valuation_prices)
             self.portfolio_value_history.append({
                 'date': date,
                 'portfolio_value': portfolio_value,
@@ -297,9 +348,8 @@ class Backtester:
         # Close any remaining positions at the end
         final_date = pd.to_datetime(all_dates[-1])
         for asset, position in list(self.positions.items()):
-            if asset in current_prices:
-                self.execute_trade(asset, 'SELL', current_prices[asset], 
-                                 final_date, 0.5)
+            self.execute_trade(asset, 'SELL', last_closes[panel.symbol_index[asset], -1], 
+                             final_date, 0.5)
         
         return self.generate_results()
     
@@ -5,7 +5,6 @@ Simulates real trading with current market conditions using virtual money
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import time
 import os
@@ -15,17 +14,21 @@ import json
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from prediction.prediction_system import StockPredictor
+from data_collection.quote_cache import QuoteCache
 
 class PaperTrader:
-    def __init__(self, initial_capital=10000, portfolio_file=None):
+    def __init__(self, initial_capital=10000, portfolio_file=None, provider=None, quote_cache=None):
         """
         Initialize paper trader
         
         Args:
             initial_capital (float): Starting virtual money
             portfolio_file (str): File to save portfolio state (default: project_root/outputs/paper_portfolio.json)
+            provider (MarketDataProvider): Price source for the quote cache (defaults to get_provider())
+            quote_cache (QuoteCache): Shared quote cache (created from provider if None)
         """
         self.initial_capital = initial_capital
+        self.quote_cache = quote_cache or QuoteCache(provider)
         
         # Set default portfolio file path relative to project root
         if portfolio_file is None:
@@ -36,7 +39,7 @@ class PaperTrader:
         else:
             self.portfolio_file = portfolio_file
             
-        self.predictor = StockPredictor()
+        self.predictor = StockPredictor(quote_stream=self.quote_cache.stream)
         
         # Load existing portfolio or create new one
         self.load_portfolio()
@@ -92,15 +95,8 @@ class PaperTrader:
             float: Current price
         """
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="1d", interval="1m")
-            if not data.empty:
-                return data['Close'].iloc[-1]
-            else:
-                # Fallback to daily data
-                data = ticker.history(period="5d")
-                if not data.empty:
-                    return data['Close'].iloc[-1]
+            # Served from the shared quote cache; refreshed from the provider once stale
+            return self.quote_cache.get_price(symbol)
         except Exception as e:
             print(f"❌ Error getting price for {symbol}: {e}")
         
@@ -240,6 +236,9 @@ class PaperTrader:
         total_value = self.cash
         position_values = {}
         
+        # Refresh every held symbol in one batch; the loop below reads the cache
+        self.quote_cache.get_prices(list(self.positions.keys()))
+        
         for symbol, position in self.positions.items():
             current_price = self.get_current_price(symbol)
             if current_price:
@@ -0,0 +1,325 @@
+"""
+Trading Calendar Module
+Precomputed session calendars per asset class and vectorized alignment helpers
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Range of days precomputed for every calendar
+DEFAULT_START = "2000-01-01"
+DEFAULT_END = "2035-12-31"
+
+# Days of the week each asset class trades (Monday first)
+WEEKMASKS = {
+    "stock": "1111100",
+    "forex": "1111100",
+    "crypto": "1111111"
+}
+
+# Manifest keys and dataset labels that name the same asset class
+ASSET_CLASS_ALIASES = {
+    "stocks": "stock",
+    "equity": "stock",
+    "fx": "forex",
+    "cryptocurrency": "crypto"
+}
+
+# Unscheduled NYSE closures (national days of mourning, weather)
+NYSE_SPECIAL_CLOSURES = [
+    "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",
+    "2004-06-11", "2007-01-02", "2012-10-29", "2012-10-30",
+    "2018-12-05", "2025-01-09"
+]
+
+CURRENCY_CODES = {"USD", "EUR", "JPY", "GBP", "CHF", "AUD", "CAD", "NZD", "CNY", "HKD", "SEK", "NOK", "SGD"}
+
+def infer_asset_class(symbol):
+    """
+    Guess a symbol's asset class from its ticker or file name
+    
+    Args:
+        symbol (str): Ticker (e.g., 'BTC-USD', 'EURUSD=X') or dataset stem (e.g., 'BTC_USD', 'EURUSDX')
+    
+    Returns:
+        str: 'crypto', 'forex' or 'stock'
+    """
+    if symbol.endswith("-USD") or symbol.endswith("_USD"):
+        return "crypto"
+    if symbol.endswith("=X") or (symbol.endswith("X") and symbol[:3] in CURRENCY_CODES and len(symbol) in (4, 7)):
+        return "forex"
+    return "stock"
+
+def normalize_asset_class(asset_class):
+    """Map an asset class label to 'stock', 'forex' or 'crypto'"""
+    asset_class = ASSET_CLASS_ALIASES.get(asset_class, asset_class)
+    if asset_class not in WEEKMASKS:
+        raise ValueError(f"Unknown asset class: {asset_class}")
+    return asset_class
+
+def easter_sunday(year):
+    """Get Easter Sunday for a year (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def nth_weekday(year, month, weekday, n):
+    """Get the nth weekday of a month (n=-1 for the last one; Monday is 0)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def observed(day):
+    """Move a Saturday holiday to Friday and a Sunday holiday to Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+def nyse_holidays(start_year, end_year):
+    """
+    Get NYSE full-day holidays for a range of years
+    
+    Args:
+        start_year (int): First year
+        end_year (int): Last year (inclusive)
+    
+    Returns:
+        list: datetime.date holidays, including special closures
+    """
+    holidays = []
+    for year in range(start_year, end_year + 1):
+        # New Year's Day is not moved back to Friday when it falls on a Saturday
+        new_year = date(year, 1, 1)
+        if new_year.weekday() != 5:
+            holidays.append(observed(new_year))
+        
+        holidays.append(nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+        holidays.append(nth_weekday(year, 2, 0, 3))  # Presidents' Day
+        holidays.append(easter_sunday(year) - timedelta(days=2))  # Good Friday
+        holidays.append(nth_weekday(year, 5, 0, -1))  # Memorial Day
+        if year >= 2022:
+            holidays.append(observed(date(year, 6, 19)))  # Juneteenth
+        holidays.append(observed(date(year, 7, 4)))  # Independence Day
+        holidays.append(nth_weekday(year, 9, 0, 1))  # Labor Day
+        holidays.append(nth_weekday(year, 11, 3, 4))  # Thanksgiving
+        holidays.append(observed(date(year, 12, 25)))  # Christmas
+    
+    holidays.extend(date.fromisoformat(day) for day in NYSE_SPECIAL_CLOSURES
+                    if start_year <= int(day[:4]) <= end_year)
+    return sorted(holidays)
+
+class TradingCalendar:
+    """
+    Sorted session dates for one asset class
+    
+    Sessions are a datetime64[D] array, so lookups for many dates at once are
+    a single np.searchsorted call.
+    """
+    
+    def __init__(self, asset_class, start=DEFAULT_START, end=DEFAULT_END):
+        """
+        Precompute the sessions of an asset class
+        
+        Args:
+            asset_class (str): 'stock', 'forex' or 'crypto' (manifest keys like 'stocks' work too)
+            start (str): First calendar day
+            end (str): Last calendar day (inclusive)
+        """
+        self.asset_class = normalize_asset_class(asset_class)
+        self.start = np.datetime64(start, "D")
+        self.end = np.datetime64(end, "D")
+        
+        holidays = []
+        if self.asset_class == "stock":
+            start_year = int(str(self.start)[:4])
+            end_year = int(str(self.end)[:4])
+            holidays = nyse_holidays(start_year, end_year)
+        
+        days = np.arange(self.start, self.end + 1, dtype="datetime64[D]")
+        is_session = np.is_busday(days, weekmask=WEEKMASKS[self.asset_class],
+                                  holidays=np.array(holidays, dtype="datetime64[D]"))
+        self.sessions = days[is_session]
+    
+    def __len__(self):
+        return len(self.sessions)
+    
+    def is_session(self, dates):
+        """
+        Check which dates are trading sessions
+        
+        Args:
+            dates: Date-like scalar or array
+        
+        Returns:
+            numpy.ndarray: Boolean array (a bool for a scalar date)
+        """
+        days = np.atleast_1d(to_days(dates))
+        positions = np.minimum(np.searchsorted(self.sessions, days), len(self.sessions) - 1)
+        result = self.sessions[positions] == days
+        return result if np.ndim(dates) else bool(result[0])
+    
+    def session_index(self, dates):
+        """
+        Get each date's position in the session array
+        
+        Args:
+            dates: Date-like array
+        
+        Returns:
+            numpy.ndarray: Session positions, -1 for dates that are not sessions
+        """
+        days = to_days(dates)
+        positions = np.searchsorted(self.sessions, days)
+        return np.where(self.is_session(days), positions, -1)
+    
+    def sessions_between(self, start, end):
+        """Get the sessions from start to end, both inclusive"""
+        lo = np.searchsorted(self.sessions, to_days(start), side="left")
+        hi = np.searchsorted(self.sessions, to_days(end), side="right")
+        return self.sessions[lo:hi]
+    
+    def count_sessions_between(self, earlier, later):
+        """
+        Count sessions strictly between pairs of dates
+        
+        Args:
+            earlier: Date-like array of interval starts
+            later: Date-like array of interval ends
+        
+        Returns:
+            numpy.ndarray: Number of sessions after earlier and before later
+        """
+        return np.maximum(
+            np.searchsorted(self.sessions, to_days(later), side="left")
+            - np.searchsorted(self.sessions, to_days(earlier), side="right"),
+            0
+        )
+    
+    def next_session(self, day):
+        """Get the first session after a day (None past the calendar end)"""
+        position = np.searchsorted(self.sessions, to_days(day), side="right")
+        return pd.Timestamp(self.sessions[position]) if position < len(self.sessions) else None
+    
+    def previous_session(self, day):
+        """Get the last session before a day (None before the calendar start)"""
+        position = np.searchsorted(self.sessions, to_days(day), side="left")
+        return pd.Timestamp(self.sessions[position - 1]) if position > 0 else None
+
+def to_days(dates):
+    """Convert a date-like scalar or array to datetime64[D]"""
+    if np.ndim(dates) == 0:
+        return pd.Timestamp(dates).to_datetime64().astype("datetime64[D]")
+    
+    dates = np.asarray(dates)
+    if not np.issubdtype(dates.dtype, np.datetime64):
+        dates = pd.to_datetime(dates).values
+    return dates.astype("datetime64[D]")
+
+@lru_cache(maxsize=None)
+def get_calendar(asset_class, start=DEFAULT_START, end=DEFAULT_END):
+    """Get the shared precomputed calendar for an asset class"""
+    return TradingCalendar(asset_class, start, end)
+
+def master_calendar(asset_classes, start=None, end=None):
+    """
+    Union the sessions of several asset classes into one date axis
+    
+    Args:
+        asset_classes (iterable): Asset class names
+        start: Optional first date to keep
+        end: Optional last date to keep (inclusive)
+    
+    Returns:
+        numpy.ndarray: Sorted datetime64[ns] dates
+    """
+    classes = sorted({normalize_asset_class(asset_class) for asset_class in asset_classes})
+    sessions = np.unique(np.concatenate([get_calendar(asset_class).sessions for asset_class in classes]))
+    
+    if start is not None:
+        sessions = sessions[sessions >= to_days(start)]
+    if end is not None:
+        sessions = sessions[sessions <= to_days(end)]
+    
+    return sessions.astype("datetime64[ns]")
+
+def align_to_calendar(dates, values, calendar_dates):
+    """
+    Place rows onto a master date axis
+    
+    Rows whose date is not on the axis are dropped; if a date repeats, the
+    first row wins.
+    
+    Args:
+        dates: Row dates (array-like)
+        values (numpy.ndarray): Row values with rows on the first axis
+        calendar_dates (numpy.ndarray): Sorted master dates
+    
+    Returns:
+        tuple: (aligned values with NaN where missing, boolean mask of filled dates)
+    """
+    days = to_days(np.asarray(dates))
+    calendar_days = to_days(calendar_dates)
+    values = np.asarray(values, dtype=float)
+    
+    _, rows = np.unique(days, return_index=True)
+    positions = np.searchsorted(calendar_days, days[rows])
+    inside = positions < len(calendar_days)
+    inside[inside] = calendar_days[positions[inside]] == days[rows][inside]
+    
+    aligned = np.full((len(calendar_days),) + values.shape[1:], np.nan)
+    mask = np.zeros(len(calendar_days), dtype=bool)
+    aligned[positions[inside]] = values[rows[inside]]
+    mask[positions[inside]] = True
+    
+    return aligned, mask
+
+def forward_fill(values, mask=None, limit=None, axis=-1):
+    """
+    Forward-fill along the date axis without a Python loop
+    
+    Args:
+        values (numpy.ndarray): Array with dates on `axis`
+        mask (numpy.ndarray): True where a value is present (defaults to not NaN)
+        limit (int): Maximum number of consecutive dates to fill
+        axis (int): Date axis
+    
+    Returns:
+        numpy.ndarray: Filled copy of values
+    """
+    values = np.asarray(values, dtype=float)
+    if mask is None:
+        mask = ~np.isnan(values)
+    else:
+        # A (symbols, dates) mask covers every field of a (symbols, dates, fields) array
+        mask = np.asarray(mask, dtype=bool)
+        mask = np.broadcast_to(mask.reshape(mask.shape + (1,) * (values.ndim - mask.ndim)), values.shape)
+    
+    values = np.moveaxis(values, axis, -1)
+    mask = np.moveaxis(mask, axis, -1)
+    
+    n = values.shape[-1]
+    # Index of the last present value at or before each date (-1 if none yet)
+    index = np.where(mask, np.arange(n), -1)
+    index = np.maximum.accumulate(index, axis=-1)
+    
+    filled = np.take_along_axis(values, np.maximum(index, 0), axis=-1)
+    valid = index >= 0
+    if limit is not None:
+        valid &= np.arange(n) - index <= limit
+    filled = np.where(valid, filled, np.nan)
+    
+    return np.moveaxis(filled, -1, axis)